@@ -0,0 +1,252 @@
+"""
+Benchmark cases for the audit service hot paths.
+
+Each case returns a list of ``Metric``; ``better`` says which direction is an
+improvement so the runner can flag regressions against a baseline.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from talos_sdk.adapters.hash import NativeHashAdapter
+from talos_sdk.adapters.memory_store import InMemoryAuditStore
+
+from src.core.broadcaster import EventBroadcaster
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event
+from src.domain.services import AuditService
+from src.ports.common import SystemClockAdapter, UuidIdAdapter
+
+
+@dataclass
+class Metric:
+    name: str
+    value: float
+    unit: str
+    better: str  # "higher" or "lower"
+
+
+def build_event(i: int) -> Event:
+    """A correctly hashed event, as a gateway would send it."""
+    event = Event(
+        event_id=f"bench-{i:012d}",
+        ts="2026-01-11T18:23:45.123Z",
+        request_id=f"req-{i}",
+        surface_id="bench.op",
+        outcome="OK",
+        principal={"auth_mode": "bearer", "principal_id": f"p-{i % 97}", "team_id": "t-1"},
+        http={"method": "POST", "path": "/v1/bench", "status_code": 200},
+        meta={"session_id": f"s-{i % 13}"},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+def new_service(store=None) -> AuditService:
+    return AuditService(
+        store=store if store is not None else InMemoryAuditStore(),
+        merkle_tree=MerkleTree(NativeHashAdapter()),
+        clock=SystemClockAdapter(),
+        id_gen=UuidIdAdapter(),
+    )
+
+
+def bench_ingest(sizes: list[int]) -> list[Metric]:
+    """ingest_event throughput against InMemoryAuditStore."""
+    metrics = []
+    for size in sizes:
+        events = [build_event(i) for i in range(size)]
+        service = new_service()
+
+        async def run(events=events, service=service):
+            for event in events:
+                await service.ingest_event(event)
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        metrics.append(Metric(f"ingest_throughput_{size}", size / elapsed, "events/s", "higher"))
+    return metrics
+
+
+def bench_proof_latency(sizes: list[int], samples: int = 2000) -> list[Metric]:
+    """MerkleTree.get_proof latency as the tree grows."""
+    metrics = []
+    for size in sizes:
+        tree = MerkleTree(NativeHashAdapter())
+        tree.initialize_from_events([build_event(i) for i in range(size)])
+        probe = [f"bench-{random.randrange(size):012d}" for _ in range(samples)]
+
+        started = time.perf_counter()
+        for event_id in probe:
+            tree.get_proof(event_id)
+        per_op = (time.perf_counter() - started) / samples
+        metrics.append(Metric(f"proof_latency_{size}", per_op * 1e6, "us", "lower"))
+    return metrics
+
+
+def bench_recovery(sizes: list[int]) -> list[Metric]:
+    """Startup recovery: rebuilding the tree from the store."""
+    metrics = []
+    for size in sizes:
+        store = InMemoryAuditStore()
+        for i in range(size):
+            store.append(build_event(i))
+
+        started = time.perf_counter()
+        new_service(store)
+        elapsed = time.perf_counter() - started
+        metrics.append(Metric(f"recovery_time_{size}", elapsed * 1e3, "ms", "lower"))
+    return metrics
+
+
+def bench_canonicalization(iterations: int = 20000) -> list[Metric]:
+    """Event.__str__ (RFC 8785 canonical form) cost."""
+    event = build_event(0)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        str(event)
+    per_op = (time.perf_counter() - started) / iterations
+    return [Metric("canonicalize_event", per_op * 1e6, "us", "lower")]
+
+
+def bench_ingest_decode(batch: int = 100, rounds: int = 200) -> list[Metric]:
+    """Ingest body decode + Event validation per event, for each installed codec."""
+    from src.adapters.http import codecs
+
+    records = [build_event(i).model_dump() for i in range(batch)]
+    encoders = {codecs.JSON: lambda data: json.dumps(data).encode("utf-8")}
+    if codecs.msgpack is not None:
+        encoders[codecs.MSGPACK] = codecs.msgpack.packb
+    if codecs.cbor2 is not None:
+        encoders[codecs.CBOR] = codecs.cbor2.dumps
+
+    metrics = []
+    for media_type, encode in encoders.items():
+        body = encode(records)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            codecs.decode_events(body, media_type)
+        per_event = (time.perf_counter() - started) / (rounds * batch)
+        name = media_type.rsplit("/", 1)[1]
+        metrics.append(Metric(f"decode_{name}", per_event * 1e6, "us", "lower"))
+        metrics.append(Metric(f"body_bytes_{name}", len(body) / batch, "B", "lower"))
+    return metrics
+
+
+def bench_client_verify(sizes: list[int], samples: int = 5000) -> list[Metric]:
+    """Client-side verification: single proofs, a snapshot's worth batched, consistency."""
+    from src.client.verify import BatchVerifier, verify_consistency, verify_proof
+
+    metrics = []
+    for size in sizes:
+        tree = MerkleTree(NativeHashAdapter())
+        tree.initialize_from_events([build_event(i) for i in range(size)])
+        root = tree.get_root().root
+        # Proofs as a client receives them: JSON dicts.
+        start = random.randrange(max(1, size - samples))
+        proofs = [
+            tree.get_proof(f"bench-{i:012d}").model_dump(mode="json")
+            for i in range(start, min(size, start + samples))
+        ]
+
+        started = time.perf_counter()
+        for proof in proofs:
+            verify_proof(proof, root)
+        single = len(proofs) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        BatchVerifier(root).verify_all(proofs)
+        batched = len(proofs) / (time.perf_counter() - started)
+
+        first = random.randrange(1, size + 1)
+        consistency = tree.get_consistency_proof(first, size).model_dump(mode="json")
+        first_root = MerkleTree(NativeHashAdapter())
+        first_root.initialize_from_events([build_event(i) for i in range(first)])
+        first_root = first_root.get_root().root
+        rounds = 1000
+        started = time.perf_counter()
+        for _ in range(rounds):
+            verify_consistency(consistency, first_root, root)
+        consistent = rounds / (time.perf_counter() - started)
+
+        metrics.append(Metric(f"verify_single_{size}", single, "proofs/s", "higher"))
+        metrics.append(Metric(f"verify_batch_{size}", batched, "proofs/s", "higher"))
+        metrics.append(Metric(f"verify_consistency_{size}", consistent, "proofs/s", "higher"))
+    return metrics
+
+
+def bench_sse_fanout(subscriber_counts: list[int], events: int = 1000) -> list[Metric]:
+    """EventBroadcaster publish -> delivery rate with N subscribers."""
+    metrics = []
+    payload = build_event(0)
+    for subscribers in subscriber_counts:
+
+        async def run(subscribers=subscribers) -> float:
+            broadcaster = EventBroadcaster(max_queue_size=events)
+
+            async def consume():
+                received = 0
+                async for _ in broadcaster.subscribe():
+                    received += 1
+                    if received == events:
+                        return
+
+            tasks = [asyncio.create_task(consume()) for _ in range(subscribers)]
+            while len(broadcaster._subscribers) < subscribers:
+                await asyncio.sleep(0)
+
+            started = time.perf_counter()
+            for _ in range(events):
+                await broadcaster.publish(payload)
+            await asyncio.gather(*tasks)
+            return time.perf_counter() - started
+
+        elapsed = asyncio.run(run())
+        delivered = subscribers * events
+        metrics.append(
+            Metric(f"sse_fanout_{subscribers}", delivered / elapsed, "deliveries/s", "higher")
+        )
+    return metrics
+
+
+def bench_startup(runs: int = 3) -> list[Metric]:
+    """Fresh-interpreter import of src.main, and import + bootstrap, best of ``runs``."""
+    from benchmarks import startup
+
+    imports = [startup.import_ms(startup.import_profile()) for _ in range(runs)]
+    ready = [startup.ready_ms() for _ in range(runs)]
+    return [
+        Metric("startup_import_src_main", min(imports), "ms", "lower"),
+        Metric("startup_ready_memory", min(ready), "ms", "lower"),
+    ]
+
+
+PROFILES: dict[str, dict[str, Callable[[], list[Metric]]]] = {
+    "quick": {
+        "ingest": lambda: bench_ingest([1_000, 10_000]),
+        "proof": lambda: bench_proof_latency([1_000, 10_000]),
+        "recovery": lambda: bench_recovery([1_000]),
+        "canonicalize": lambda: bench_canonicalization(),
+        "decode": lambda: bench_ingest_decode(),
+        "verify": lambda: bench_client_verify([10_000]),
+        "startup": lambda: bench_startup(),
+        "sse": lambda: bench_sse_fanout([1, 10]),
+    },
+    "full": {
+        "ingest": lambda: bench_ingest([1_000, 100_000, 1_000_000]),
+        "proof": lambda: bench_proof_latency([1_000, 100_000, 1_000_000]),
+        "recovery": lambda: bench_recovery([10_000]),
+        "canonicalize": lambda: bench_canonicalization(100_000),
+        "decode": lambda: bench_ingest_decode(rounds=2000),
+        "verify": lambda: bench_client_verify([100_000, 1_000_000]),
+        "startup": lambda: bench_startup(runs=10),
+        "sse": lambda: bench_sse_fanout([1, 10, 100]),
+    },
+}
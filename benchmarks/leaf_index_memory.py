@@ -0,0 +1,90 @@
+"""
+Memory benchmark for the Merkle tree event_id -> leaf index map.
+
+Compares the compact LeafIndex against the plain ``Dict[str, int]`` it
+replaced. The dict baseline is only built up to ``--dict-max`` events since at
+100M events it needs ~15 GB on its own.
+
+Usage:
+    python -m benchmarks.leaf_index_memory                  # 10M and 100M
+    python -m benchmarks.leaf_index_memory --sizes 1000000 --dict-max 1000000
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+
+from src.domain.leaf_index import LeafIndex
+
+
+def _ids(count: int):
+    for _ in range(count):
+        yield str(uuid.uuid4())
+
+
+def measure_leaf_index(count: int, probes: int) -> dict:
+    index = LeafIndex()
+    sample = []
+    stride = max(1, count // probes)
+    started = time.perf_counter()
+    for i, event_id in enumerate(_ids(count)):
+        index.append(event_id)
+        if i % stride == 0:
+            sample.append(event_id)
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for event_id in sample:
+        if index.get(event_id) is None:
+            raise AssertionError(f"lost {event_id}")
+    lookup_ns = (time.perf_counter() - started) / max(1, len(sample)) * 1e9
+
+    return {
+        "impl": "LeafIndex",
+        "events": count,
+        "bytes": index.nbytes(),
+        "bytes_per_event": index.nbytes() / count,
+        "build_s": round(build_s, 3),
+        "lookup_ns": round(lookup_ns, 1),
+    }
+
+
+def measure_dict(count: int) -> dict:
+    mapping = {}
+    started = time.perf_counter()
+    for i, event_id in enumerate(_ids(count)):
+        mapping[event_id] = i
+    build_s = time.perf_counter() - started
+
+    size = sys.getsizeof(mapping)
+    size += sum(sys.getsizeof(k) + (sys.getsizeof(v) if v > 256 else 0) for k, v in mapping.items())
+    return {
+        "impl": "dict",
+        "events": count,
+        "bytes": size,
+        "bytes_per_event": size / count,
+        "build_s": round(build_s, 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000_000, 100_000_000])
+    parser.add_argument("--dict-max", type=int, default=10_000_000)
+    parser.add_argument("--probes", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    results = []
+    for count in args.sizes:
+        results.append(measure_leaf_index(count, args.probes))
+        print(json.dumps(results[-1]), flush=True)
+        if count <= args.dict_max:
+            results.append(measure_dict(count))
+            print(json.dumps(results[-1]), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
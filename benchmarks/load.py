@@ -0,0 +1,301 @@
+"""
+End-to-end HTTP load harness for the audit service.
+
+Drives the real FastAPI app over HTTP, either one already running (``--url``)
+or one started in this process under uvicorn, with a weighted mix of ingest,
+list and proof requests plus long-lived SSE subscribers. Events are correctly
+hashed, so every request takes the production code path. Reports p50/p99
+latency and throughput per operation, and SSE delivery lag.
+
+Usage:
+    python -m benchmarks.load --duration 30 --concurrency 32
+    python -m benchmarks.load --store postgres --dsn postgresql://... --init-schema
+    python -m benchmarks.load --store postgres --ephemeral-postgres   # needs initdb/pg_ctl
+    python -m benchmarks.load --store postgres --ephemeral-postgres --ephemeral-replica
+    python -m benchmarks.load --url http://127.0.0.1:8000 --mix ingest=50,list=40,proof=10
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+
+
+def build_event_payload(principal: int) -> dict:
+    event = {
+        "schema_id": "talos.audit_event",
+        "schema_version": "v1",
+        "event_id": str(uuid.uuid4()),
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "request_id": f"req-{uuid.uuid4().hex[:12]}",
+        "surface_id": "load.op",
+        "outcome": random.choice(("OK", "OK", "OK", "DENY", "ERROR")),
+        "principal": {"auth_mode": "bearer", "principal_id": f"p-{principal}", "team_id": "t-1"},
+        "http": {"method": "POST", "path": "/v1/load", "status_code": 200},
+        "meta": {"session_id": f"s-{principal % 17}"},
+        "resource": None,
+    }
+    canonical = json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    event["event_hash"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return event
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def ephemeral_postgres():
+    """Throwaway Postgres cluster in a temp dir; yields its DSN."""
+    if not (shutil.which("initdb") and shutil.which("pg_ctl")):
+        raise SystemExit("--ephemeral-postgres needs initdb and pg_ctl on PATH")
+    data_dir = tempfile.mkdtemp(prefix="talos-audit-pg-")
+    port = _free_port()
+    subprocess.run(
+        ["initdb", "-D", data_dir, "-U", "postgres", "--auth=trust"],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    options = f"-p {port} -k {data_dir} -c listen_addresses=127.0.0.1 -c fsync=off"
+    subprocess.run(
+        ["pg_ctl", "-D", data_dir, "-o", options, "-w", "start"],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        yield f"postgresql://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run(["pg_ctl", "-D", data_dir, "-m", "immediate", "stop"], check=False)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def ephemeral_replica(primary_dsn: str):
+    """Streaming standby of an ephemeral primary (pg_basebackup -R); yields its DSN."""
+    if not shutil.which("pg_basebackup"):
+        raise SystemExit("--ephemeral-replica needs pg_basebackup on PATH")
+    data_dir = tempfile.mkdtemp(prefix="talos-audit-pg-replica-")
+    port = _free_port()
+    subprocess.run(
+        ["pg_basebackup", "-D", data_dir, "-R", "-X", "stream", "-d", primary_dsn],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    options = f"-p {port} -k {data_dir} -c listen_addresses=127.0.0.1"
+    subprocess.run(
+        ["pg_ctl", "-D", data_dir, "-o", options, "-w", "start"],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        yield f"postgresql://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run(["pg_ctl", "-D", data_dir, "-m", "immediate", "stop"], check=False)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def local_server(store: str, dsn: str | None, init_schema: bool, replica_dsns=()):
+    """Run the app under uvicorn in a background thread; yields its base URL."""
+    os.environ["TALOS__STORAGE_TYPE"] = store
+    if dsn:
+        os.environ["TALOS_DATABASE_URL"] = dsn
+    if replica_dsns:
+        os.environ["TALOS_DATABASE_REPLICA_URLS"] = ",".join(replica_dsns)
+    if store == "postgres" and init_schema:
+        from src.adapters.postgres_store import PostgresAuditStore
+
+        PostgresAuditStore(dsn).ensure_schema()
+
+    import uvicorn
+
+    from src.adapters.http.main import app
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.sent_at: dict[str, float] = {}
+        self.sse_lag: list[float] = []
+        self.known_ids: list[str] = []
+
+    def report(self, elapsed: float) -> dict:
+        ops = {}
+        for op, values in sorted(self.latencies.items()):
+            values.sort()
+            ops[op] = {
+                "count": len(values),
+                "errors": self.errors.get(op, 0),
+                "throughput_rps": len(values) / elapsed,
+                "p50_ms": percentile(values, 0.50) * 1e3,
+                "p99_ms": percentile(values, 0.99) * 1e3,
+            }
+        self.sse_lag.sort()
+        return {
+            "elapsed_s": elapsed,
+            "total_rps": sum(len(v) for v in self.latencies.values()) / elapsed,
+            "ops": ops,
+            "sse": {
+                "frames": len(self.sse_lag),
+                "lag_p50_ms": percentile(self.sse_lag, 0.50) * 1e3,
+                "lag_p99_ms": percentile(self.sse_lag, 0.99) * 1e3,
+            },
+        }
+
+
+async def _worker(client: httpx.AsyncClient, mix, stats: LoadStats, deadline: float, seed: int):
+    rng = random.Random(seed)
+    ops, weights = zip(*mix.items())
+    while time.perf_counter() < deadline:
+        op = rng.choices(ops, weights)[0]
+        if op == "proof" and not stats.known_ids:
+            op = "ingest"
+        started = time.perf_counter()
+        if op == "ingest":
+            payload = build_event_payload(rng.randrange(1000))
+            stats.sent_at[payload["event_id"]] = started
+            resp = await client.post("/events?ack=minimal", json=payload)
+            if resp.status_code == 200:
+                stats.known_ids.append(payload["event_id"])
+        elif op == "list":
+            resp = await client.get("/api/events", params={"limit": 200})
+        else:
+            resp = await client.get(f"/proof/{rng.choice(stats.known_ids)}")
+        stats.latencies[op].append(time.perf_counter() - started)
+        if resp.status_code >= 400:
+            stats.errors[op] += 1
+
+
+async def _sse_client(client: httpx.AsyncClient, stats: LoadStats, deadline: float):
+    with contextlib.suppress(httpx.HTTPError, asyncio.TimeoutError):
+        async with client.stream("GET", "/events", timeout=None) as resp:
+            event_type = None
+            async for line in resp.aiter_lines():
+                if line.startswith("event:"):
+                    event_type = line.split(":", 1)[1].strip()
+                elif line.startswith("data:") and event_type == "audit_event":
+                    event_id = json.loads(line.split(":", 1)[1]).get("event_id")
+                    sent = stats.sent_at.get(event_id)
+                    if sent is not None:
+                        stats.sse_lag.append(time.perf_counter() - sent)
+                if time.perf_counter() >= deadline:
+                    return
+
+
+async def run_load(base_url: str, args) -> dict:
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=args.concurrency + args.sse_clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + args.duration
+        sse = [
+            asyncio.create_task(_sse_client(client, stats, deadline))
+            for _ in range(args.sse_clients)
+        ]
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_worker(client, args.mix, stats, deadline, i) for i in range(args.concurrency))
+        )
+        elapsed = time.perf_counter() - started
+        for task in sse:
+            task.cancel()
+        await asyncio.gather(*sse, return_exceptions=True)
+    return stats.report(elapsed)
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        op, _, weight = part.partition("=")
+        if op not in ("ingest", "list", "proof"):
+            raise argparse.ArgumentTypeError(f"unknown op {op!r}")
+        mix[op] = int(weight)
+    return mix
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Audit service HTTP load harness")
+    parser.add_argument("--url", help="Target a running server instead of starting one")
+    parser.add_argument("--store", choices=("memory", "postgres"), default="memory")
+    parser.add_argument("--dsn", help="Postgres DSN for --store postgres")
+    parser.add_argument("--init-schema", action="store_true", help="Create the events table")
+    parser.add_argument("--ephemeral-postgres", action="store_true")
+    parser.add_argument(
+        "--replica-dsn", action="append", default=[], help="Read replica DSN (repeatable)"
+    )
+    parser.add_argument(
+        "--ephemeral-replica",
+        action="store_true",
+        help="Add a streaming standby of --ephemeral-postgres",
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sse-clients", type=int, default=4)
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix("ingest=70,list=20,proof=10"))
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        base_url = args.url
+        if not base_url:
+            dsn = args.dsn
+            replicas = list(args.replica_dsn)
+            if args.store == "postgres" and args.ephemeral_postgres:
+                dsn = stack.enter_context(ephemeral_postgres())
+                args.init_schema = True
+                if args.ephemeral_replica:
+                    # Create the schema before the base backup (it replicates anyway).
+                    from src.adapters.postgres_store import PostgresAuditStore
+
+                    PostgresAuditStore(dsn).ensure_schema()
+                    replicas.append(stack.enter_context(ephemeral_replica(dsn)))
+            base_url = stack.enter_context(
+                local_server(args.store, dsn, args.init_schema, replicas)
+            )
+        report = asyncio.run(run_load(base_url, args))
+
+    report["target"] = args.url or f"in-process ({args.store})"
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Benchmark runner with baseline regression gates.
+
+Runs the cases in ``benchmarks/cases.py``, writes the results as JSON and
+compares them with the baseline committed next to this file. Any metric that
+is worse than its baseline by more than ``--tolerance`` fails the run (exit
+code 1), and so does a missing baseline or a metric the baseline lacks.
+Baselines are machine-specific: re-record one on the machine that gates.
+
+Usage:
+    python -m benchmarks.run                        # quick profile, compare
+    python -m benchmarks.run --profile full         # 1k/100k/1M ingest
+    python -m benchmarks.run --save-baseline        # record a new baseline, commit it
+    python -m benchmarks.run --only ingest proof
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from benchmarks.cases import PROFILES, Metric
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+
+def compare(results: list[Metric], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Return one message per metric that regressed past tolerance or has no baseline."""
+    regressions = []
+    for metric in results:
+        base = baseline.get(metric.name)
+        if not base or not base.get("value"):
+            regressions.append(f"{metric.name}: no baseline value; re-record with --save-baseline")
+            continue
+        ratio = metric.value / base["value"]
+        worse = ratio < 1 - tolerance if metric.better == "higher" else ratio > 1 + tolerance
+        if worse:
+            regressions.append(
+                f"{metric.name}: {metric.value:.2f} {metric.unit} vs baseline "
+                f"{base['value']:.2f} ({(ratio - 1) * 100:+.1f}%)"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Audit service benchmarks")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--only", nargs="+", help="Subset of cases to run")
+    parser.add_argument("--output", type=Path, default=BENCH_DIR / "results.json")
+    parser.add_argument("--baseline", type=Path, help="Default: benchmarks/baseline-<profile>.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    cases = PROFILES[args.profile]
+    names = args.only or list(cases)
+    unknown = set(names) - set(cases)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results: list[Metric] = []
+    for name in names:
+        started = time.perf_counter()
+        metrics = cases[name]()
+        for metric in metrics:
+            print(f"{metric.name:<32} {metric.value:>14.2f} {metric.unit}", flush=True)
+        print(f"  [{name} took {time.perf_counter() - started:.1f}s]", flush=True)
+        results.extend(metrics)
+
+    report = {
+        "profile": args.profile,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.time(),
+        "metrics": {m.name: asdict(m) for m in results},
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    baseline_path = args.baseline or BENCH_DIR / f"baseline-{args.profile}.json"
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; record one with --save-baseline.")
+        return 1
+
+    baseline = json.loads(baseline_path.read_text()).get("metrics", {})
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"\nNo regressions beyond {args.tolerance:.0%} against {baseline_path.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
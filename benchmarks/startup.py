@@ -0,0 +1,111 @@
+"""
+Worker startup cost: an import-time report and the time to a ready service.
+
+    python -m benchmarks.startup                    # top imports of src.main
+    python -m benchmarks.startup --budget-ms 1500   # exit 1 when over budget
+
+Each measurement runs in a fresh interpreter, as a newly scaled-out worker
+would. The report is ``python -X importtime`` output, sorted by cumulative
+time.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Imported on demand only: a worker that does not use them must not pay for them.
+LAZY_MODULES = (
+    "msgpack",
+    "cbor2",
+    "psycopg2",
+    "cryptography",
+    "talos_config",
+    "src.adapters.memory_store",
+    "src.adapters.postgres_store",
+    "src.adapters.sqlite_store",
+    "src.adapters.archive",
+    "src.adapters.wal",
+    "src.core.sequencer",
+)
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _run(code: str, flags: tuple = (), env: dict | None = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, **(env or {})},
+    )
+
+
+def import_profile(module: str = "src.main") -> list[ImportRecord]:
+    """Parsed ``-X importtime`` lines for importing ``module``, in import order."""
+    stderr = _run(f"import {module}", ("-X", "importtime")).stderr
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def import_ms(profile: list[ImportRecord], module: str = "src.main") -> float:
+    """Total time to import ``module`` (its own entry's cumulative time)."""
+    return next(r.cumulative_us for r in reversed(profile) if r.module == module) / 1000
+
+
+def loaded_lazy_modules(module: str = "src.main") -> list[str]:
+    """Modules from LAZY_MODULES that importing ``module`` loads anyway."""
+    code = f"import sys, {module}; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    return [name for name in _run(code).stdout.strip().split(",") if name]
+
+
+def ready_ms() -> float:
+    """Import, load config and bootstrap a memory-store service, in milliseconds."""
+    code = (
+        "import time; started = time.perf_counter(); import src.main; "
+        "from src.bootstrap import get_app_container; get_app_container(); "
+        "print((time.perf_counter() - started) * 1000)"
+    )
+    return float(_run(code, env={"TALOS__STORAGE_TYPE": "memory"}).stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Audit service startup cost")
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--budget-ms", type=float, help="Fail when the import takes longer")
+    args = parser.parse_args(argv)
+
+    profile = import_profile(args.module)
+    total = import_ms(profile, args.module)
+    print(f"{'module':60} {'self ms':>9} {'cum ms':>9}")
+    for record in sorted(profile, key=lambda r: r.cumulative_us, reverse=True)[: args.top]:
+        name = "  " * record.depth + record.module
+        print(f"{name:60} {record.self_us / 1000:9.1f} {record.cumulative_us / 1000:9.1f}")
+    print(f"\nimport {args.module}: {total:.1f} ms")
+
+    eager = loaded_lazy_modules(args.module)
+    if eager:
+        print(f"loaded at import but should be lazy: {', '.join(eager)}")
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"over budget: {total:.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    return 1 if eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
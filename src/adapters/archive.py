@@ -0,0 +1,322 @@
+"""
+Cold-tier archive: compressed, columnar segment files on local disk.
+
+One file per epoch. Rows (in key order: timestamp second, then event_id) are cut into blocks of
+``block_rows``; every column of every block is a separately compressed JSON
+array, so a read decodes only the columns and blocks it needs. The header
+carries the segment's epoch Merkle root (``ArchiveSegment``), a sparse
+index (cursor and timestamp range per block) and a Bloom filter over the
+segment's event ids.
+
+File layout: ``MAGIC | u32 header length | header JSON | chunks``.
+Chunk offsets in the header are relative to the end of the header.
+"""
+
+import bisect
+import itertools
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from types import SimpleNamespace
+from typing import Any
+
+from src.domain.bloom import BloomFilter
+from src.domain.models import ArchiveSegment, decode_key
+from src.ports.common import IArchivePort
+
+try:  # Optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+logger = logging.getLogger("audit-archive")
+
+MAGIC = b"TALOSSEG1\n"
+BLOOM_ERROR_RATE = 0.001
+# Segments whose event_id -> row maps are kept decoded (proofs, dedup hits).
+ID_MAP_CACHE = 4
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Archive segment is zstd-compressed; install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class ArchivedEventRow(SimpleNamespace):
+    """Read model for one archived event: the Event fields plus cursor, timestamp and epoch."""
+
+    def model_dump(self) -> dict[str, Any]:
+        record = dict(vars(self))
+        record.pop("leaf_hash", None)
+        record.pop("tree_index", None)
+        return record
+
+    def dict(self) -> dict[str, Any]:
+        return self.model_dump()
+
+
+class _Segment:
+    """An open segment file: parsed header and Bloom filter; blocks are read on demand."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an archive segment")
+            (header_length,) = struct.unpack(">I", f.read(4))
+            header = json.loads(f.read(header_length))
+        self._data_offset = len(MAGIC) + 4 + header_length
+        self.info = ArchiveSegment(**header["segment"])
+        self.codec = header["codec"]
+        self.blocks: list[dict[str, Any]] = header["blocks"]
+        self.first_keys = [decode_key(block["first_cursor"]) for block in self.blocks]
+        bloom = header["bloom"]
+        self.bloom = BloomFilter.from_bytes(
+            self._read(bloom["offset"], bloom["length"]),
+            bloom["capacity"],
+            bloom["error_rate"],
+            bloom["count"],
+        )
+
+    def _read(self, offset: int, length: int) -> bytes:
+        with open(self.path, "rb") as f:
+            f.seek(self._data_offset + offset)
+            return f.read(length)
+
+    def column(self, block_no: int, name: str) -> list[Any]:
+        offset, length = self.blocks[block_no]["chunks"][name]
+        return json.loads(_decompress(self._read(offset, length), self.codec))
+
+    def rows(self, block_no: int) -> list[ArchivedEventRow]:
+        names = list(self.blocks[block_no]["chunks"])
+        columns = [self.column(block_no, name) for name in names]
+        epoch = self.info.epoch
+        return [
+            ArchivedEventRow(**dict(zip(names, values)), epoch=epoch) for values in zip(*columns)
+        ]
+
+    def event_ids(self) -> Iterator[str]:
+        for block_no in range(len(self.blocks)):
+            yield from self.column(block_no, "event_id")
+
+
+class SegmentArchive(IArchivePort):
+    """
+    Directory of segment files. Segments written by another process (the
+    sequencer, in multi-worker mode) are picked up when the directory changes.
+    """
+
+    def __init__(self, directory: str, block_rows: int = 4096):
+        self._directory = directory
+        self._block_rows = block_rows
+        self._codec = "zstd" if zstandard is not None else "zlib"
+        self._segments: dict[int, _Segment] = {}
+        self._id_maps: OrderedDict[int, dict[str, int]] = OrderedDict()
+        self._mtime_ns: int | None = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._refresh()
+
+    def _path(self, epoch: int) -> str:
+        return os.path.join(self._directory, f"segment-{epoch:08d}.tseg")
+
+    def _refresh(self) -> None:
+        mtime_ns = os.stat(self._directory).st_mtime_ns
+        if mtime_ns == self._mtime_ns:
+            return
+        with self._lock:
+            for name in sorted(os.listdir(self._directory)):
+                if not (name.startswith("segment-") and name.endswith(".tseg")):
+                    continue
+                epoch = int(name[len("segment-") : -len(".tseg")])
+                if epoch not in self._segments:
+                    try:
+                        self._segments[epoch] = _Segment(os.path.join(self._directory, name))
+                    except (OSError, ValueError) as e:
+                        logger.error(f"Skipping unreadable archive segment {name}: {e}")
+            self._mtime_ns = mtime_ns
+
+    def _ordered(self) -> list[_Segment]:
+        self._refresh()
+        return [self._segments[epoch] for epoch in sorted(self._segments)]
+
+    def write_segment(self, segment: ArchiveSegment, rows: list[dict[str, Any]]) -> None:
+        """Write a segment atomically (temp file, fsync, rename); rows must be in key order."""
+        if not rows:
+            raise ValueError("Refusing to write an empty segment")
+        keys = [decode_key(row["cursor"]) for row in rows]
+        if any(a > b for a, b in itertools.pairwise(keys)):
+            raise ValueError("Segment rows must be in key order")
+
+        names = list(rows[0])
+        body = bytearray()
+        blocks = []
+        for start in range(0, len(rows), self._block_rows):
+            block = rows[start : start + self._block_rows]
+            chunks = {}
+            for name in names:
+                encoded = json.dumps([row.get(name) for row in block], separators=(",", ":"))
+                data = _compress(encoded.encode("utf-8"), self._codec)
+                chunks[name] = [len(body), len(data)]
+                body += data
+            timestamps = [row["timestamp"] for row in block]
+            blocks.append(
+                {
+                    "rows": len(block),
+                    "first_cursor": block[0]["cursor"],
+                    "last_cursor": block[-1]["cursor"],
+                    "min_ts": min(timestamps),
+                    "max_ts": max(timestamps),
+                    "chunks": chunks,
+                }
+            )
+
+        bloom = BloomFilter(len(rows), BLOOM_ERROR_RATE)
+        for row in rows:
+            bloom.add(row["event_id"])
+        bits = bloom.to_bytes()
+        bloom_meta = {
+            "offset": len(body),
+            "length": len(bits),
+            "capacity": bloom.capacity,
+            "error_rate": bloom.error_rate,
+            "count": bloom.count,
+        }
+        body += bits
+
+        header = json.dumps(
+            {
+                "format": 1,
+                "segment": segment.model_dump(),
+                "codec": self._codec,
+                "blocks": blocks,
+                "bloom": bloom_meta,
+            }
+        ).encode("utf-8")
+
+        path = self._path(segment.epoch)
+        if os.path.exists(path):
+            raise FileExistsError(f"Archive segment for epoch {segment.epoch} already exists")
+        tmp = os.path.join(self._directory, f".segment-{segment.epoch:08d}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack(">I", len(header)) + header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        dir_fd = os.open(self._directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        with self._lock:
+            self._segments[segment.epoch] = _Segment(path)
+
+    def segments(self) -> list[ArchiveSegment]:
+        return [segment.info for segment in self._ordered()]
+
+    def _id_map(self, segment: _Segment) -> dict[str, int]:
+        epoch = segment.info.epoch
+        with self._lock:
+            id_map = self._id_maps.get(epoch)
+            if id_map is not None:
+                self._id_maps.move_to_end(epoch)
+                return id_map
+        id_map = {event_id: row for row, event_id in enumerate(segment.event_ids())}
+        with self._lock:
+            self._id_maps[epoch] = id_map
+            while len(self._id_maps) > ID_MAP_CACHE:
+                self._id_maps.popitem(last=False)
+        return id_map
+
+    def locate(self, event_id: str) -> int | None:
+        for segment in reversed(self._ordered()):
+            if segment.bloom.might_contain(event_id) and event_id in self._id_map(segment):
+                return segment.info.epoch
+        return None
+
+    def read_leaves(self, epoch: int) -> tuple[list[str], list[bytes]]:
+        self._refresh()
+        segment = self._segments[epoch]
+        event_ids: list[str] = []
+        leaves: list[bytes] = []
+        for block_no in range(len(segment.blocks)):
+            event_ids += segment.column(block_no, "event_id")
+            leaves += map(bytes.fromhex, segment.column(block_no, "leaf_hash"))
+        return event_ids, leaves
+
+    def iter_tree_leaves(self) -> Iterator[tuple[int | None, str, bytes]]:
+        for segment in self._ordered():
+            for block_no, block in enumerate(segment.blocks):
+                event_ids = segment.column(block_no, "event_id")
+                leaves = map(bytes.fromhex, segment.column(block_no, "leaf_hash"))
+                # Segments cut before tree indices were recorded have no such column.
+                if "tree_index" in block["chunks"]:
+                    indices = segment.column(block_no, "tree_index")
+                else:
+                    indices = [None] * len(event_ids)
+                yield from zip(indices, event_ids, leaves)
+
+    def iter_events(
+        self, start_ts: float | None = None, end_ts: float | None = None
+    ) -> Iterator[ArchivedEventRow]:
+        for segment in self._ordered():
+            if start_ts is not None and segment.info.end_ts < start_ts:
+                continue
+            if end_ts is not None and segment.info.start_ts >= end_ts:
+                continue
+            for block_no, block in enumerate(segment.blocks):
+                # Sparse index: skip blocks wholly outside the time range.
+                if start_ts is not None and block["max_ts"] < start_ts:
+                    continue
+                if end_ts is not None and block["min_ts"] >= end_ts:
+                    continue
+                for row in segment.rows(block_no):
+                    if start_ts is not None and row.timestamp < start_ts:
+                        continue
+                    if end_ts is not None and row.timestamp >= end_ts:
+                        continue
+                    yield row
+
+    def list(self, before: str | None = None, limit: int = 100) -> list[ArchivedEventRow]:
+        # Cursors are compared as keys: base64 text does not sort like (timestamp, event_id).
+        before_key = decode_key(before) if before is not None else None
+        candidates: list[ArchivedEventRow] = []
+        for segment in self._ordered():
+            if before_key is not None and decode_key(segment.info.first_cursor) >= before_key:
+                continue
+            # Sparse index: blocks at or after this one start at/after the cursor.
+            end = len(segment.blocks)
+            if before_key is not None:
+                end = bisect.bisect_left(segment.first_keys, before_key)
+            taken = 0
+            for block_no in range(end - 1, -1, -1):
+                rows = [
+                    r
+                    for r in segment.rows(block_no)
+                    if before_key is None or decode_key(r.cursor) < before_key
+                ]
+                candidates += rows
+                taken += len(rows)
+                if taken >= limit:
+                    break
+        candidates.sort(key=lambda row: decode_key(row.cursor))
+        return candidates[-limit:] if limit > 0 else []
+
+    def iter_event_ids(self) -> Iterable[str]:
+        for segment in self._ordered():
+            yield from segment.event_ids()
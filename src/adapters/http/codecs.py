@@ -0,0 +1,116 @@
+"""
+Content-negotiated request body decoding for ingest.
+
+JSON bodies go straight through pydantic-core's JSON parser
+(``model_validate_json``), so no intermediate ``dict`` tree is built.
+MessagePack and CBOR are decoded by their C extensions into plain
+containers and validated into ``Event`` in one ``validate_python`` call.
+Both binary codecs are optional dependencies (``msgpack``, ``cbor2``),
+imported on first use so they cost nothing at worker startup.
+
+A body is either a single event (object/map) or a batch (array).
+"""
+
+import importlib
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from src.domain.models import Event
+
+_OPTIONAL = ("msgpack", "cbor2")
+
+
+def __getattr__(name: str) -> Any:
+    # ``codecs.msgpack`` / ``codecs.cbor2``: the module, or None if not installed.
+    if name not in _OPTIONAL:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = importlib.import_module(name)
+    except ImportError:  # pragma: no cover - depends on environment
+        module = None
+    globals()[name] = module
+    return module
+
+
+def _optional(name: str) -> Any:
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+
+_ALIASES = {
+    "": JSON,
+    "text/json": JSON,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+_EVENTS = TypeAdapter(list[Event])
+
+
+class UnsupportedMediaType(Exception):
+    """The Content-Type is unknown, or its codec is not installed."""
+
+
+def media_type(content_type: str | None) -> str:
+    """Normalize a Content-Type header: parameters dropped, aliases resolved."""
+    base = (content_type or "").split(";", 1)[0].strip().lower()
+    if base.endswith("+json"):
+        return JSON
+    return _ALIASES.get(base, base)
+
+
+def _msgpack_loads(body: bytes) -> Any:
+    # raw=False: str payloads come back as str, as canonical JSON needs.
+    return _optional("msgpack").unpackb(body, raw=False)
+
+
+def _cbor_loads(body: bytes) -> Any:
+    return _optional("cbor2").loads(body)
+
+
+def _loaders() -> dict[str, Callable[[bytes], Any]]:
+    loaders = {}
+    if _optional("msgpack") is not None:
+        loaders[MSGPACK] = _msgpack_loads
+    if _optional("cbor2") is not None:
+        loaders[CBOR] = _cbor_loads
+    return loaders
+
+
+def available_media_types() -> tuple:
+    return (JSON, *_loaders())
+
+
+def decode_events(body: bytes, content_type: str | None) -> tuple[list[Event], bool]:
+    """
+    Decode and validate an ingest body.
+
+    Returns ``(events, is_batch)``. Raises ``UnsupportedMediaType`` for an
+    unknown or unavailable codec, ``ValueError`` for an undecodable body and
+    ``pydantic.ValidationError`` for a body that is not an event (or list
+    of events).
+    """
+    kind = media_type(content_type)
+    if kind == JSON:
+        if body.lstrip()[:1] == b"[":
+            return _EVENTS.validate_json(body), True
+        return [Event.model_validate_json(body)], False
+
+    loads = _loaders().get(kind)
+    if loads is None:
+        known = kind in (MSGPACK, CBOR)
+        raise UnsupportedMediaType(
+            f"{kind} support is not installed" if known else f"Unsupported media type: {kind}"
+        )
+    try:
+        data = loads(body)
+    except Exception as e:  # each codec has its own error hierarchy
+        raise ValueError(f"Malformed {kind} body: {e}") from e
+    if isinstance(data, list):
+        return _EVENTS.validate_python(data), True
+    return [Event.model_validate(data)], False
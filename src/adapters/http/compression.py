@@ -0,0 +1,256 @@
+"""
+Streaming compression codecs for HTTP bodies.
+
+gzip is always available; zstd needs the optional ``zstandard`` package.
+
+Besides the export helpers this module provides ``decompress`` for
+``Content-Encoding``-compressed request bodies and ``CompressionMiddleware``,
+which negotiates response compression from ``Accept-Encoding``.
+"""
+
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Protocol
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # Optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+
+# Bodies smaller than this are sent as-is: the codec framing would eat the gain.
+MINIMUM_SIZE = 1024
+# Bodies (or streamed chunks) at least this large are (de)compressed in a
+# worker thread so the event loop keeps serving other requests.
+OFFLOAD_SIZE = 64 * 1024
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def sync(self) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class DecompressedTooLarge(ValueError):
+    """A compressed body expands past the allowed size."""
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits=31 selects the gzip container rather than raw zlib.
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def sync(self) -> bytes:
+        """Emit everything compressed so far without ending the stream."""
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def sync(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+def available_codecs() -> tuple:
+    return ("gzip", "zstd") if zstandard is not None else ("gzip",)
+
+
+def new_compressor(codec: str, level: int | None = None) -> Compressor:
+    """Return an incremental compressor for codec ('gzip' or 'zstd')."""
+    if codec == "gzip":
+        return _GzipCompressor(6 if level is None else level)
+    if codec == "zstd" and zstandard is not None:
+        return _ZstdCompressor(3 if level is None else level)
+    raise ValueError(f"Unsupported compression codec: {codec}")
+
+
+def compress_stream(chunks: Iterable[bytes], codec: str) -> Iterator[bytes]:
+    compressor = new_compressor(codec)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    tail = compressor.flush()
+    if tail:
+        yield tail
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    compressor = new_compressor(codec)
+    return compressor.compress(data) + compressor.flush()
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Pick the best available codec the client accepts (zstd over gzip)."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for codec in reversed(available_codecs()):
+        q = weights.get(codec, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = codec, q
+    return best
+
+
+def decompress(data: bytes, codec: str, max_size: int) -> bytes:
+    """
+    Decode a Content-Encoding'd body of at most max_size bytes.
+
+    Raises ``DecompressedTooLarge`` if the body expands past max_size
+    (decoding stops there), ``ValueError`` for a corrupt body and
+    ``LookupError`` for an unknown or unavailable codec.
+    """
+    codec = codec.strip().lower()
+    if codec in ("gzip", "x-gzip"):
+        out = bytearray()
+        try:
+            while data:  # concatenated gzip members form one body
+                obj = zlib.decompressobj(31)
+                out += obj.decompress(data, max_size + 1 - len(out))
+                if len(out) > max_size or obj.unconsumed_tail:
+                    raise DecompressedTooLarge(f"Body expands past {max_size} bytes")
+                if not obj.eof:
+                    raise ValueError("Truncated gzip body")
+                data = obj.unused_data
+        except zlib.error as e:
+            raise ValueError(f"Corrupt gzip body: {e}") from e
+        return bytes(out)
+    if codec == "zstd" and zstandard is not None:
+        out = bytearray()
+        try:
+            reader = zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True)
+            with reader:
+                while chunk := reader.read(max_size + 1 - len(out)):
+                    out += chunk
+                    if len(out) > max_size:
+                        raise DecompressedTooLarge(f"Body expands past {max_size} bytes")
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Corrupt zstd body: {e}") from e
+        return bytes(out)
+    if codec == "identity":
+        return data
+    raise LookupError(f"Unsupported Content-Encoding: {codec}")
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/zstd response compression for selected paths.
+
+    Unlike Starlette's GZipMiddleware this speaks zstd, compresses large
+    bodies in a worker thread, and sync-flushes each chunk of a streamed
+    body, so SSE frames and NDJSON pages reach the client as they are
+    produced while still sharing one compression context. Responses that
+    already carry a Content-Encoding, or complete bodies under
+    ``minimum_size``, pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Sequence[str],
+        minimum_size: int = MINIMUM_SIZE,
+        offload_size: int = OFFLOAD_SIZE,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        codec = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(send, codec, self).send)
+
+
+class _CompressingSender:
+    def __init__(self, send: Send, codec: str, options: CompressionMiddleware):
+        self._send = send
+        self._codec = codec
+        self._options = options
+        self._start: Message | None = None
+        self._compressor: Compressor | None = None
+        self._passthrough = False
+
+    async def _run(self, fn, data: bytes) -> bytes:
+        if len(data) >= self._options.offload_size:
+            return await anyio.to_thread.run_sync(fn, data)
+        return fn(data)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            status = message["status"]
+            self._passthrough = (
+                "content-encoding" in headers or status < 200 or status in (204, 304)
+            )
+            if self._passthrough:
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._compressor is None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                if len(body) >= self._options.minimum_size:
+                    body = await self._run(lambda data: compress(data, self._codec), body)
+                    headers["Content-Encoding"] = self._codec
+                    headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                self._passthrough = True
+                return
+            headers["Content-Encoding"] = self._codec
+            del headers["Content-Length"]
+            self._compressor = new_compressor(self._codec)
+            await self._send(start)
+
+        compressor = self._compressor
+        if more_body:
+            out = await self._run(lambda data: compressor.compress(data) + compressor.sync(), body)
+        else:
+            out = await self._run(lambda data: compressor.compress(data) + compressor.flush(), body)
+        await self._send({"type": "http.response.body", "body": out, "more_body": more_body})
@@ -1,48 +1,132 @@
-from fastapi import FastAPI, HTTPException, Depends, Request
-import time
-import json
 import asyncio
-from sse_starlette.sse import EventSourceResponse
-
-from src.domain.services import AuditService
-from src.domain.models import Event, RootView, ProofView
-from src.domain.errors import DomainError, ValidationError, NotFoundError, ConflictError
-from src.bootstrap import get_audit_service, get_broadcaster
-from src.core.broadcaster import EventBroadcaster
-
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from fastapi.responses import Response
+import contextlib
+import hmac
+import json
 import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Literal
 
-logger = logging.getLogger("audit-service")
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from pydantic import ValidationError as PydanticValidationError
+from sse_starlette.sse import EventSourceResponse
 
-# Prometheus metrics
-AUDIT_INGEST_REQUESTS = Counter(
-    "audit_ingest_requests_total",
-    "Total audit ingest requests received"
+from src.adapters.http.codecs import UnsupportedMediaType, decode_events
+from src.adapters.http.compression import (
+    OFFLOAD_SIZE,
+    CompressionMiddleware,
+    DecompressedTooLarge,
+    available_codecs,
+    compress_stream,
+    decompress,
 )
-AUDIT_PERSIST_SUCCESS = Counter(
-    "audit_persist_success_total",
-    "Total audit events successfully persisted"
+from src.adapters.http.responses import (
+    cached_json_response,
+    encode_json,
+    json_response,
+    ndjson_chunks,
 )
-AUDIT_PERSIST_FAILURE = Counter(
-    "audit_persist_failure_total",
-    "Total audit events that failed to persist"
+from src.bootstrap import (
+    get_admission,
+    get_app_container,
+    get_audit_service,
+    get_broadcaster,
+    get_proof_broadcaster,
 )
+from src.config import get_settings
+from src.core import profiling
+from src.core.admission import AdmissionController
+from src.core.broadcaster import EventBroadcaster, ProofBroadcaster
+from src.core.metrics import AUDIT_INGEST_REQUESTS, AUDIT_PERSIST_FAILURE, AUDIT_PERSIST_SUCCESS
+from src.domain.errors import (
+    ConflictError,
+    DomainError,
+    NotFoundError,
+    OverloadedError,
+    UnavailableError,
+    ValidationError,
+)
+from src.domain.models import ConsistencyProof, Event, ProofView, RootView
+from src.domain.services import AuditService
+
+logger = logging.getLogger("audit-service")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    if get_settings().sequencer_address:
+        # Multi-worker mode: relay events committed by any worker to our SSE clients.
+        from src.core.sequencer import SequencedAuditService
+
+        service = get_audit_service()
+        if isinstance(service, SequencedAuditService):
+            service.start_event_relay(asyncio.get_running_loop(), get_proof_broadcaster())
+    else:
+        # Recover the tree off the request path; /ready reports progress.
+        service = get_app_container().resolve(AuditService)
+        service.recovery.schedule()
+        tasks.append(asyncio.create_task(_recover_and_run(service)))
+    yield
+    for task in tasks:
+        task.cancel()
+
+
+async def _recover_and_run(service: AuditService) -> None:
+    """
+    Rebuild the tree (retrying while the store is unreachable), then run the
+    time-based root snapshots and archival; in multi-worker mode the
+    sequencer does all of this.
+    """
+    delay = 1.0
+    while True:
+        try:
+            await asyncio.to_thread(service.recover)
+            break
+        except Exception as e:
+            logger.error(f"Merkle tree recovery failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+    periodic = []
+    if service.snapshots is not None:
+        periodic.append(service.snapshots.run_periodic())
+    if service.retention is not None:
+        periodic.append(service.retention.run_periodic())
+    await asyncio.gather(*periodic)
+
+
+CONSISTENCY_HEADER = "X-Consistency-Token"
 
 
 app = FastAPI(
     title="Talos Audit Service",
     description="Pydantic-first Audit log query and analytics service",
     version="0.3.0",
+    lifespan=lifespan,
 )
+# Negotiated (Accept-Encoding) compression for the bulky read paths and SSE.
+app.add_middleware(CompressionMiddleware, paths=("/api/events", "/api/events/export", "/events"))
 
 
 @app.get("/health")
 def health_check():
+    """Liveness only; use /ready to know whether the tree is caught up."""
     return {"status": "ok", "service": "audit-service", "timestamp": time.time()}
 
 
+@app.get("/ready")
+def readiness(service: AuditService = Depends(get_audit_service)):
+    """200 once the Merkle tree is recovered; 503 with recovery progress until then."""
+    status = service.recovery_status()
+    if status.state == "ready":
+        return json_response(status)
+    return json_response(status, status_code=503, headers={"Retry-After": "1"})
+
+
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint"""
@@ -59,33 +143,189 @@ def version():
     }
 
 
+def _unavailable(e: UnavailableError) -> HTTPException:
+    """503, or 429 when the request was shed for capacity; either way with Retry-After."""
+    return HTTPException(
+        status_code=429 if isinstance(e, OverloadedError) else 503,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def _ingest_error(e: Exception) -> HTTPException:
+    """Map an ingest failure to its HTTP error."""
+    if isinstance(e, ValidationError):
+        return HTTPException(status_code=400, detail=str(e))
+    if isinstance(e, ConflictError):
+        return HTTPException(status_code=409, detail=str(e))
+    if isinstance(e, UnavailableError):
+        return _unavailable(e)
+    if isinstance(e, DomainError):
+        return HTTPException(status_code=500, detail=str(e))
+    logger.error(f"Unexpected error during event ingestion: {e}")
+    return HTTPException(status_code=500, detail="Internal ingestion error")
+
+
+def _decode_body(body: bytes, content_encoding: str | None, content_type: str | None):
+    if content_encoding:
+        body = decompress(body, content_encoding, get_settings().max_ingest_bytes)
+    return decode_events(body, content_type)
+
+
+async def _read_events(request: Request):
+    """Undo Content-Encoding and decode; large bodies are handled off the event loop."""
+    body = await request.body()
+    args = (body, request.headers.get("content-encoding"), request.headers.get("content-type"))
+    if len(body) >= OFFLOAD_SIZE:
+        return await asyncio.to_thread(_decode_body, *args)
+    return _decode_body(*args)
+
+
+async def _ingest_one(service: AuditService, event: Event, ack: str):
+    if ack == "proof":
+        receipt = await service.ingest_event_proof(event)
+    else:
+        receipt = await service.ingest_event_ack(event)
+    return event if ack == "full" else receipt
+
+
+async def _ingest_batch(service: AuditService, events: list[Event], ack: str) -> dict:
+    """Ingest in order; per-event failures are reported, not raised."""
+    if ack == "proof":
+        # Receipts arrive together when the snapshot seals; wait for them concurrently.
+        outcomes = await asyncio.gather(
+            *(_ingest_one(service, event, ack) for event in events), return_exceptions=True
+        )
+    else:
+        outcomes = []
+        for event in events:
+            try:
+                outcomes.append(await _ingest_one(service, event, ack))
+            except Exception as e:
+                outcomes.append(e)
+
+    items, errors = [], []
+    for index, (event, outcome) in enumerate(zip(events, outcomes)):
+        if isinstance(outcome, Exception):
+            AUDIT_PERSIST_FAILURE.inc()
+            error = _ingest_error(outcome)
+            errors.append({
+                "index": index,
+                "event_id": event.event_id,
+                "status_code": error.status_code,
+                "detail": error.detail,
+            })
+        else:
+            AUDIT_PERSIST_SUCCESS.inc()
+            items.append(outcome)
+    return {"items": items, "errors": errors}
+
+
 @app.post("/events")
 @app.post("/api/events/ingest")
-async def create_event(event: Event, service: AuditService = Depends(get_audit_service)):
+async def create_event(
+    request: Request,
+    ack: Literal["full", "minimal", "proof"] = "full",
+    service: AuditService = Depends(get_audit_service),
+    admission: AdmissionController | None = Depends(get_admission),
+):
+    """
+    Ingest an audit event, or a batch of them.
+
+    The body is an event object or an array of events, encoded per
+    Content-Type: ``application/json`` (default), ``application/msgpack``
+    or ``application/cbor``. A binary codec that is not installed answers
+    415. Whatever the encoding, ``event_hash`` is checked against the
+    RFC 8785 canonical JSON form. The body may be compressed
+    (``Content-Encoding: gzip`` or ``zstd``); it may expand to at most
+    ``max_ingest_bytes`` (413 beyond that).
+
+    The response is pre-encoded JSON: the stored event (default) or, with
+    ``?ack=minimal``, just ``{event_id, leaf_index, root}``.
+
+    ``?ack=proof`` holds the response until the next root snapshot seals and
+    returns the event's inclusion proof against it (a ProofReceipt), saving
+    the follow-up ``GET /proof/{event_id}``.
+
+    A batch is answered with ``{"items": [...], "errors": [...]}``: one item
+    per stored event in request order, and per rejected event its index,
+    event_id, status_code and detail. The batch is rejected as a whole
+    (422) only if the body is not a list of events.
+
+    Requests are admitted before the body is read, up to an in-flight limit
+    that adapts to ingest latency. Beyond it they wait briefly, then get 503,
+    or get 429 at once when too many are already waiting. Both carry
+    Retry-After.
+    """
     AUDIT_INGEST_REQUESTS.inc()
+    if admission is None:
+        return await _admitted_ingest(request, ack, service, None)
+    try:
+        async with admission.slot() as timer:
+            return await _admitted_ingest(request, ack, service, timer)
+    except UnavailableError as e:  # shed; errors from ingest itself are HTTPExceptions
+        raise _unavailable(e)
+
+
+async def _admitted_ingest(request: Request, ack: str, service: AuditService, timer):
+    """The body of create_event once admitted; ``timer`` times the commit for admission."""
     try:
-        result = await service.ingest_event(event)
+        events, is_batch = await _read_events(request)
+    except DecompressedTooLarge as e:
+        raise HTTPException(
+            status_code=413, detail={"code": "TALOS_PAYLOAD_TOO_LARGE", "message": str(e)}
+        )
+    except (UnsupportedMediaType, LookupError) as e:
+        raise HTTPException(
+            status_code=415,
+            detail={"code": "TALOS_UNSUPPORTED_MEDIA_TYPE", "message": str(e)},
+        )
+    except PydanticValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+    except ValueError as e:
+        raise RequestValidationError(
+            [{"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}]
+        )
+
+    # Admission adapts to commit latency; a proof ack also waits for the snapshot seal.
+    timed = timer if timer is not None and ack != "proof" else contextlib.nullcontext()
+    if is_batch:
+        if timer is not None:
+            timer.per = len(events)
+        with timed:
+            outcome = await _ingest_batch(service, events, ack)
+        response = json_response(outcome)
+    else:
+        try:
+            with timed:
+                outcome = await _ingest_one(service, events[0], ack)
+            response = json_response(outcome)
+        except Exception as e:
+            AUDIT_PERSIST_FAILURE.inc()
+            raise _ingest_error(e)
         AUDIT_PERSIST_SUCCESS.inc()
-        return result
-    except ValidationError as e:
-        AUDIT_PERSIST_FAILURE.inc()
-        raise HTTPException(status_code=400, detail=str(e))
-    except ConflictError as e:
-        AUDIT_PERSIST_FAILURE.inc()
-        raise HTTPException(status_code=409, detail=str(e))
-    except DomainError as e:
-        AUDIT_PERSIST_FAILURE.inc()
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        AUDIT_PERSIST_FAILURE.inc()
-        logger.error(f"Unexpected error during event ingestion: {e}")
-        raise HTTPException(status_code=500, detail="Internal ingestion error")
+
+    try:
+        token = service.consistency_token()
+    except Exception as e:  # the write is durable; only the token is lost
+        logger.warning(f"Could not read consistency token: {e}")
+        token = None
+    if token:
+        # Echo on reads (X-Consistency-Token) to be served a view including this write.
+        response.headers[CONSISTENCY_HEADER] = token
+    return response
 
 
+# Not async: store reads block, and in the threadpool identical queries can coalesce.
 @app.get("/api/events")
-async def list_events(
+def list_events(
     limit: int = 50,
     before: str | None = None,
+    principal_id: str | None = None,
+    session_id: str | None = None,
+    correlation_id: str | None = None,
+    outcome: str | None = None,
+    x_consistency_token: str | None = Header(None),
     service: AuditService = Depends(get_audit_service)
 ):
     """
@@ -97,6 +337,12 @@ async def list_events(
     Query params:
         limit: Max events to return (default 50, max 200)
         before: Optional cursor for pagination
+        principal_id, session_id, correlation_id, outcome: Equality filters;
+            filtered pages do not continue into archived history
+
+    Headers:
+        X-Consistency-Token: Token from an ingest response; the page then
+            includes that write (read-your-writes when replicas are in use)
     
     Returns:
         {
@@ -109,7 +355,15 @@ async def list_events(
         400: Invalid cursor format (TALOS_INVALID_CURSOR)
     """
     try:
-        page = service.list_events(limit=limit, before=before)
+        filters = {
+            "principal_id": principal_id,
+            "session_id": session_id,
+            "correlation_id": correlation_id,
+            "outcome": outcome,
+        }
+        page = service.list_events(
+            limit=limit, before=before, consistency_token=x_consistency_token, filters=filters
+        )
         
         # Convert events to dict
         items = [
@@ -118,11 +372,11 @@ async def list_events(
         ]
         
         # Stable response shape - always include all keys
-        return {
+        return json_response({
             "items": items,
             "next_cursor": getattr(page, "next_cursor", None),
             "has_more": getattr(page, "has_more", False)
-        }
+        })
     except ValidationError as e:
         raise HTTPException(
             status_code=400,
@@ -133,8 +387,97 @@ async def list_events(
         )
 
 
+@app.get("/api/events/export")
+def export_events(
+    start_ts: float | None = None,
+    end_ts: float | None = None,
+    principal_id: str | None = None,
+    session_id: str | None = None,
+    correlation_id: str | None = None,
+    outcome: str | None = None,
+    include_proof: bool = False,
+    compression: Literal["none", "gzip", "zstd"] = "none",
+    x_consistency_token: str | None = Header(None),
+    service: AuditService = Depends(get_audit_service)
+):
+    """
+    Bulk export of audit events as NDJSON, oldest first.
+
+    Streams from a server-side store cursor, so memory stays bounded however
+    much history is selected.
+
+    Query params:
+        start_ts / end_ts: Unix-seconds time range [start_ts, end_ts)
+        principal_id, session_id, correlation_id, outcome: Same filters as the list
+        include_proof: Add leaf_index and inclusion proof to each line
+        compression: gzip | zstd forces Content-Encoding; with none (the
+            default) it is negotiated from Accept-Encoding
+
+    Headers:
+        X-Consistency-Token: As for /api/events
+    """
+    if compression != "none" and compression not in available_codecs():
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "code": "TALOS_UNSUPPORTED_ENCODING",
+                "message": f"{compression} is not available",
+            },
+        )
+
+    filters = {
+        "principal_id": principal_id,
+        "session_id": session_id,
+        "correlation_id": correlation_id,
+        "outcome": outcome,
+    }
+    try:
+        records = service.export_events(
+            start_ts=start_ts,
+            end_ts=end_ts,
+            filters=filters,
+            include_proof=include_proof,
+            consistency_token=x_consistency_token,
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400, detail={"code": "TALOS_INVALID_CONSISTENCY_TOKEN", "message": str(e)}
+        )
+    except UnavailableError as e:
+        raise _unavailable(e)
+    body = ndjson_chunks(records)
+    headers = {"Content-Disposition": 'attachment; filename="audit-events.ndjson"'}
+    if compression != "none":
+        body = compress_stream(body, compression)
+        headers["Content-Encoding"] = compression
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
+
+
+@app.get("/api/stats")
+def dashboard_stats(
+    start_ts: float | None = None,
+    end_ts: float | None = None,
+    service: AuditService = Depends(get_audit_service)
+):
+    """
+    Dashboard aggregations (counts, success rate, denial reasons, hourly volume).
+
+    Query params:
+        start_ts / end_ts: Unix-seconds window [start_ts, end_ts]; by default
+            the last 24 hours up to now
+
+    Results are cached per window until an event inside it is ingested.
+    """
+    return json_response(service.stats(start_ts=start_ts, end_ts=end_ts))
+
+
 @app.get("/events")
-async def stream_events(request: Request, broadcaster: EventBroadcaster = Depends(get_broadcaster)):
+async def stream_events(
+    request: Request,
+    proofs: bool = False,
+    broadcaster: EventBroadcaster = Depends(get_broadcaster),
+    proof_broadcaster: ProofBroadcaster = Depends(get_proof_broadcaster),
+):
     """
     Stream audit events via SSE (Server-Sent Events).
     
@@ -143,11 +486,17 @@ async def stream_events(request: Request, broadcaster: EventBroadcaster = Depend
     - Heartbeat every 30s with empty data payload  
     - Audit events as 'audit_event'
     - Errors as 'error' event followed by stream termination
+
+    With ``?proofs=true`` each 'audit_event' also carries ``leaf_index`` and
+    ``proof`` (against the sealing root snapshot); frames are then emitted a
+    snapshot at a time rather than at ingest.
     """
+    if proofs:
+        broadcaster = proof_broadcaster
+
     async def event_generator():
         try:
             # 1. Send meta event (MUST be first)
-            from datetime import datetime, timezone
             connected_at = datetime.now(timezone.utc).isoformat()
             yield {
                 "event": "meta",
@@ -160,10 +509,15 @@ async def stream_events(request: Request, broadcaster: EventBroadcaster = Depend
             # 2. Stream events with heartbeat
             async for event in broadcaster.subscribe():
                 # Convert Pydantic model to dict/json
-                yield {
-                    "event": "audit_event",
-                    "data": event.model_dump_json() if hasattr(event, "model_dump_json") else event.json()
-                }
+                if isinstance(event, dict):  # proof-bearing record
+                    data = encode_json(event).decode("utf-8")
+                else:
+                    data = (
+                        event.model_dump_json()
+                        if hasattr(event, "model_dump_json")
+                        else event.json()
+                    )
+                yield {"event": "audit_event", "data": data}
                 
         except asyncio.CancelledError:
             # Client disconnected - normal cleanup via cancellation
@@ -187,11 +541,143 @@ def get_root(service: AuditService = Depends(get_audit_service)):
     return service.get_root()
 
 
+@app.get("/roots/latest")
+def latest_root_snapshot(
+    if_none_match: str | None = Header(None),
+    service: AuditService = Depends(get_audit_service),
+):
+    """
+    Latest sealed (and, if configured, signed) tree head.
+
+    Unlike /root this only changes when a snapshot seals, so it is served
+    with an ETag and a max-age of the snapshot interval.
+    """
+    try:
+        snapshot = service.latest_snapshot()
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    max_age = max(1, int(service.snapshots.every_seconds))
+    return cached_json_response(
+        snapshot,
+        etag=f'"{snapshot.tree_size}-{snapshot.root[:16]}"',
+        cache_control=f"public, max-age={max_age}",
+        if_none_match=if_none_match,
+    )
+
+
+@app.get("/roots")
+def list_root_snapshots(
+    since: int = 0,
+    limit: int = 100,
+    if_none_match: str | None = Header(None),
+    service: AuditService = Depends(get_audit_service),
+):
+    """
+    Sealed tree heads with tree_size > since, oldest first.
+
+    A full page can never change (heads are immutable and only appended),
+    so it is cacheable indefinitely; a partial page is revalidated.
+    """
+    try:
+        snapshots = service.list_snapshots(since=since, limit=limit)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    last = snapshots[-1].tree_size if snapshots else since
+    if snapshots and len(snapshots) >= min(max(1, limit), 1000):
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        max_age = max(1, int(service.snapshots.every_seconds)) if service.snapshots else 1
+        cache_control = f"public, max-age={max_age}"
+    return cached_json_response(
+        {"items": snapshots, "next_since": last},
+        etag=f'"{since}-{limit}-{last}"',
+        cache_control=cache_control,
+        if_none_match=if_none_match,
+    )
+
+
+@app.get("/consistency", response_model=ConsistencyProof)
+def get_consistency_proof(
+    first: int = Query(..., ge=1),
+    second: int = Query(..., ge=1),
+    service: AuditService = Depends(get_audit_service),
+):
+    """
+    Proof that the tree of ``second`` leaves extends the tree of ``first``.
+
+    Check it against two published heads (``GET /roots``) with
+    ``src.client.verify.verify_consistency``. The proof between two sizes
+    never changes, so it is cacheable indefinitely.
+    """
+    try:
+        proof = service.get_consistency_proof(first, second)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UnavailableError as e:
+        raise _unavailable(e)
+    return json_response(proof, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
+@app.get("/archive/segments")
+def list_archive_segments(service: AuditService = Depends(get_audit_service)):
+    """
+    Archive segment headers, oldest epoch first.
+
+    Archived events are proven (``GET /proof/{event_id}``, ``epoch`` set)
+    against their segment's ``root``; each header also records the sealed
+    tree head current when it was cut, and is signed like root snapshots.
+    """
+    return json_response({"items": service.list_archive_segments()})
+
+
 @app.get("/proof/{event_id}", response_model=ProofView)
 def get_proof(event_id: str, service: AuditService = Depends(get_audit_service)):
     try:
         return service.get_proof(event_id)
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except UnavailableError as e:
+        raise _unavailable(e)
     except DomainError as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def require_admin(
+    authorization: str | None = Header(None),
+    x_admin_token: str | None = Header(None),
+):
+    """Gate /admin routes on the configured admin token (404 when unset)."""
+    expected = get_settings().admin_token
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = x_admin_token
+    if authorization and authorization.lower().startswith("bearer "):
+        supplied = authorization[7:]
+    if not supplied or not hmac.compare_digest(supplied.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@app.post("/admin/profile", dependencies=[Depends(require_admin)])
+async def profile_worker(
+    seconds: float = Query(30.0, gt=0, le=300),
+    mode: Literal["cpu", "memory"] = "cpu",
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    top: int = Query(25, ge=1, le=500),
+):
+    """
+    Profile this worker under live traffic.
+
+    mode=cpu: samples all threads every interval_ms and returns collapsed
+    stacks (flamegraph.pl / speedscope input) for src/domain and src/adapters.
+    mode=memory: tracemalloc diff over the window, top allocation sites.
+
+    The sampler runs in a thread, so the event loop keeps serving requests.
+    """
+    try:
+        if mode == "cpu":
+            stacks = await asyncio.to_thread(profiling.profile_cpu, seconds, interval_ms / 1000)
+            return PlainTextResponse(stacks)
+        report = await asyncio.to_thread(profiling.profile_memory, seconds, top)
+        return json_response(report)
+    except profiling.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
@@ -0,0 +1,71 @@
+"""
+Pre-encoded JSON responses for hot endpoints.
+
+FastAPI validates a handler's return value against its response model and then
+runs ``jsonable_encoder`` over it before serializing. For ingest acks and event
+pages that work is pure overhead: the data is already a validated ``Event`` or
+a plain dict. These helpers encode once, in pydantic-core's Rust serializer,
+and hand Starlette the bytes.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+
+class RawJSONResponse(Response):
+    """Response whose content is already-encoded JSON bytes."""
+
+    media_type = "application/json"
+
+
+def _fallback(value: Any) -> Any:
+    # Store row objects (e.g. Postgres rows) expose model_dump()/dict() but
+    # are not pydantic models.
+    for attr in ("model_dump", "dict"):
+        dump = getattr(value, attr, None)
+        if callable(dump):
+            return dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(value: Any) -> bytes:
+    return to_json(value, fallback=_fallback)
+
+
+def json_response(value: Any, status_code: int = 200, headers: dict | None = None) -> Response:
+    return RawJSONResponse(content=encode_json(value), status_code=status_code, headers=headers)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """RFC 9110 weak comparison of an If-None-Match header against etag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def cached_json_response(
+    value: Any, etag: str, cache_control: str, if_none_match: str | None = None
+) -> Response:
+    """JSON with validators; 304 without a body when the client's copy is current."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return json_response(value, headers=headers)
+
+
+def ndjson_chunks(records: Iterable[Any], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encode records as newline-delimited JSON, coalesced into ~chunk_size writes."""
+    buffer = bytearray()
+    for record in records:
+        buffer += encode_json(record)
+        buffer += b"\n"
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
@@ -0,0 +1,221 @@
+"""
+Indexed in-process event store, for deployments without Postgres.
+
+Events are kept in a time-ordered array of keys ``(whole-second timestamp,
+event_id)``, the same order Postgres cursors encode. For each filterable
+field (principal, outcome, session, correlation) there is a posting list:
+the sorted keys of the events with each value. A page or a time range is
+found by bisection, then only the matching keys are walked. Filtered
+pages, exports and stats therefore cost O(log N + k) rather than a scan.
+
+Memory is bounded by the retention manager (``memory_max_events``). It
+moves the oldest events into archive segments on disk and deletes them here
+through ``delete_events``.
+"""
+
+import bisect
+import builtins
+import threading
+from collections import defaultdict
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from talos_sdk.ports.audit_store import IAuditStorePort  # type: ignore
+
+from src.core.metrics import STORE_QUERY_SECONDS
+from src.domain.models import (
+    EventPage,
+    Key,
+    decode_key,
+    encode_cursor,
+    event_key,
+    event_timestamp,
+    field_value,
+)
+from src.ports.common import IEventExportPort, IEventIndexPort, IRetentionPort
+
+# Posting lists are kept per value of these fields (the filters list/export accept).
+INDEXED_FIELDS = ("principal_id", "outcome", "session_id", "correlation_id")
+
+
+class IndexedMemoryStore(IAuditStorePort, IEventIndexPort, IEventExportPort, IRetentionPort):
+    """Events in memory with time and per-field indexes; see the module docstring."""
+
+    def __init__(self):
+        self._events: dict[str, Any] = {}
+        self._keys: dict[str, Key] = {}
+        self._order: list[Key] = []
+        self._postings: dict[str, dict[str, list[Key]]] = {
+            field: defaultdict(list) for field in INDEXED_FIELDS
+        }
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def append(self, event: Any) -> bool:
+        """Insert an event; returns False if event_id was already stored."""
+        key = event_key(event)
+        with self._lock:
+            if event.event_id in self._events:
+                return False
+            self._events[event.event_id] = event
+            self._keys[event.event_id] = key
+            _insert(self._order, key)
+            for field in INDEXED_FIELDS:
+                value = field_value(event, field)
+                if value is not None:
+                    _insert(self._postings[field][value], key)
+            return True
+
+    def exists(self, event_id: str) -> bool:
+        return event_id in self._events
+
+    def iter_event_ids(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._events))
+
+    def delete_events(self, event_ids: Sequence[str]) -> int:
+        """Drop events (archived by retention); they are usually the oldest."""
+        with self._lock:
+            doomed = {self._keys.pop(event_id) for event_id in event_ids if event_id in self._keys}
+            if not doomed:
+                return 0
+            for key in doomed:
+                event = self._events.pop(key[1])
+                for field in INDEXED_FIELDS:
+                    value = field_value(event, field)
+                    if value is not None:
+                        postings = self._postings[field][value]
+                        del postings[bisect.bisect_left(postings, key)]
+                        if not postings:
+                            del self._postings[field][value]
+            self._order = [key for key in self._order if key not in doomed]
+            return len(doomed)
+
+    def _candidates(self, filters: Any) -> tuple[list[Key], list[tuple[str, str]]]:
+        """
+        The shortest posting list among the filters (or the full order), and
+        the filters left to check per event.
+        """
+        wanted = [(f, v) for f, v in (filters or {}).items() if v and f in INDEXED_FIELDS]
+        if not wanted:
+            return self._order, []
+        lists = [(self._postings[f].get(v, []), (f, v)) for f, v in wanted]
+        keys, chosen = min(lists, key=lambda item: len(item[0]))
+        return keys, [pair for pair in wanted if pair != chosen]
+
+    def _matches(self, key: Key, residual: list[tuple[str, str]]) -> bool:
+        event = self._events[key[1]]
+        return all(field_value(event, f) == v for f, v in residual)
+
+    def list(
+        self,
+        before: str | None = None,
+        limit: int = 100,
+        filters: Any = None,
+        cursor: str | None = None,
+    ) -> EventPage:
+        """
+        The ``limit`` newest matching events strictly before the cursor, oldest
+        first. ``cursor`` is the SDK port's name for ``before``.
+        """
+        before = before or cursor
+        with self._lock, STORE_QUERY_SECONDS.labels(op="list").time():
+            keys, residual = self._candidates(filters)
+            end = bisect.bisect_left(keys, decode_key(before)) if before else len(keys)
+            picked: list[Key] = []
+            i = end - 1
+            while i >= 0 and len(picked) < limit:
+                if not residual or self._matches(keys[i], residual):
+                    picked.append(keys[i])
+                i -= 1
+            # Exact without residual filters; otherwise as Postgres: a full page may have more.
+            has_more = i >= 0 and len(picked) == limit
+            picked.reverse()
+            events = [self._events[key[1]] for key in picked]
+        next_cursor = encode_cursor(picked[0]) if picked else None
+        return EventPage(events=events, next_cursor=next_cursor, has_more=has_more)
+
+    def _range(self, keys: builtins.list[Key], start_ts: float | None, end_ts: float | None):
+        lo = 0 if start_ts is None else bisect.bisect_left(keys, (_ceil(start_ts),))
+        hi = len(keys) if end_ts is None else bisect.bisect_left(keys, (_ceil(end_ts),))
+        return lo, hi
+
+    def iter_events(
+        self,
+        start_ts: float | None = None,
+        end_ts: float | None = None,
+        filters: Any = None,
+        batch_size: int = 5000,
+    ) -> Iterator[Any]:
+        """Events in [start_ts, end_ts), oldest first, read batch_size keys at a time."""
+        with self._lock:
+            keys, residual = self._candidates(filters)
+            lo, hi = self._range(keys, start_ts, end_ts)
+            # A copy: retention may delete from the arrays while the export streams.
+            selected = keys[lo:hi]
+        for offset in range(0, len(selected), batch_size):
+            with self._lock:
+                batch = [
+                    self._events[key[1]]
+                    for key in selected[offset : offset + batch_size]
+                    if key[1] in self._events and (not residual or self._matches(key, residual))
+                ]
+            yield from batch
+
+    def stats(self, start_ts: float, end_ts: float) -> dict:
+        """Dashboard aggregations over [start_ts, end_ts], shaped as the Postgres store's."""
+        with self._lock, STORE_QUERY_SECONDS.labels(op="stats").time():
+            lo = bisect.bisect_left(self._order, (_ceil(start_ts),))
+            hi = bisect.bisect_right(self._order, (int(end_ts), "\U0010ffff"))
+            events = [self._events[key[1]] for key in self._order[lo:hi]]
+
+        total = success = tokens = 0
+        cost = latency = 0.0
+        reasons: dict[str, int] = defaultdict(int)
+        buckets: dict[int, dict[str, int]] = {}
+        for event in events:
+            outcome = getattr(event, "outcome", None)
+            meta = getattr(event, "meta", None) or {}
+            metrics = getattr(event, "metrics", None) or meta.get("metrics") or {}
+            total += 1
+            success += outcome == "OK"
+            tokens += int(metrics.get("tokens", 0) or 0)
+            cost += float(metrics.get("cost_usd", 0) or 0)
+            latency += float(metrics.get("latency_ms", 0) or 0)
+            if outcome == "DENY":
+                reason = getattr(event, "denial_reason", None) or meta.get("denial_reason")
+                if reason:
+                    reasons[reason] += 1
+            bucket = buckets.setdefault(
+                int(event_timestamp(event)) // 3600 * 3600, {"ok": 0, "deny": 0, "error": 0}
+            )
+            if outcome in ("OK", "DENY", "ERROR"):
+                bucket[outcome.lower()] += 1
+
+        return {
+            "requests_24h": total,
+            "auth_success_rate": (success / total) if total > 0 else 1.0,
+            "denial_reason_counts": dict(reasons),
+            "request_volume_series": [
+                {"time": time, **counts} for time, counts in sorted(buckets.items())
+            ],
+            "tokens_total": tokens,
+            "cost_usd": cost,
+            "latency_avg_ms": (latency / total) if total > 0 else 0.0,
+        }
+
+
+def _insert(keys: list[Key], key: Key) -> None:
+    # Ingest is nearly time-ordered, so this is almost always an append.
+    if not keys or keys[-1] < key:
+        keys.append(key)
+    else:
+        bisect.insort(keys, key)
+
+
+def _ceil(ts: float) -> int:
+    """Smallest whole second >= ts: keys hold whole seconds."""
+    whole = int(ts)
+    return whole if whole == ts else whole + 1
@@ -1,8 +1,27 @@
+import base64
 import logging
 import os
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Protocol
+
 import psycopg2  # type: ignore
-from psycopg2.extras import RealDictCursor, Json  # type: ignore
-from typing import List, Optional, Protocol, Any
+from psycopg2.extras import Json  # type: ignore
+
+from src.core.metrics import STORE_QUERY_SECONDS, STORE_READS, STORE_REPLICA_LAG_SECONDS
+from src.domain.models import RootSnapshot, decode_key, encode_cursor, event_key
+from src.ports.common import (
+    IEventExportPort,
+    IEventIndexPort,
+    IReadConsistencyPort,
+    IRetentionPort,
+    ISnapshotStorePort,
+)
+
 
 # We define the Protocols here to ensure runtime compatibility 
 # even if talos_sdk imports fail in this content generation context.
@@ -17,8 +36,192 @@ class EventPage:
         self.next_cursor = next_cursor
         self.has_more = has_more
 
-class PostgresAuditStore:
-    def __init__(self, dsn: Optional[str] = None):
+# Columns read back by list/recovery scans, in EventRow slot order.
+EVENT_COLUMNS = (
+    "event_id", "schema_version", "timestamp", "cursor", "event_type", "outcome",
+    "session_id", "correlation_id", "agent_id", "peer_id", "tool", "method", "resource",
+    "metadata", "metrics", "hashes", "integrity", "integrity_hash", "denial_reason",
+)  # fmt: skip
+_SELECT_EVENTS = f"SELECT {', '.join(EVENT_COLUMNS)} FROM events"
+
+
+# Bootstrap DDL for throwaway/dev databases (load tests, local runs). Production
+# schemas are managed by the platform migrations.
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    schema_version TEXT,
+    timestamp BIGINT NOT NULL,
+    cursor TEXT NOT NULL,
+    event_type TEXT,
+    outcome TEXT,
+    session_id TEXT,
+    correlation_id TEXT,
+    agent_id TEXT,
+    peer_id TEXT,
+    tool TEXT,
+    method TEXT,
+    resource TEXT,
+    metadata JSONB,
+    metrics JSONB,
+    hashes JSONB,
+    integrity JSONB,
+    integrity_hash TEXT,
+    denial_reason TEXT
+);
+CREATE INDEX IF NOT EXISTS events_cursor_idx ON events (cursor);
+CREATE INDEX IF NOT EXISTS events_timestamp_idx ON events (timestamp);
+CREATE INDEX IF NOT EXISTS events_key_idx ON events (timestamp, event_id);
+CREATE TABLE IF NOT EXISTS root_snapshots (
+    tree_size BIGINT PRIMARY KEY,
+    root TEXT NOT NULL,
+    timestamp DOUBLE PRECISION NOT NULL,
+    signature TEXT,
+    key_id TEXT
+);
+"""
+_SELECT_SNAPSHOTS = "SELECT tree_size, root, timestamp, signature, key_id FROM root_snapshots"
+
+
+@lru_cache(maxsize=4096)
+def _iso_ts(timestamp: float) -> str:
+    # Timestamps are whole seconds, so bursts of events share an entry.
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class EventRow:
+    """
+    Read model for one row of the events table.
+
+    Built straight from a tuple cursor row; the domain-shaped fields the
+    Merkle tree and API need (ts, principal, http, ...) are derived once here
+    rather than on every attribute access.
+    """
+
+    __slots__ = EVENT_COLUMNS + (
+        "_row", "ts", "request_id", "principal", "http", "meta", "event_hash",
+    )  # fmt: skip
+
+    surface_id = "gateway"  # surface_id usually is where event originated
+    schema_id = "talos.audit_event"
+
+    def __init__(self, row: tuple):
+        self._row = row
+        (
+            self.event_id, self.schema_version, self.timestamp, self.cursor, self.event_type,
+            self.outcome, self.session_id, self.correlation_id, self.agent_id, self.peer_id,
+            self.tool, self.method, resource, self.metadata, self.metrics, self.hashes,
+            self.integrity, self.integrity_hash, self.denial_reason,
+        ) = row  # fmt: skip
+        # Domain model expects Optional[Dict], DB has string|null
+        self.resource = {"id": str(resource)} if resource else None
+        self.ts = _iso_ts(float(self.timestamp if self.timestamp is not None else 0))
+        self.request_id = self.correlation_id or "unknown"
+        self.principal = {"id": self.agent_id, "type": "service"}
+        self.http = {"method": self.method, "path": self.resource}
+        self.meta = self.metadata
+        # Fallback to integrity_hash or empty
+        self.event_hash = self.integrity_hash or ""
+
+    def dict(self) -> dict[str, Any]:
+        d = dict(zip(EVENT_COLUMNS, self._row))
+        d["resource"] = self.resource
+        d["ts"] = self.ts
+        d["principal"] = self.principal
+        d["request_id"] = self.request_id
+        d["surface_id"] = self.surface_id
+        d["http"] = self.http
+        d["meta"] = self.meta
+        d["event_hash"] = self.event_hash
+        d["schema_id"] = self.schema_id
+        return d
+
+    def model_dump(self) -> Dict[str, Any]:  # noqa: UP006 - ``dict`` is the method above
+        return self.dict()
+
+
+def _snapshot(row: tuple) -> RootSnapshot:
+    tree_size, root, timestamp, signature, key_id = row
+    return RootSnapshot(
+        tree_size=tree_size, root=root, timestamp=timestamp, signature=signature, key_id=key_id
+    )
+
+
+# Minimum primary WAL position (as an int) reads in the current context must see.
+_read_after: ContextVar[int | None] = ContextVar("talos_read_after", default=None)
+_READS_PRIMARY = STORE_READS.labels(target="primary")
+_READS_REPLICA = STORE_READS.labels(target="replica")
+
+
+def parse_lsn(lsn: str) -> int:
+    """'16/B374D848' -> comparable integer WAL position."""
+    hi, sep, lo = lsn.partition("/")
+    if not sep:
+        raise ValueError(f"Invalid LSN {lsn!r}")
+    return (int(hi, 16) << 32) | int(lo, 16)
+
+
+class ReadReplica:
+    """A read replica connection and the replay position last observed on it."""
+
+    # Replay lag is 0 when everything received has been replayed: an idle
+    # primary must not make the replica look stale. NULL LSN = not a standby.
+    STATUS_SQL = """
+        SELECT pg_last_wal_replay_lsn()::text,
+               CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+               END
+    """
+
+    def __init__(self, dsn: str, name: str):
+        self.dsn = dsn
+        self.name = name
+        self.conn = None
+        self.replay_lsn = -1
+        self.lag = float("inf")
+        self.checked_at = float("-inf")
+
+    def cursor(self):
+        if self.conn is None or self.conn.closed:
+            self.conn = psycopg2.connect(self.dsn)
+            self.conn.autocommit = True
+        return self.conn.cursor()
+
+    def refresh(self) -> None:
+        try:
+            with self.cursor() as cur:
+                cur.execute(self.STATUS_SQL)
+                lsn, lag = cur.fetchone()
+            self.replay_lsn = parse_lsn(lsn) if lsn else -1
+            self.lag = float(lag or 0.0)
+        except Exception as e:
+            logger.warning(f"Read replica {self.name} unavailable: {e}")
+            self.conn = None
+            self.replay_lsn = -1
+            self.lag = float("inf")
+        self.checked_at = time.monotonic()
+        STORE_REPLICA_LAG_SECONDS.labels(replica=self.name).set(self.lag)
+
+
+class PostgresAuditStore(
+    IEventIndexPort, IEventExportPort, IReadConsistencyPort, ISnapshotStorePort, IRetentionPort
+):
+    """
+    Events table on Postgres, with optional read/write splitting.
+
+    Writes, duplicate lookups and consistency tokens always use the primary.
+    list/stats/export scans go round-robin to replicas whose replay lag is
+    within max_replica_lag seconds; inside read_after(token) a replica must
+    also have replayed past the token, otherwise the primary serves the read.
+    """
+
+    def __init__(
+        self,
+        dsn: str | None = None,
+        replica_dsns: Sequence[str] = (),
+        max_replica_lag: float = 5.0,
+        replica_check_interval: float = 1.0,
+    ):
         # Default to localhost for dev convenience as per docker-compose
         # WARNING: Use env vars in production!
         self.dsn = dsn or os.getenv("TALOS_DATABASE_URL")
@@ -35,6 +238,10 @@ class PostgresAuditStore:
                  # BUT we moved the actual password to .env.
                  pass
             self.dsn = f"postgresql://{db_user}:{db_pass}@{db_host}:5432/{db_name}"
+        self._replicas = [ReadReplica(d, f"replica-{i}") for i, d in enumerate(replica_dsns)]
+        self._next_replica = 0
+        self.max_replica_lag = max_replica_lag
+        self.replica_check_interval = replica_check_interval
         self._ensure_connection()
 
     def _ensure_connection(self):
@@ -47,17 +254,85 @@ class PostgresAuditStore:
             # but methods will fail. Robustness usually implies retry.
             self.conn = None
 
+    def ensure_schema(self) -> None:
+        """Create the events table and indexes if they do not exist."""
+        with self._get_cursor() as cur:
+            cur.execute(SCHEMA_SQL)
+
     def _get_cursor(self):
         if self.conn is None or self.conn.closed:
             self._ensure_connection()
-        return self.conn.cursor(cursor_factory=RealDictCursor)
+        return self.conn.cursor()
+
+    def _pick_replica(self) -> ReadReplica | None:
+        """Next replica fresh enough for the current context, or None (primary)."""
+        min_lsn = _read_after.get()
+        for _ in range(len(self._replicas)):
+            replica = self._replicas[self._next_replica % len(self._replicas)]
+            self._next_replica += 1
+            refreshed = time.monotonic() - replica.checked_at > self.replica_check_interval
+            if refreshed:
+                replica.refresh()
+            if min_lsn is not None and replica.replay_lsn < min_lsn and not refreshed:
+                # The cached position may just be old; look once more.
+                replica.refresh()
+            if replica.lag > self.max_replica_lag:
+                continue
+            if min_lsn is not None and replica.replay_lsn < min_lsn:
+                continue
+            return replica
+        return None
+
+    @contextmanager
+    def _read_cursor(self):
+        replica = self._pick_replica()
+        cur = None
+        if replica is not None:
+            try:
+                cur = replica.cursor()
+            except Exception as e:
+                logger.warning(f"Read replica {replica.name} unavailable: {e}")
+                replica.conn = None
+                replica.lag = float("inf")
+        if cur is None:
+            _READS_PRIMARY.inc()
+            cur = self._get_cursor()
+        else:
+            _READS_REPLICA.inc()
+        with cur:
+            yield cur
+
+    def _read_dsn(self) -> str:
+        replica = self._pick_replica()
+        (_READS_PRIMARY if replica is None else _READS_REPLICA).inc()
+        return self.dsn if replica is None else replica.dsn
+
+    def consistency_token(self) -> str | None:
+        """Primary WAL position covering every committed write; None without replicas."""
+        if not self._replicas:
+            return None
+        with self._get_cursor() as cur:
+            cur.execute("SELECT pg_current_wal_lsn()::text")
+            return cur.fetchone()[0]
+
+    def read_after(self, token: str | None):
+        """Route reads in this block to nodes that have replayed past token."""
+        # Parsed here rather than on enter so a bad token fails at the call site.
+        return self._pinned(parse_lsn(token) if token else None)
+
+    @contextmanager
+    def _pinned(self, min_lsn: int | None):
+        reset = _read_after.set(min_lsn)
+        try:
+            yield
+        finally:
+            _read_after.reset(reset)
 
     def _parse_ts(self, ts_str: str) -> int:
         """Parse ISO timestamp or return int if already number."""
         if isinstance(ts_str, (int, float)):
             return int(ts_str)
         try:
-            from datetime import datetime
             dt = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
             return int(dt.timestamp())
         except:
@@ -65,12 +340,12 @@ class PostgresAuditStore:
 
     def _derive_cursor(self, ts: str, event_id: str) -> str:
         """Derive cursor if missing (Gateway usually handles this, but ingest might not)."""
-        import base64
         t = int(self._parse_ts(ts))
         payload = f"{t}:{event_id}"
         return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
 
-    def append(self, event) -> None:
+    def append(self, event) -> bool:
+        """Insert an event; returns False if event_id was already stored."""
         try:
             with self._get_cursor() as cur:
                 cur.execute(
@@ -110,61 +385,162 @@ class PostgresAuditStore:
                         getattr(event, 'integrity_hash', None) or getattr(event, 'event_hash', (getattr(event, 'hashes', {}) or {}).get('event_hash', ''))
                     )
                 )
+                return cur.rowcount == 1
         except Exception as e:
             logger.error(f"Failed to insert event: {e}")
             raise
 
+    def exists(self, event_id: str) -> bool:
+        """Primary-key lookup used to settle Bloom filter positives."""
+        with self._get_cursor() as cur, STORE_QUERY_SECONDS.labels(op="exists").time():
+            cur.execute("SELECT 1 FROM events WHERE event_id = %s", (event_id,))
+            return cur.fetchone() is not None
+
+    def delete_events(self, event_ids: Sequence[str]) -> int:
+        """Drop archived events; the retention window is all the table keeps."""
+        if not event_ids:
+            return 0
+        with self._get_cursor() as cur:
+            cur.execute("DELETE FROM events WHERE event_id = ANY(%s)", (list(event_ids),))
+            return cur.rowcount
+
+    def iter_event_ids(self, batch_size: int = 50000) -> Iterator[str]:
+        """Stream every stored event_id."""
+        rows = self._scan("SELECT event_id FROM events", [], batch_size, self._read_dsn())
+        return (event_id for (event_id,) in rows)
+
+    def iter_events(
+        self,
+        start_ts: float | None = None,
+        end_ts: float | None = None,
+        filters: Any = None,
+        batch_size: int = 5000,
+    ) -> Iterator[EventRow]:
+        """Stream events oldest-first with bounded memory, for bulk export."""
+        where_clauses: list[str] = []
+        params: list[Any] = []
+        if start_ts is not None:
+            where_clauses.append("timestamp >= %s")
+            params.append(start_ts)
+        if end_ts is not None:
+            where_clauses.append("timestamp < %s")
+            params.append(end_ts)
+        self._add_filters(filters, where_clauses, params)
+
+        query = _SELECT_EVENTS
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+        query += " ORDER BY timestamp ASC, event_id ASC"
+        # Node chosen now, while the caller's read_after() scope is active.
+        rows = self._scan(query, params, batch_size, self._read_dsn())
+        return map(EventRow, rows)
+
+    def _scan(self, query: str, params: list[Any], batch_size: int, dsn: str) -> Iterator[tuple]:
+        """
+        Run query through a server-side cursor, fetching batch_size rows at a time.
+
+        Runs on its own connection: named cursors need a transaction, and the
+        shared connection is in autocommit mode (and serves concurrent requests).
+        """
+        conn = psycopg2.connect(dsn)
+        try:
+            with conn.cursor(name="talos_scan") as cur:
+                cur.itersize = batch_size
+                cur.execute(query, params)
+                yield from cur
+        finally:
+            conn.close()
+
+    def save_snapshot(self, snapshot: RootSnapshot) -> None:
+        with self._get_cursor() as cur:
+            cur.execute(
+                "INSERT INTO root_snapshots (tree_size, root, timestamp, signature, key_id) "
+                "VALUES (%s, %s, %s, %s, %s) ON CONFLICT (tree_size) DO NOTHING",
+                (
+                    snapshot.tree_size,
+                    snapshot.root,
+                    snapshot.timestamp,
+                    snapshot.signature,
+                    snapshot.key_id,
+                ),
+            )
+
+    def latest_snapshot(self) -> RootSnapshot | None:
+        # Primary: the head must never go backwards for a client that just saw it.
+        with self._get_cursor() as cur:
+            cur.execute(_SELECT_SNAPSHOTS + " ORDER BY tree_size DESC LIMIT 1")
+            row = cur.fetchone()
+        return _snapshot(row) if row else None
+
+    def snapshots_since(self, tree_size: int, limit: int = 100) -> list[RootSnapshot]:
+        # Sealed history is immutable, so a lagging replica can only return fewer rows.
+        with self._read_cursor() as cur:
+            cur.execute(
+                _SELECT_SNAPSHOTS + " WHERE tree_size > %s ORDER BY tree_size ASC LIMIT %s",
+                (tree_size, limit),
+            )
+            return [_snapshot(row) for row in cur.fetchall()]
+
+    @staticmethod
+    def _add_filters(filters: Any, where_clauses: list[str], params: list[Any]) -> None:
+        if not filters:
+            return
+        for column in ("session_id", "correlation_id", "outcome"):
+            if filters.get(column):
+                where_clauses.append(f"{column} = %s")
+                params.append(filters[column])
+        if filters.get("principal_id"):
+            # append() stores the principal in agent_id.
+            where_clauses.append("agent_id = %s")
+            params.append(filters["principal_id"])
+
     def list(self, before: Optional[str] = None, limit: int = 100, filters: Any = None) -> EventPage:
         """
         List events with optional filtering.
+
+        Pages are keyset pages in (timestamp, event_id) order, as in the
+        memory and SQLite stores. Read errors are raised, not returned as an
+        empty page that the query cache would then keep.
         """
+        before_key = decode_key(before) if before else None
         try:
-            with self._get_cursor() as cur:
-                query = "SELECT * FROM events"
+            with self._read_cursor() as cur, STORE_QUERY_SECONDS.labels(op="list").time():
+                query = _SELECT_EVENTS
                 where_clauses = []
                 params: List[Any] = []
                 
-                if before:
-                    where_clauses.append("cursor < %s")
-                    params.append(before)
+                if before_key:
+                    where_clauses.append("(timestamp, event_id) < (%s, %s)")
+                    params.extend(before_key)
                 
-                if filters:
-                    if filters.get("session_id"):
-                        where_clauses.append("session_id = %s")
-                        params.append(filters["session_id"])
-                    if filters.get("correlation_id"):
-                        where_clauses.append("correlation_id = %s")
-                        params.append(filters["correlation_id"])
-                    if filters.get("outcome"):
-                        where_clauses.append("outcome = %s")
-                        params.append(filters["outcome"])
+                self._add_filters(filters, where_clauses, params)
 
                 if where_clauses:
                     query += " WHERE " + " AND ".join(where_clauses)
                 
-                query += " ORDER BY cursor DESC LIMIT %s"
+                query += " ORDER BY timestamp DESC, event_id DESC LIMIT %s"
                 params.append(limit)
                 
                 cur.execute(query, params)
                 rows = cur.fetchall()
                 
-                events = [self._map_row(row) for row in rows]
+                events = [EventRow(row) for row in rows]
                 events.reverse()
                 
-                next_cursor = events[0].cursor if events else None
+                next_cursor = encode_cursor(event_key(events[0])) if events else None
                 has_more = len(events) >= limit
                 return EventPage(events=events, next_cursor=next_cursor, has_more=has_more)
                 
         except Exception as e:
             logger.error(f"Failed to list events: {e}")
-            return EventPage(events=[], next_cursor=None, has_more=False)
+            raise
             
     def stats(self, start_ts: float, end_ts: float) -> dict:
         """
-        Compute dashboard aggregations.
+        Compute dashboard aggregations; read errors are raised, as in list().
         """
         try:
-            with self._get_cursor() as cur:
+            with self._read_cursor() as cur, STORE_QUERY_SECONDS.labels(op="stats").time():
                 # 1. Basic counts and Metric Aggregations
                 cur.execute(
                     """
@@ -179,19 +555,19 @@ class PostgresAuditStore:
                     """,
                     (start_ts, end_ts)
                 )
-                res = cur.fetchone()
-                total = res['total'] or 0
-                success = res['success'] or 0
-                tokens = res['total_tokens'] or 0
-                cost = res['total_cost'] or 0.0
-                latency = res['avg_latency'] or 0.0
+                total, success, tokens, cost, latency = cur.fetchone()
+                total = total or 0
+                success = success or 0
+                tokens = tokens or 0
+                cost = cost or 0.0
+                latency = latency or 0.0
                 
                 # 2. Denial reasons
                 cur.execute(
                     "SELECT denial_reason, COUNT(*) as count FROM events WHERE outcome = 'DENY' AND timestamp BETWEEN %s AND %s GROUP BY denial_reason",
                     (start_ts, end_ts)
                 )
-                reasons = {row['denial_reason']: row['count'] for row in cur.fetchall() if row['denial_reason']}
+                reasons = {reason: count for reason, count in cur.fetchall() if reason}
                 
                 # 3. Time series (1h buckets)
                 cur.execute(
@@ -209,8 +585,8 @@ class PostgresAuditStore:
                     (start_ts, end_ts)
                 )
                 series = [
-                    {"time": row['bucket'], "ok": row['ok'], "deny": row['deny'], "error": row['error']}
-                    for row in cur.fetchall()
+                    {"time": bucket, "ok": ok, "deny": deny, "error": error}
+                    for bucket, ok, deny, error in cur.fetchall()
                 ]
                 
                 return {
@@ -224,86 +600,6 @@ class PostgresAuditStore:
                 }
         except Exception as e:
             logger.error(f"Failed to compute stats: {e}")
-            return {
-                "requests_24h": 0,
-                "auth_success_rate": 0,
-                "denial_reason_counts": {},
-                "request_volume_series": []
-            }
-
-    def _map_row(self, row):
-        class EventObj:
-            def __init__(self, **entries):
-                self.__dict__.update(entries)
-            
-            def dict(self):
-                d = self.__dict__.copy()
-                d["ts"] = self.ts
-                d["principal"] = self.principal
-                d["resource"] = self.resource
-                d["request_id"] = self.request_id
-                d["surface_id"] = self.surface_id
-                d["http"] = self.http
-                d["meta"] = self.meta
-                d["event_hash"] = self.event_hash
-                d["schema_id"] = self.schema_id
-                return d
-                
-            def model_dump(self):
-                return self.dict()
-
-            @property
-            def ts(self):
-                from datetime import datetime, timezone
-                # Ensure timestamp is float/int
-                t = float(getattr(self, "timestamp", 0))
-                return datetime.fromtimestamp(t, tz=timezone.utc).isoformat()
-
-            @property
-            def request_id(self):
-                return getattr(self, "correlation_id", None) or "unknown"
-
-            @property
-            def surface_id(self):
-                return "gateway" # surface_id usually is where event originated
-
-            @property
-            def principal(self):
-                # Construct principal object from agent_id
-                return {"id": getattr(self, "agent_id", "unknown"), "type": "service"}
-
-            @property
-            def http(self):
-                return {"method": getattr(self, "method", ""), "path": getattr(self, "resource", "")}
-
-            @property
-            def meta(self):
-                return getattr(self, "metadata", {})
-
-            @property
-            def resource(self):
-                # Domain model expects Optional[Dict], DB has string|null
-                val = getattr(self, "_resource_val", None)
-                if not val:
-                    # Try getting from __dict__ manually if mapped weirdly?
-                    # The SELECT returns 'resource'.
-                    # But wait, self.resource is the property name. I can't access self.resource (recursion).
-                    # 'resource' key is in self.__dict__.
-                    val = self.__dict__.get("resource")
-                
-                if val:
-                    return {"id": str(val)}
-                return None
-
-            @property
-            def event_hash(self):
-                # Fallback to integrity_hash or empty
-                return getattr(self, "integrity_hash", "") or ""
-
-            @property
-            def schema_id(self):
-                return "talos.audit_event"
-
-        return EventObj(**row)
+            raise
 
 logger = logging.getLogger(__name__)
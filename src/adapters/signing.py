@@ -0,0 +1,52 @@
+"""
+Tree-head signers.
+
+Ed25519 needs the optional ``cryptography`` package; it is only imported when
+a signing key is configured.
+"""
+
+from src.ports.common import ISignerPort
+
+
+class Ed25519SignerAdapter(ISignerPort):
+    """Ed25519 over the snapshot payload; key_id is the hex raw public key."""
+
+    def __init__(self, private_key_hex: str):
+        try:
+            from cryptography.hazmat.primitives import serialization
+            from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+        except ImportError as e:  # pragma: no cover - depends on environment
+            raise RuntimeError(
+                "Snapshot signing needs the 'cryptography' package (pip install cryptography)"
+            ) from e
+
+        self._key = Ed25519PrivateKey.from_private_bytes(bytes.fromhex(private_key_hex))
+        public = self._key.public_key().public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+        self._key_id = public.hex()
+
+    @property
+    def key_id(self) -> str:
+        return self._key_id
+
+    def sign(self, message: bytes) -> bytes:
+        return self._key.sign(message)
+
+
+def verify_ed25519(message: bytes, signature_hex: str, key_id: str) -> bool:
+    """Check a signature made by Ed25519SignerAdapter; key_id is the hex raw public key."""
+    try:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "Signature checks need the 'cryptography' package (pip install cryptography)"
+        ) from e
+
+    try:
+        public_key = Ed25519PublicKey.from_public_bytes(bytes.fromhex(key_id))
+        public_key.verify(bytes.fromhex(signature_hex), message)
+    except (InvalidSignature, ValueError):
+        return False
+    return True
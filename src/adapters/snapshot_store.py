@@ -0,0 +1,28 @@
+import bisect
+import threading
+
+from src.domain.models import RootSnapshot
+from src.ports.common import ISnapshotStorePort
+
+
+class InMemorySnapshotStore(ISnapshotStorePort):
+    """Snapshot history for the in-memory deployment (lost on restart, like the events)."""
+
+    def __init__(self):
+        self._snapshots: list[RootSnapshot] = []
+        self._sizes: list[int] = []
+        self._lock = threading.Lock()
+
+    def save_snapshot(self, snapshot: RootSnapshot) -> None:
+        with self._lock:
+            if self._sizes and snapshot.tree_size <= self._sizes[-1]:
+                return
+            self._snapshots.append(snapshot)
+            self._sizes.append(snapshot.tree_size)
+
+    def latest_snapshot(self) -> RootSnapshot | None:
+        return self._snapshots[-1] if self._snapshots else None
+
+    def snapshots_since(self, tree_size: int, limit: int = 100) -> list[RootSnapshot]:
+        start = bisect.bisect_right(self._sizes, tree_size)
+        return self._snapshots[start : start + limit]
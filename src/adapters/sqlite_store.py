@@ -0,0 +1,389 @@
+"""
+Embedded SQLite event store for single-node deployments and local tests.
+
+The database runs in WAL mode, so readers never block the writer.
+``synchronous=NORMAL`` leaves the fsync to checkpoints: each append is one
+short transaction, and its commit survives a process crash. Only a power
+loss can drop the most recent commits. Use ``synchronous="FULL"`` to fsync
+every commit instead.
+
+With ``commit_interval`` set, appends are batched: they share one
+transaction, which commits every ``commit_interval`` seconds or every
+``commit_batch`` rows. Ingest throughput roughly doubles. The cost is that
+a crash can lose up to one interval of acknowledged events, and list and
+export reads see a row only after its batch commits.
+
+Each row keeps the event's canonical JSON (its Merkle leaf preimage) and
+the leaf hash. Rows are numbered in append order, so a restart rebuilds the
+whole tree from the stored leaves, in the original leaf order, without
+re-hashing anything. Pages use the same keyset cursors as the memory store
+(whole-second timestamp, event_id), with the same filters.
+"""
+
+import builtins
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from talos_sdk.ports.audit_store import IAuditStorePort  # type: ignore
+
+from src.core.metrics import STORE_QUERY_SECONDS
+from src.domain.models import (
+    Event,
+    EventPage,
+    RootSnapshot,
+    as_event,
+    decode_key,
+    encode_cursor,
+    event_timestamp,
+    field_value,
+)
+from src.ports.common import (
+    IEventExportPort,
+    IEventIndexPort,
+    ILeafStorePort,
+    IRetentionPort,
+    ISnapshotStorePort,
+)
+
+logger = logging.getLogger("audit-sqlite")
+
+FILTER_COLUMNS = ("principal_id", "outcome", "session_id", "correlation_id")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY,
+    event_id TEXT NOT NULL UNIQUE,
+    timestamp INTEGER NOT NULL,
+    principal_id TEXT,
+    outcome TEXT,
+    session_id TEXT,
+    correlation_id TEXT,
+    body TEXT NOT NULL,
+    event_hash TEXT NOT NULL,
+    hashes TEXT,
+    leaf BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_time_idx ON events (timestamp, event_id);
+CREATE INDEX IF NOT EXISTS events_principal_idx ON events (principal_id, timestamp, event_id);
+CREATE INDEX IF NOT EXISTS events_outcome_idx ON events (outcome, timestamp, event_id);
+CREATE INDEX IF NOT EXISTS events_session_idx ON events (session_id, timestamp, event_id);
+CREATE INDEX IF NOT EXISTS events_correlation_idx ON events (correlation_id, timestamp, event_id);
+CREATE TABLE IF NOT EXISTS root_snapshots (
+    tree_size INTEGER PRIMARY KEY,
+    root TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    signature TEXT,
+    key_id TEXT
+);
+"""
+_SELECT_EVENTS = "SELECT timestamp, event_id, body, event_hash, hashes FROM events"
+_SELECT_SNAPSHOTS = "SELECT tree_size, root, timestamp, signature, key_id FROM root_snapshots"
+
+
+def _event(row: tuple) -> Event:
+    _, _, body, event_hash, hashes = row
+    fields = json.loads(body)
+    fields["event_hash"] = event_hash
+    if hashes:
+        fields["hashes"] = json.loads(hashes)
+    return Event.model_validate(fields)
+
+
+def _snapshot(row: tuple) -> RootSnapshot:
+    tree_size, root, timestamp, signature, key_id = row
+    return RootSnapshot(
+        tree_size=tree_size, root=root, timestamp=timestamp, signature=signature, key_id=key_id
+    )
+
+
+def _where(filters: Any, clauses: list[str], params: list[Any]) -> None:
+    for column in FILTER_COLUMNS:
+        if filters and filters.get(column):
+            clauses.append(f"{column} = ?")
+            params.append(filters[column])
+
+
+class SqliteAuditStore(
+    IAuditStorePort,
+    IEventIndexPort,
+    IEventExportPort,
+    ILeafStorePort,
+    ISnapshotStorePort,
+    IRetentionPort,
+):
+    """Events, leaf hashes and root snapshots in one SQLite file; see the module docstring."""
+
+    def __init__(
+        self,
+        path: str,
+        synchronous: str = "NORMAL",
+        commit_interval: float = 0.0,
+        commit_batch: int = 1000,
+    ):
+        if synchronous not in ("NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Unsupported synchronous mode {synchronous!r}")
+        self.path = path
+        self.synchronous = synchronous
+        self.commit_interval = commit_interval
+        self.commit_batch = commit_batch
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.executescript(SCHEMA_SQL)
+        self._pending = 0
+        self._closed = threading.Event()
+        if commit_interval > 0:
+            threading.Thread(target=self._flush_loop, name="sqlite-commit", daemon=True).start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """A connection per thread: WAL readers run alongside the writer."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def close(self) -> None:
+        self._closed.set()
+        self.flush()
+        self._writer.close()
+
+    def flush(self) -> None:
+        """Commit the batch in progress, if any."""
+        with self._write_lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        # Caller holds the write lock.
+        if self._writer.in_transaction:
+            self._writer.execute("COMMIT")
+        self._pending = 0
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.commit_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"Batched commit failed: {e}")
+
+    def append(self, event: Any) -> bool:
+        """Insert an event; returns False if event_id was already stored."""
+        hydrated = as_event(event)
+        # The canonical JSON is both the stored body and the leaf preimage.
+        body = str(hydrated)
+        row = (
+            hydrated.event_id,
+            int(event_timestamp(event)),
+            *(field_value(hydrated, column) for column in FILTER_COLUMNS),
+            body,
+            hydrated.event_hash,
+            json.dumps(hydrated.hashes) if hydrated.hashes else None,
+            hashlib.sha256(body.encode("utf-8")).digest(),
+        )
+        with self._write_lock:
+            batched = self.commit_interval > 0
+            if batched and not self._writer.in_transaction:
+                self._writer.execute("BEGIN")
+            cur = self._writer.execute(
+                "INSERT OR IGNORE INTO events (event_id, timestamp, principal_id, outcome, "
+                "session_id, correlation_id, body, event_hash, hashes, leaf) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            if batched:
+                self._pending += 1
+                if self._pending >= self.commit_batch:
+                    self._commit()
+            return cur.rowcount == 1
+
+    def exists(self, event_id: str) -> bool:
+        with STORE_QUERY_SECONDS.labels(op="exists").time():
+            cur = self._reader().execute("SELECT 1 FROM events WHERE event_id = ?", (event_id,))
+            return cur.fetchone() is not None
+
+    def iter_event_ids(self) -> Iterator[str]:
+        return (event_id for (event_id,) in self._scan("SELECT event_id FROM events", []))
+
+    def iter_leaves(self) -> Iterator[tuple[str, bytes]]:
+        return self._scan("SELECT event_id, leaf FROM events ORDER BY seq", [])
+
+    def delete_events(self, event_ids: Sequence[str]) -> int:
+        """Drop archived events in one transaction."""
+        if not event_ids:
+            return 0
+        with self._write_lock:
+            self._commit()
+            self._writer.execute("BEGIN")
+            try:
+                cur = self._writer.executemany(
+                    "DELETE FROM events WHERE event_id = ?", [(event_id,) for event_id in event_ids]
+                )
+                self._writer.execute("COMMIT")
+            except Exception:
+                self._writer.execute("ROLLBACK")
+                raise
+            return cur.rowcount
+
+    def list(
+        self,
+        before: str | None = None,
+        limit: int = 100,
+        filters: Any = None,
+        cursor: str | None = None,
+    ) -> EventPage:
+        """
+        The ``limit`` newest matching events strictly before the cursor, oldest
+        first. ``cursor`` is the SDK port's name for ``before``.
+        """
+        before = before or cursor
+        clauses: list[str] = []
+        params: list[Any] = []
+        if before:
+            clauses.append("(timestamp, event_id) < (?, ?)")
+            params.extend(decode_key(before))
+        _where(filters, clauses, params)
+        query = _SELECT_EVENTS
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY timestamp DESC, event_id DESC LIMIT ?"
+        # One extra row tells whether there is another page.
+        params.append(limit + 1)
+        with STORE_QUERY_SECONDS.labels(op="list").time():
+            rows = self._reader().execute(query, params).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        rows.reverse()
+        next_cursor = encode_cursor((rows[0][0], rows[0][1])) if rows else None
+        events = [_event(row) for row in rows]
+        return EventPage(events=events, next_cursor=next_cursor, has_more=has_more)
+
+    def iter_events(
+        self,
+        start_ts: float | None = None,
+        end_ts: float | None = None,
+        filters: Any = None,
+        batch_size: int = 5000,
+    ) -> Iterator[Event]:
+        """Stream events in [start_ts, end_ts) oldest first, for export and retention."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if start_ts is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start_ts)
+        if end_ts is not None:
+            clauses.append("timestamp < ?")
+            params.append(end_ts)
+        _where(filters, clauses, params)
+        query = _SELECT_EVENTS
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY timestamp ASC, event_id ASC"
+        return map(_event, self._scan(query, params, batch_size))
+
+    def _scan(
+        self, query: str, params: builtins.list[Any], batch_size: int = 5000
+    ) -> Iterator[tuple]:
+        """
+        Run query on a connection of its own and fetch batch_size rows at a time.
+
+        The read transaction keeps one WAL snapshot for the whole scan, however
+        long the consumer takes.
+        """
+        conn = self._connect()
+        try:
+            cur = conn.execute(query, params)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            conn.close()
+
+    def stats(self, start_ts: float, end_ts: float) -> dict:
+        """Dashboard aggregations over [start_ts, end_ts], shaped as the Postgres store's."""
+        reader = self._reader()
+        with STORE_QUERY_SECONDS.labels(op="stats").time():
+            total, success, tokens, cost, latency = reader.execute(
+                """
+                SELECT
+                    COUNT(*),
+                    SUM(outcome = 'OK'),
+                    SUM(CAST(COALESCE(json_extract(body, '$.meta.metrics.tokens'), 0) AS INTEGER)),
+                    SUM(CAST(COALESCE(json_extract(body, '$.meta.metrics.cost_usd'), 0) AS REAL)),
+                    AVG(CAST(COALESCE(json_extract(body, '$.meta.metrics.latency_ms'), 0) AS REAL))
+                FROM events WHERE timestamp BETWEEN ? AND ?
+                """,
+                (start_ts, end_ts),
+            ).fetchone()
+            reasons = reader.execute(
+                "SELECT json_extract(body, '$.meta.denial_reason') AS reason, COUNT(*) FROM events "
+                "WHERE outcome = 'DENY' AND timestamp BETWEEN ? AND ? GROUP BY reason",
+                (start_ts, end_ts),
+            ).fetchall()
+            series = reader.execute(
+                """
+                SELECT
+                    timestamp / 3600 * 3600 AS bucket,
+                    SUM(outcome = 'OK'), SUM(outcome = 'DENY'), SUM(outcome = 'ERROR')
+                FROM events WHERE timestamp BETWEEN ? AND ?
+                GROUP BY bucket ORDER BY bucket ASC
+                """,
+                (start_ts, end_ts),
+            ).fetchall()
+        total = total or 0
+        return {
+            "requests_24h": total,
+            "auth_success_rate": ((success or 0) / total) if total > 0 else 1.0,
+            "denial_reason_counts": {reason: count for reason, count in reasons if reason},
+            "request_volume_series": [
+                {"time": bucket, "ok": ok, "deny": deny, "error": error}
+                for bucket, ok, deny, error in series
+            ],
+            "tokens_total": int(tokens or 0),
+            "cost_usd": float(cost or 0.0),
+            "latency_avg_ms": float(latency or 0.0),
+        }
+
+    def save_snapshot(self, snapshot: RootSnapshot) -> None:
+        with self._write_lock:
+            self._writer.execute(
+                "INSERT OR IGNORE INTO root_snapshots "
+                "(tree_size, root, timestamp, signature, key_id) VALUES (?, ?, ?, ?, ?)",
+                (
+                    snapshot.tree_size,
+                    snapshot.root,
+                    snapshot.timestamp,
+                    snapshot.signature,
+                    snapshot.key_id,
+                ),
+            )
+            # A head is committed together with (or after) the events it covers.
+            self._commit()
+
+    def latest_snapshot(self) -> RootSnapshot | None:
+        query = _SELECT_SNAPSHOTS + " ORDER BY tree_size DESC LIMIT 1"
+        row = self._reader().execute(query).fetchone()
+        return _snapshot(row) if row else None
+
+    def snapshots_since(self, tree_size: int, limit: int = 100) -> builtins.list[RootSnapshot]:
+        rows = (
+            self._reader()
+            .execute(
+                _SELECT_SNAPSHOTS + " WHERE tree_size > ? ORDER BY tree_size ASC LIMIT ?",
+                (tree_size, limit),
+            )
+            .fetchall()
+        )
+        return [_snapshot(row) for row in rows]
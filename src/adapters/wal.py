@@ -0,0 +1,364 @@
+"""
+Segmented write-ahead log on local disk.
+
+Records are appended to segment files named after their first sequence
+number (``<seq>.wal``). Each record is framed as
+``u32 length | u32 crc32 | u64 seq | payload``, and the CRC covers the
+sequence number and the payload. A crash can leave a torn record at the
+end of the last segment. On open, the tail is scanned, and everything from
+the first bad frame onwards is truncated. A bad frame anywhere else means
+corruption, and replay stops with an error.
+
+Appends only write to the file. One sync thread fsyncs and then wakes every
+waiter up to the highest record written before the fsync. Concurrent
+appends therefore share one fsync (group commit). Segments rotate on that
+thread as well, once the current one is past ``segment_bytes``. The old
+file is fsynced and closed, and the directory is fsynced, before any record
+in the new file is reported durable.
+
+Waiters are woken on their event loop in sequence order. Coroutines that
+append and then await ``synced`` therefore resume in append order. One log
+serves one event loop.
+
+``truncate`` records a checkpoint (written atomically) and deletes the
+segments whose records are all at or below it. ``snapshot`` is for logs
+that are the only durable copy (the memory store): it rewrites the records
+up to a sequence number that are still wanted into one snapshot file, in
+log order, and then truncates. The snapshot file is named after the last
+record it covers (``<seq>.snapshot``). If a crash comes between the two
+steps, opening the log finishes the truncate.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterator
+
+from src.core.metrics import WAL_FSYNC_RECORDS, WAL_FSYNC_SECONDS
+from src.ports.common import IWalPort
+
+logger = logging.getLogger("audit-wal")
+
+_FRAME = struct.Struct(">IIQ")
+SUFFIX = ".wal"
+SNAPSHOT_SUFFIX = ".snapshot"
+CHECKPOINT = "checkpoint"
+
+
+class WalCorruptError(ValueError):
+    """A record before the end of the log failed its length or CRC check."""
+
+
+def _frame(seq: int, payload: bytes) -> bytes:
+    crc = zlib.crc32(payload, zlib.crc32(struct.pack(">Q", seq)))
+    return _FRAME.pack(len(payload), crc, seq) + payload
+
+
+def _read_frames(path: str) -> Iterator[tuple[int, int, bytes]]:
+    """(offset, seq, payload) per valid frame; stops at the first invalid one."""
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + _FRAME.size <= len(data):
+        length, crc, seq = _FRAME.unpack_from(data, offset)
+        end = offset + _FRAME.size + length
+        if end > len(data):
+            return
+        payload = data[offset + _FRAME.size : end]
+        if zlib.crc32(payload, zlib.crc32(struct.pack(">Q", seq))) != crc:
+            return
+        yield offset, seq, payload
+        offset = end
+
+
+class SegmentedWal(IWalPort):
+    """Append-only log with group-committed fsync; see the module docstring."""
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024):
+        self._directory = directory
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._checkpoint = self._read_checkpoint()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # Touched only on the loop: heap of (seq, tiebreak, future), and what it has released.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._tiebreak = itertools.count()
+        self._failed: BaseException | None = None
+        self._closed = False
+
+        last_seq = self._recover_tail()
+        self._written = self._synced = self._released = max(last_seq, self._checkpoint)
+        starts = self._segment_starts()
+        if starts:
+            self._path = self._segment_path(starts[-1])
+            self._fd = os.open(self._path, os.O_WRONLY | os.O_APPEND)
+            self._size = os.fstat(self._fd).st_size
+        else:
+            self._open_segment(self._written + 1)
+            self._fsync_dir()
+        self._thread = threading.Thread(target=self._sync_loop, name="wal-sync", daemon=True)
+        self._thread.start()
+        snapshot = self._snapshot_seq()
+        if snapshot > self._checkpoint:  # a snapshot whose truncate did not happen
+            self.truncate(snapshot)
+
+    @property
+    def checkpoint(self) -> int:
+        return self._checkpoint
+
+    @property
+    def last_seq(self) -> int:
+        return self._written
+
+    def append(self, record: bytes) -> int:
+        with self._lock:
+            if self._failed is not None:
+                raise OSError(f"WAL is unusable after a failed fsync: {self._failed}")
+            if self._closed:
+                raise RuntimeError("WAL is closed")
+            seq = self._written + 1
+            frame = _frame(seq, record)
+            try:
+                self._write_all(frame)
+            except OSError:
+                # Cut the partial frame, or later records would follow garbage.
+                try:
+                    os.ftruncate(self._fd, self._size)
+                except OSError as e:
+                    self._failed = e
+                raise
+            self._written = seq
+            self._size += len(frame)
+            self._wakeup.notify()
+            return seq
+
+    async def synced(self, seq: int) -> None:
+        if self._failed is not None:
+            raise OSError(f"WAL fsync failed: {self._failed}")
+        if seq <= self._released:
+            return
+        self._loop = loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (seq, next(self._tiebreak), future))
+        if seq <= self._synced:  # synced before this loop was known to the sync thread
+            loop.call_soon(self._release, self._synced)
+        await future
+
+    def _write_all(self, data: bytes) -> None:
+        """os.write may write less than asked (signals, some filesystems): finish the frame."""
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            if written <= 0:
+                raise OSError(f"WAL write made no progress in {self._path}")
+            view = view[written:]
+
+    def replay(self, after: int = 0) -> Iterator[tuple[int, bytes]]:
+        starts = self._segment_starts()
+        for index, start in enumerate(starts):
+            following = starts[index + 1] if index + 1 < len(starts) else None
+            if following is not None and following - 1 <= after:
+                continue
+            path = self._segment_path(start)
+            expected = start
+            for _, seq, payload in _read_frames(path):
+                if seq != expected:
+                    raise WalCorruptError(f"{path}: expected record {expected}, found {seq}")
+                expected += 1
+                if seq > after:
+                    yield seq, payload
+            if following is not None and expected != following:
+                raise WalCorruptError(f"{path}: corrupt record {expected} before the log end")
+
+    def truncate(self, upto: int) -> None:
+        if upto <= self._checkpoint:
+            return
+        tmp = os.path.join(self._directory, CHECKPOINT + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(str(upto))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self._directory, CHECKPOINT))
+        self._fsync_dir()
+        self._checkpoint = upto
+        starts = self._segment_starts()
+        # Never the last segment: it is the one being written.
+        for start, following in itertools.pairwise(starts):
+            if following - 1 > upto:
+                break
+            os.unlink(self._segment_path(start))
+
+    def snapshot(self, upto: int, keep: Callable[[bytes], bool]) -> int:
+        """
+        Rewrite the records up to ``upto`` that ``keep`` accepts (from the last
+        snapshot and the log) into a new snapshot, then truncate the log to
+        ``upto``. Returns the number of records kept.
+        """
+        if upto <= self._checkpoint:
+            return 0
+        records = itertools.chain(self.replay_snapshot(), self.replay(after=self._checkpoint))
+        kept = 0
+        tmp = os.path.join(self._directory, SNAPSHOT_SUFFIX + ".tmp")
+        with open(tmp, "wb") as f:
+            for seq, payload in records:
+                if seq > upto:
+                    break
+                if keep(payload):
+                    f.write(_frame(seq, payload))
+                    kept += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._snapshot_path(upto))
+        self._fsync_dir()
+        for older in self._snapshot_seqs():
+            if older != upto:
+                os.unlink(self._snapshot_path(older))
+        self.truncate(upto)
+        return kept
+
+    def replay_snapshot(self) -> Iterator[tuple[int, bytes]]:
+        upto = self._snapshot_seq()
+        if not upto:
+            return
+        path = self._snapshot_path(upto)
+        end = 0
+        for offset, seq, payload in _read_frames(path):
+            end = offset + _FRAME.size + len(payload)
+            yield seq, payload
+        if end != os.path.getsize(path):
+            raise WalCorruptError(f"{path}: corrupt record after byte {end}")
+
+    def close(self) -> None:
+        """Sync what was written and stop the sync thread."""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join()
+        os.close(self._fd)
+
+    def _sync_loop(self) -> None:
+        while True:
+            with self._lock:
+                while self._written == self._synced and not self._closed:
+                    self._wakeup.wait()
+                if self._written == self._synced:
+                    return
+                target = self._written
+                fd, rotated = self._fd, None
+                if self._size >= self.segment_bytes:
+                    rotated = fd
+                    self._open_segment(target + 1)
+            started = time.perf_counter()
+            try:
+                os.fsync(fd)
+                if rotated is not None:
+                    os.close(rotated)
+                    self._fsync_dir()
+            except OSError as e:
+                # After a failed fsync the page cache can't be trusted (fsyncgate): stop.
+                logger.critical(f"WAL fsync failed; refusing further appends: {e}")
+                self._fail(e)
+                return
+            WAL_FSYNC_SECONDS.observe(time.perf_counter() - started)
+            self._mark_synced(target)
+
+    def _mark_synced(self, target: int) -> None:
+        with self._lock:
+            WAL_FSYNC_RECORDS.observe(target - self._synced)
+            self._synced = target
+        self._wake(self._release, target)
+
+    def _release(self, target: int) -> None:
+        """On the loop: wake the waiters up to ``target``, in sequence order."""
+        self._released = max(self._released, target)
+        while self._waiters and self._waiters[0][0] <= target:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+
+    def _fail(self, error: BaseException) -> None:
+        with self._lock:
+            self._failed = error
+        self._wake(self._release_failed, error)
+
+    def _wake(self, callback, arg) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(callback, arg)
+        except RuntimeError:
+            pass  # that loop is closed, so nothing is waiting on it
+
+    def _release_failed(self, error: BaseException) -> None:
+        waiters, self._waiters = self._waiters, []
+        for _, _, future in waiters:
+            if not future.done():
+                future.set_exception(OSError(f"WAL fsync failed: {error}"))
+
+    def _open_segment(self, first_seq: int) -> None:
+        self._path = self._segment_path(first_seq)
+        self._fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._size = 0
+
+    def _recover_tail(self) -> int:
+        """Cut a torn record off the last segment; returns the last valid seq."""
+        starts = self._segment_starts()
+        if not starts:
+            return 0
+        path = self._segment_path(starts[-1])
+        last_seq, end = starts[-1] - 1, 0
+        for offset, seq, payload in _read_frames(path):
+            last_seq, end = seq, offset + _FRAME.size + len(payload)
+        if end < os.path.getsize(path):
+            logger.warning(f"Truncating torn WAL tail in {path} at byte {end}")
+            with open(path, "r+b") as f:
+                f.truncate(end)
+                os.fsync(f.fileno())
+        return last_seq
+
+    def _segment_starts(self) -> list[int]:
+        return sorted(
+            int(name[: -len(SUFFIX)])
+            for name in os.listdir(self._directory)
+            if name.endswith(SUFFIX)
+        )
+
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self._directory, f"{first_seq:020d}{SUFFIX}")
+
+    def _snapshot_seqs(self) -> list[int]:
+        return [
+            int(name[: -len(SNAPSHOT_SUFFIX)])
+            for name in os.listdir(self._directory)
+            if name.endswith(SNAPSHOT_SUFFIX) and name[: -len(SNAPSHOT_SUFFIX)].isdigit()
+        ]
+
+    def _snapshot_seq(self) -> int:
+        """Last record the current snapshot covers; 0 without a snapshot."""
+        return max(self._snapshot_seqs(), default=0)
+
+    def _snapshot_path(self, upto: int) -> str:
+        return os.path.join(self._directory, f"{upto:020d}{SNAPSHOT_SUFFIX}")
+
+    def _read_checkpoint(self) -> int:
+        try:
+            with open(os.path.join(self._directory, CHECKPOINT)) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _fsync_dir(self) -> None:
+        dir_fd = os.open(self._directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
@@ -1,13 +1,28 @@
 from src.domain.services import AuditService
 from src.domain.merkle import MerkleTree
-from src.ports.common import SystemClockAdapter, UuidIdAdapter
+from src.domain.bloom import ScalableBloomFilter
+from src.domain.dedup import DuplicateDetector
+from src.domain.snapshots import RootSnapshotter
+from src.domain.proof_batch import ProofBatcher
+from src.domain.query_cache import QueryCache
+from src.domain.retention import ColdTier, RetentionManager
+from src.domain.shipping import WalShipper
+from src.adapters.snapshot_store import InMemorySnapshotStore
+from src.ports.common import (
+    IEventExportPort,
+    IRetentionPort,
+    ISnapshotStorePort,
+    SystemClockAdapter,
+    UuidIdAdapter,
+)
 from talos_sdk.container import Container, get_container
 from talos_sdk.ports.audit_store import IAuditStorePort
 from talos_sdk.ports.hash import IHashPort
-from talos_sdk.adapters.memory_store import InMemoryAuditStore
 from talos_sdk.adapters.hash import NativeHashAdapter
 
-from src.core.broadcaster import EventBroadcaster
+from src.core.admission import AdmissionController
+from src.core.broadcaster import EventBroadcaster, ProofBroadcaster
+from src.core.metrics import SSE_QUEUE_DEPTH, SSE_SUBSCRIBERS
 
 _container = None
 
@@ -16,12 +31,16 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
 logger = logging.getLogger("audit-bootstrap")
 
-def bootstrap() -> Container:
-    """Initialize the DI container (Composition Root)."""
+def bootstrap(role: str = "standalone") -> Container:
+    """
+    Initialize the DI container (Composition Root).
+
+    role: "standalone" (single process), "sequencer" (owns the Merkle tree in
+    multi-worker mode) or "worker" (HTTP worker that commits via the sequencer).
+    """
     container = get_container()
 
     # Register Secondary Ports / Adapters (SDK)
-    import os
     import logging
     from src.config import settings
 
@@ -35,29 +54,201 @@ def bootstrap() -> Container:
     
     if storage_type == "postgres":
         from src.adapters.postgres_store import PostgresAuditStore
-        container.register(IAuditStorePort, PostgresAuditStore())
+        container.register(
+            IAuditStorePort,
+            PostgresAuditStore(
+                replica_dsns=settings.database_replica_urls,
+                max_replica_lag=settings.replica_max_lag_seconds,
+            ),
+        )
+    elif storage_type == "sqlite":
+        from src.adapters.sqlite_store import SqliteAuditStore
+
+        container.register(
+            IAuditStorePort,
+            SqliteAuditStore(
+                settings.sqlite_path,
+                synchronous=settings.sqlite_synchronous,
+                commit_interval=settings.sqlite_commit_interval_seconds,
+            ),
+        )
     else:
-        container.register(IAuditStorePort, InMemoryAuditStore())
+        from src.adapters.memory_store import IndexedMemoryStore
+
+        container.register(IAuditStorePort, IndexedMemoryStore())
 
     container.register(IHashPort, NativeHashAdapter())
 
     # Register Infrastructure Adapters (Internal)
     container.register(SystemClockAdapter, SystemClockAdapter())
     container.register(UuidIdAdapter, UuidIdAdapter())
-    container.register(EventBroadcaster, EventBroadcaster())
+    broadcaster = EventBroadcaster()
+    container.register(EventBroadcaster, broadcaster)
+    # Proof frames arrive a whole snapshot at a time.
+    proof_broadcaster = ProofBroadcaster(
+        max_queue_size=max(100, 2 * settings.snapshot_every_events)
+    )
+    container.register(ProofBroadcaster, proof_broadcaster)
+    SSE_SUBSCRIBERS.set_function(lambda: broadcaster.subscriber_count)
+    SSE_QUEUE_DEPTH.labels(aggregate="total").set_function(lambda: sum(broadcaster.queue_depths()))
+    SSE_QUEUE_DEPTH.labels(aggregate="max").set_function(
+        lambda: max(broadcaster.queue_depths(), default=0)
+    )
+    if settings.ingest_admission_max_limit > 0:
+        container.register(
+            AdmissionController,
+            AdmissionController(
+                min_limit=settings.ingest_admission_min_limit,
+                max_limit=settings.ingest_admission_max_limit,
+                target_latency=settings.ingest_admission_target_latency_seconds,
+                max_queue=settings.ingest_admission_max_queue,
+                queue_timeout=settings.ingest_admission_queue_timeout_seconds,
+            ),
+        )
+
+    store = container.resolve(IAuditStorePort)
+    snapshot_store = store if isinstance(store, ISnapshotStorePort) else InMemorySnapshotStore()
+    container.register(ISnapshotStorePort, snapshot_store)
+
+    # Only the memory store is bounded by count; the others keep an age window.
+    in_memory = storage_type not in ("postgres", "sqlite")
+    max_store_events = settings.memory_max_events if in_memory else None
+    cold_tier = None
+    if settings.archive_dir:
+        from src.adapters.archive import SegmentArchive
+
+        cold_tier = ColdTier(SegmentArchive(settings.archive_dir), container.resolve(IHashPort))
+        container.register(ColdTier, cold_tier)
+
+    query_cache = None
+    if settings.query_cache_ttl_seconds > 0:
+        query_cache = QueryCache(settings.query_cache_ttl_seconds, settings.query_cache_max_entries)
+        container.register(QueryCache, query_cache)
+
+    if role == "worker":
+        from src.core.sequencer import SequencedAuditService, SequencerClient
+
+        client = SequencerClient(settings.sequencer_address, settings.sequencer_authkey)
+        container.register(SequencerClient, client)
+        container.register(
+            AuditService,
+            SequencedAuditService(
+                client=client,
+                store=store,
+                clock=container.resolve(SystemClockAdapter),
+                id_gen=container.resolve(UuidIdAdapter),
+                broadcaster=broadcaster,
+                # Read-only history view; the sequencer seals snapshots.
+                snapshots=RootSnapshotter(
+                    None, snapshot_store, container.resolve(SystemClockAdapter)
+                ),
+                cold_tier=cold_tier,
+                query_cache=query_cache,
+            ),
+        )
+        return container
 
     # Register Domain Logic
     hash_port = container.resolve(IHashPort)
     merkle_tree = MerkleTree(hash_port)
     container.register(MerkleTree, merkle_tree)
 
+    dedup = DuplicateDetector(
+        store,
+        merkle_tree,
+        ScalableBloomFilter(
+            initial_capacity=settings.dedup_initial_capacity,
+            error_rate=settings.dedup_error_rate,
+        ),
+        cold_tier=cold_tier,
+    )
+    container.register(DuplicateDetector, dedup)
+
+    signer = None
+    if settings.snapshot_signing_key:
+        from src.adapters.signing import Ed25519SignerAdapter
+
+        signer = Ed25519SignerAdapter(settings.snapshot_signing_key)
+        logger.info(f"🔏 Root snapshots signed with key {signer.key_id[:16]}...")
+    snapshots = RootSnapshotter(
+        merkle_tree,
+        snapshot_store,
+        container.resolve(SystemClockAdapter),
+        signer=signer,
+        every_events=settings.snapshot_every_events,
+        every_seconds=settings.snapshot_every_seconds,
+    )
+    container.register(RootSnapshotter, snapshots)
+
+    proof_sink = proof_broadcaster
+    if role == "sequencer":
+        from src.core.sequencer import SequencerPublisher
+
+        # Committed events and proofs go to the workers, which fan them out over SSE.
+        broadcaster = SequencerPublisher(lambda: merkle_tree.get_root().root)
+        container.register(SequencerPublisher, broadcaster)
+        proof_sink = broadcaster
+    proofs = ProofBatcher(merkle_tree, proof_sink)
+    container.register(ProofBatcher, proofs)
+
+    retention = None
+    if settings.retention_max_age_seconds is not None or max_store_events is not None:
+        if cold_tier is None:
+            logger.warning("⚠️ Retention needs archive_dir to move events to; keeping all events")
+        elif isinstance(store, IEventExportPort) and isinstance(store, IRetentionPort):
+            retention = RetentionManager(
+                store,
+                cold_tier,
+                hash_port,
+                container.resolve(SystemClockAdapter),
+                max_age_seconds=settings.retention_max_age_seconds,
+                segment_max_events=settings.archive_segment_max_events,
+                interval_seconds=settings.retention_interval_seconds,
+                signer=signer,
+                snapshots=snapshots,
+                max_store_events=max_store_events,
+                merkle_tree=merkle_tree,
+            )
+            container.register(RetentionManager, retention)
+        else:
+            logger.warning(
+                f"⚠️ storage_type={storage_type} does not support retention; keeping all events"
+            )
+
+    wal = None
+    if settings.wal_dir:
+        from src.adapters.wal import SegmentedWal
+
+        # The memory store loses everything on restart, so its log is snapshotted instead.
+        wal = WalShipper(
+            SegmentedWal(settings.wal_dir, segment_bytes=settings.wal_segment_bytes),
+            store,
+            truncate=not in_memory,
+            snapshot_records=settings.wal_snapshot_records,
+        )
+        container.register(WalShipper, wal)
+        if role == "sequencer":
+            wal.add_ship_listener(broadcaster.stored)
+        logger.info(f"📜 Ingest acknowledged from the write-ahead log in {settings.wal_dir}")
+
     # Register Domain Service
     audit_service = AuditService(
-        store=container.resolve(IAuditStorePort),
+        store=store,
         merkle_tree=merkle_tree,
         clock=container.resolve(SystemClockAdapter),
         id_gen=container.resolve(UuidIdAdapter),
-        broadcaster=container.resolve(EventBroadcaster),
+        broadcaster=broadcaster,
+        dedup=dedup,
+        snapshots=snapshots,
+        proofs=proofs,
+        cold_tier=cold_tier,
+        retention=retention,
+        # The standalone app recovers in the background (see the lifespan);
+        # the sequencer must be complete before it accepts commits.
+        recover_on_init=role != "standalone",
+        max_queued_ingest=settings.recovery_max_queued_ingest,
+        query_cache=query_cache,
+        wal=wal,
     )
     container.register(AuditService, audit_service)
 
@@ -67,14 +258,32 @@ def bootstrap() -> Container:
 def get_app_container() -> Container:
     global _container
     if _container is None:
-        _container = bootstrap()
+        from src.config import settings
+
+        _container = bootstrap(role="worker" if settings.sequencer_address else "standalone")
     return _container
 
 
 def get_audit_service() -> AuditService:
     """Direct accessor for FastAPI dependency injection."""
-    return get_app_container().resolve(AuditService)
+    service = get_app_container().resolve(AuditService)
+    if service.recovery.state == "pending":
+        # Nothing scheduled a background recovery (no lifespan): recover inline.
+        service.recover()
+    return service
 
 def get_broadcaster() -> EventBroadcaster:
     """Direct accessor for FastAPI dependency injection."""
     return get_app_container().resolve(EventBroadcaster)
+
+def get_proof_broadcaster() -> ProofBroadcaster:
+    """Direct accessor for FastAPI dependency injection."""
+    return get_app_container().resolve(ProofBroadcaster)
+
+def get_admission() -> AdmissionController | None:
+    """Direct accessor for FastAPI dependency injection; None when admission control is off."""
+    from src.config import settings
+
+    if settings.ingest_admission_max_limit <= 0:
+        return None
+    return get_app_container().resolve(AdmissionController)
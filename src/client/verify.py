@@ -0,0 +1,217 @@
+"""
+Client-side verification of audit proofs.
+
+    from src.client.verify import BatchVerifier, verify_consistency, verify_proof
+
+    verify_proof(requests.get(f"{url}/proof/{event_id}").json(), root=head["root"])
+
+Matches the service's tree. A leaf is the sha256 of the event's canonical
+JSON. A node is ``sha256(left + right)``, and an odd node at the end of a
+level is paired with itself. Each step of a path names the side its sibling
+is on. Proofs may be ``ProofView``/``ProofReceipt`` objects or the JSON
+dicts the API returns. Roots should come from published heads
+(``GET /roots``), not from the proof being checked.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+from src.domain.models import Event
+
+# Node per tree level; level j holds a complete subtree of 2**j leaves, or None.
+Frontier = list[bytes | None]
+
+
+def _sha256(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def _field(obj: Any, *names: str) -> Any:
+    """First of ``names`` present on a model or dict."""
+    for name in names:
+        value = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def _steps(proof: Any) -> list[tuple[bool, bytes]]:
+    """(sibling is on the left, sibling hash) per path step."""
+    steps = []
+    for step in _field(proof, "path") or []:
+        position = _field(step, "position")
+        if position not in ("left", "right"):
+            raise ValueError(f"Unknown proof step position {position!r}")
+        steps.append((position == "left", bytes.fromhex(_field(step, "hash"))))
+    return steps
+
+
+def leaf_hash(event: Any) -> bytes:
+    """Leaf hash of an event (an ``Event`` or its JSON dict): sha256 of its canonical form."""
+    if not isinstance(event, Event):
+        event = Event.model_validate(event)
+    return _sha256(str(event).encode("utf-8"))
+
+
+def root_from_path(entry_hash: bytes, steps: Iterable[tuple[bool, bytes]]) -> bytes:
+    node = entry_hash
+    for sibling_is_left, sibling in steps:
+        node = _sha256(sibling + node) if sibling_is_left else _sha256(node + sibling)
+    return node
+
+
+def verify_proof(proof: Any, root: str | None = None, event: Any = None) -> bool:
+    """
+    Check an inclusion proof against ``root`` (default: the root it carries).
+
+    With ``event``, the proof's entry_hash must also be that event's leaf hash.
+    """
+    try:
+        entry_hash = bytes.fromhex(_field(proof, "entry_hash") or "")
+        if event is not None and leaf_hash(event) != entry_hash:
+            return False
+        expected = root if root is not None else _field(proof, "root")
+        return bool(entry_hash) and root_from_path(entry_hash, _steps(proof)).hex() == expected
+    except (TypeError, ValueError):
+        return False
+
+
+class BatchVerifier:
+    """
+    Verifies many inclusion proofs against one root, sharing work between them.
+
+    Every node of a proof that verified is remembered by (level, index). A
+    later proof stops at the first remembered node it reaches: equal means
+    verified, different means forged. Proofs for neighbouring leaves then
+    cost a hash or two each instead of a full path. Proofs without a leaf
+    index are verified in full.
+    """
+
+    def __init__(self, root: str, max_nodes: int = 1 << 20):
+        self.root = root
+        self.max_nodes = max_nodes
+        self._nodes: dict[tuple[int, int], bytes] = {}
+
+    def verify(self, proof: Any, event: Any = None) -> bool:
+        index = _field(proof, "leaf_index", "index")
+        if index is None or index < 0:
+            return verify_proof(proof, self.root, event)
+        path = _field(proof, "path") or []
+        # The path must match the index bit for bit, or nodes would be cached
+        # under the wrong position.
+        if index >> len(path):
+            return False
+        try:
+            node = bytes.fromhex(_field(proof, "entry_hash") or "")
+            if not node or (event is not None and leaf_hash(event) != node):
+                return False
+
+            visited = []
+            # Steps are decoded lazily: most stop at a cached node after a level or two.
+            for level, step in enumerate(path):
+                position = (level, index >> level)
+                known = self._nodes.get(position)
+                if known is not None:
+                    verified = known == node
+                    break
+                side = _field(step, "position")
+                sibling_is_left = side == "left"
+                if side not in ("left", "right") or sibling_is_left != bool(position[1] & 1):
+                    return False
+                sibling = bytes.fromhex(_field(step, "hash"))
+                visited.append((position, node))
+                node = _sha256(sibling + node) if sibling_is_left else _sha256(node + sibling)
+            else:
+                verified = node.hex() == self.root
+        except (TypeError, ValueError):
+            return False
+
+        if verified and len(self._nodes) + len(visited) <= self.max_nodes:
+            self._nodes.update(visited)
+        return verified
+
+    def verify_all(self, proofs: Iterable[Any]) -> list[bool]:
+        return [self.verify(proof) for proof in proofs]
+
+
+def verify_proofs(proofs: Iterable[Any], root: str) -> list[bool]:
+    """Verify many proofs against one root; see BatchVerifier."""
+    return BatchVerifier(root).verify_all(proofs)
+
+
+def push_node(frontier: Frontier, node: bytes, level: int = 0) -> None:
+    """Append a complete subtree root at ``level`` (0 for a leaf), carrying upwards."""
+    while len(frontier) < level:
+        frontier.append(None)
+    while level < len(frontier) and frontier[level] is not None:
+        node = _sha256(frontier[level] + node)
+        frontier[level] = None
+        level += 1
+    if level == len(frontier):
+        frontier.append(node)
+    else:
+        frontier[level] = node
+
+
+def frontier_root(frontier: Frontier) -> str:
+    """
+    Root of the tree whose leaves the frontier summarizes, as MerkleTree.get_root.
+
+    The right edge is folded bottom-up: at each level the partial node pairs
+    with the complete subtree to its left, or with itself when there is none.
+    """
+    top = max((level for level, node in enumerate(frontier) if node is not None), default=None)
+    if top is None:
+        return ""
+    partial: bytes | None = None
+    for level in range(top + 1):
+        full = frontier[level]
+        if level == top and partial is None:
+            return full.hex()
+        if full is not None:
+            partial = _sha256(full + (partial if partial is not None else full))
+        elif partial is not None:
+            partial = _sha256(partial + partial)
+    return partial.hex()
+
+
+def verify_consistency(proof: Any, first_root: str, second_root: str) -> bool:
+    """
+    Check a ``GET /consistency`` proof: the tree with ``second_root`` starts
+    with exactly the leaves of the tree with ``first_root``.
+    """
+    try:
+        first_size = int(_field(proof, "first_size"))
+        second_size = int(_field(proof, "second_size"))
+        frontier_nodes = [
+            (int(_field(n, "level")), bytes.fromhex(_field(n, "hash")))
+            for n in _field(proof, "frontier") or []
+        ]
+        extension = [
+            (int(_field(n, "level")), bytes.fromhex(_field(n, "hash")))
+            for n in _field(proof, "extension") or []
+        ]
+    except (TypeError, ValueError):
+        return False
+    if not 0 < first_size <= second_size:
+        return False
+
+    # The first tree is exactly one complete subtree per set bit of its size.
+    levels = [k for k in reversed(range(first_size.bit_length())) if first_size >> k & 1]
+    if [level for level, _ in frontier_nodes] != levels:
+        return False
+    frontier: Frontier = [None] * (levels[0] + 1)
+    for level, node in frontier_nodes:
+        frontier[level] = node
+    if frontier_root(frontier) != first_root:
+        return False
+
+    position = first_size
+    for level, node in extension:
+        size = 1 << level
+        if level < 0 or position % size or position + size > second_size:
+            return False
+        push_node(frontier, node, level)
+        position += size
+    return position == second_size and frontier_root(frontier) == second_root
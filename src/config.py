@@ -1,9 +1,12 @@
 import os
 import sys
-from talos_config import ConfigurationLoader
+from functools import cache
+
 
 class AuditConfig:
     def __init__(self):
+        from talos_config import ConfigurationLoader
+
         loader = ConfigurationLoader("audit")
         
         # Legacy Shim
@@ -23,4 +26,164 @@ class AuditConfig:
     def storage_type(self) -> str:
         return self._data.get("storage_type", "memory")
 
-settings = AuditConfig()
+    @property
+    def database_replica_urls(self) -> list[str]:
+        """Read replica DSNs for list/stats/export; empty means read from the primary."""
+        urls = self._data.get("database_replica_urls") or os.getenv(
+            "TALOS_DATABASE_REPLICA_URLS", ""
+        )
+        if isinstance(urls, str):
+            urls = urls.split(",")
+        return [url.strip() for url in urls if url.strip()]
+
+    @property
+    def replica_max_lag_seconds(self) -> float:
+        return float(self._data.get("replica_max_lag_seconds", 5.0))
+
+    @property
+    def admin_token(self) -> str | None:
+        """Shared secret for /admin endpoints; unset disables them."""
+        return self._data.get("admin_token") or os.getenv("TALOS_ADMIN_TOKEN")
+
+    @property
+    def sequencer_address(self) -> str | None:
+        """Unix socket of the Merkle sequencer; set means this process is a worker."""
+        return self._data.get("sequencer_address") or os.getenv("TALOS_SEQUENCER_ADDRESS")
+
+    @property
+    def sequencer_authkey(self) -> bytes | None:
+        """Hex-encoded IPC auth key shared by the sequencer and its workers."""
+        key = os.getenv("TALOS_SEQUENCER_AUTHKEY")
+        return bytes.fromhex(key) if key else None
+
+    @property
+    def snapshot_every_events(self) -> int:
+        return int(self._data.get("snapshot_every_events", 1000))
+
+    @property
+    def snapshot_every_seconds(self) -> float:
+        return float(self._data.get("snapshot_every_seconds", 10.0))
+
+    @property
+    def snapshot_signing_key(self) -> str | None:
+        """Hex Ed25519 private key for signing root snapshots; unset = unsigned."""
+        return self._data.get("snapshot_signing_key") or os.getenv("TALOS_SNAPSHOT_SIGNING_KEY")
+
+    @property
+    def dedup_initial_capacity(self) -> int:
+        return int(self._data.get("dedup_initial_capacity", 100_000))
+
+    @property
+    def dedup_error_rate(self) -> float:
+        return float(self._data.get("dedup_error_rate", 0.001))
+
+    @property
+    def retention_max_age_seconds(self) -> float | None:
+        """Archive events older than this; unset keeps everything in the store."""
+        value = self._data.get("retention_max_age_seconds")
+        return float(value) if value else None
+
+    @property
+    def memory_max_events(self) -> int | None:
+        """Events the memory store keeps; older ones are archived. Unset keeps everything."""
+        value = self._data.get("memory_max_events")
+        return int(value) if value else None
+
+    @property
+    def retention_interval_seconds(self) -> float:
+        return float(self._data.get("retention_interval_seconds", 3600.0))
+
+    @property
+    def sqlite_path(self) -> str:
+        return self._data.get("sqlite_path") or os.getenv("TALOS_SQLITE_PATH", "audit.db")
+
+    @property
+    def sqlite_synchronous(self) -> str:
+        """NORMAL fsyncs at WAL checkpoints; FULL on every commit."""
+        return str(self._data.get("sqlite_synchronous", "NORMAL")).upper()
+
+    @property
+    def sqlite_commit_interval_seconds(self) -> float:
+        """Batch appends into one commit per interval; 0 commits every append."""
+        return float(self._data.get("sqlite_commit_interval_seconds", 0.0))
+
+    @property
+    def wal_dir(self) -> str | None:
+        """Directory for the ingest write-ahead log; unset acknowledges from the store."""
+        return self._data.get("wal_dir") or os.getenv("TALOS_WAL_DIR")
+
+    @property
+    def wal_segment_bytes(self) -> int:
+        return int(self._data.get("wal_segment_bytes", 64 * 1024 * 1024))
+
+    @property
+    def wal_snapshot_records(self) -> int:
+        """Memory store: records logged between snapshots of what it still holds."""
+        return int(self._data.get("wal_snapshot_records", 100_000))
+
+    @property
+    def ingest_admission_max_limit(self) -> int:
+        """Upper bound of the adaptive in-flight ingest limit; 0 disables admission control."""
+        return int(self._data.get("ingest_admission_max_limit", 1024))
+
+    @property
+    def ingest_admission_min_limit(self) -> int:
+        return int(self._data.get("ingest_admission_min_limit", 4))
+
+    @property
+    def ingest_admission_target_latency_seconds(self) -> float:
+        """Per-event ingest latency above which the limit is cut back."""
+        return float(self._data.get("ingest_admission_target_latency_seconds", 0.1))
+
+    @property
+    def ingest_admission_max_queue(self) -> int:
+        """Requests that may wait for a slot; more are answered 429."""
+        return int(self._data.get("ingest_admission_max_queue", 256))
+
+    @property
+    def ingest_admission_queue_timeout_seconds(self) -> float:
+        """Longest a request waits for a slot before it is answered 503."""
+        return float(self._data.get("ingest_admission_queue_timeout_seconds", 1.0))
+
+    @property
+    def query_cache_ttl_seconds(self) -> float:
+        """Longest a cached list page or stats window is served; 0 disables the cache."""
+        return float(self._data.get("query_cache_ttl_seconds", 5.0))
+
+    @property
+    def query_cache_max_entries(self) -> int:
+        return int(self._data.get("query_cache_max_entries", 1024))
+
+    @property
+    def archive_dir(self) -> str | None:
+        """Directory for archive segments; unset disables the cold tier (and retention)."""
+        return self._data.get("archive_dir") or os.getenv("TALOS_ARCHIVE_DIR")
+
+    @property
+    def archive_segment_max_events(self) -> int:
+        return int(self._data.get("archive_segment_max_events", 100_000))
+
+    @property
+    def max_ingest_bytes(self) -> int:
+        """Largest ingest body accepted once Content-Encoding is undone."""
+        return int(self._data.get("max_ingest_bytes", 64 * 1024 * 1024))
+
+    @property
+    def recovery_max_queued_ingest(self) -> int:
+        """Ingest requests held while the tree recovers; more are answered 503."""
+        return int(self._data.get("recovery_max_queued_ingest", 10000))
+
+
+@cache
+def get_settings() -> AuditConfig:
+    """The process configuration, loaded and validated on first use only."""
+    return AuditConfig()
+
+
+def __getattr__(name: str):
+    # ``from src.config import settings`` keeps working, but importing this
+    # module no longer reads config files: workers pay for it once, when
+    # bootstrap first asks.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,184 @@
+"""
+Adaptive admission control for ingest.
+
+When the store slows down, every ingest request that is let in holds its
+event, its body and, for blocking stores, a thread, until the store
+catches up. Without a bound, latency and memory grow until the process
+fails. ``AdmissionController`` bounds the requests in flight with a limit
+that follows observed ingest latency (AIMD):
+
+- Each completion faster than ``target_latency`` raises the limit by
+  1/limit, about +1 per round of requests. The limit only grows while it
+  is actually in use.
+- A completion slower than the target multiplies the limit by ``backoff``.
+  This happens at most once per observed latency, so one slow burst counts
+  once rather than once per request.
+
+Requests over the limit wait in a short FIFO queue (``max_queue`` deep, for
+at most ``queue_timeout`` seconds). When the queue is full they are shed
+at once with ``OverloadedError`` (HTTP 429). When the wait times out they
+get ``UnavailableError`` (HTTP 503). Both carry a Retry-After estimate, so
+gateways back off instead of timing out.
+
+One controller serves one event loop. It is not thread-safe.
+"""
+
+import asyncio
+import collections
+import contextlib
+import math
+import time
+from collections.abc import AsyncIterator, Callable
+
+from typing_extensions import Self
+
+from src.core.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_LIMIT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_SHED,
+)
+from src.domain.errors import OverloadedError, UnavailableError
+
+
+class AdmissionController:
+    """AIMD in-flight limit with a bounded wait queue; see the module docstring."""
+
+    def __init__(
+        self,
+        min_limit: int = 4,
+        max_limit: int = 1024,
+        target_latency: float = 0.1,
+        max_queue: int = 256,
+        queue_timeout: float = 1.0,
+        backoff: float = 0.9,
+        initial_limit: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.backoff = backoff
+        self._clock = clock
+        self._limit = float(initial_limit or min(max_limit, max(min_limit, 64)))
+        self._in_flight = 0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+        self._no_decrease_until = 0.0
+        # Smoothed per-request latency, for Retry-After estimates.
+        self._latency = target_latency
+        self._update_gauges()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until the queue ahead of a new request has likely drained."""
+        backlog = self._in_flight + len(self._waiters)
+        return max(1, math.ceil(backlog * self._latency / max(self._limit, 1.0)))
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting briefly in the queue; raises when shed."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._update_gauges()
+            return
+        if len(self._waiters) >= self.max_queue:
+            ADMISSION_SHED.labels(reason="queue_full").inc()
+            raise OverloadedError("Ingest is over capacity", retry_after=self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        try:
+            # The slot is handed over by release(), already counted in _in_flight.
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            timed_out = isinstance(e, asyncio.TimeoutError)
+            if waiter.done():  # granted just as the wait ended
+                if timed_out:
+                    return
+                self.release()
+                raise
+            self._waiters.remove(waiter)
+            waiter.cancel()
+            self._update_gauges()
+            if not timed_out:  # the client went away
+                raise
+            ADMISSION_SHED.labels(reason="timeout").inc()
+            raise UnavailableError("Ingest queue wait timed out", retry_after=self.retry_after())
+
+    def release(self, latency: float | None = None) -> None:
+        """Free a slot; ``latency`` (seconds per event) adapts the limit."""
+        if latency is not None:
+            self._observe(latency)
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+        self._update_gauges()
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator["_Timer"]:
+        """
+        ``async with controller.slot() as timer:``. Time the part that depends
+        on the store with ``timer`` (``timer.per = n`` for a batch of n events).
+        The limit only adapts when something was timed.
+        """
+        await self.acquire()
+        timer = _Timer(self._clock)
+        try:
+            yield timer
+        finally:
+            self.release(timer.latency())
+
+    def _observe(self, latency: float) -> None:
+        self._latency += 0.2 * (latency - self._latency)
+        now = self._clock()
+        if latency > self.target_latency:
+            if now >= self._no_decrease_until:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                self._no_decrease_until = now + latency
+        elif self._in_flight >= self._limit / 2:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def _update_gauges(self) -> None:
+        ADMISSION_LIMIT.set(self.limit)
+        ADMISSION_IN_FLIGHT.set(self._in_flight)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters))
+
+
+class _Timer:
+    """Measures the store-bound part of a request, per event."""
+
+    __slots__ = ("_clock", "_elapsed", "_start", "per")
+
+    def __init__(self, clock: Callable[[], float]):
+        self._clock = clock
+        self._start: float | None = None
+        self._elapsed: float | None = None
+        self.per = 1
+
+    def __enter__(self) -> Self:
+        self._start = self._clock()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._elapsed = self._clock() - self._start
+
+    def latency(self) -> float | None:
+        if self._elapsed is None:
+            return None
+        return self._elapsed / max(self.per, 1)
@@ -2,6 +2,7 @@ import asyncio
 import logging
 from typing import AsyncGenerator, List
 from src.domain.models import Event
+from src.core.metrics import SSE_DROPPED_EVENTS
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,14 @@ class EventBroadcaster:
         self._lock = asyncio.Lock()  # Concurrency safety
         self._max_queue_size = max_queue_size
 
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def queue_depths(self) -> list[int]:
+        """Current backlog of each subscriber queue (for metrics)."""
+        return [queue.qsize() for queue in list(self._subscribers)]
+
     async def subscribe(self) -> AsyncGenerator[Event, None]:
         """
         Subscribe to the event stream. Yields events as they are broadcast.
@@ -60,4 +69,22 @@ class EventBroadcaster:
                 queue.put_nowait(event)
             except asyncio.QueueFull:
                 # Drop event for slow consumer (backpressure policy)
+                SSE_DROPPED_EVENTS.inc()
                 logger.warning(f"Subscriber queue full (size={self._max_queue_size}), dropping event")
+
+
+class ProofBroadcaster(EventBroadcaster):
+    """
+    SSE fan-out for proof-bearing event records (``/events?proofs=true``).
+
+    Separate from the plain event stream: these frames are emitted when a
+    root snapshot seals, not at ingest.
+    """
+
+    @property
+    def wants_proofs(self) -> bool:
+        return self.subscriber_count > 0
+
+    async def publish_proofs(self, records: list[dict]) -> None:
+        for record in records:
+            await self.publish(record)
@@ -0,0 +1,112 @@
+"""
+Prometheus metrics for the audit service.
+
+Defined in one place so the HTTP adapter, domain service, stores and
+broadcaster share a single registry entry per metric.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Sub-millisecond resolution: most ingest stages are hashing/JSON work.
+_FAST_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)  # fmt: skip
+
+AUDIT_INGEST_REQUESTS = Counter(
+    "audit_ingest_requests_total", "Total audit ingest requests received"
+)
+AUDIT_PERSIST_SUCCESS = Counter(
+    "audit_persist_success_total", "Total audit events successfully persisted"
+)
+AUDIT_PERSIST_FAILURE = Counter(
+    "audit_persist_failure_total", "Total audit events that failed to persist"
+)
+
+INGEST_STAGE_SECONDS = Histogram(
+    "audit_ingest_stage_seconds",
+    "Latency of each ingest_event stage",
+    ["stage"],
+    buckets=_FAST_BUCKETS,
+)
+INGEST_STAGES = (
+    "canonicalize", "verify_hash", "dedup", "store_append", "wal_append", "merkle_update",
+    "broadcast",
+)  # fmt: skip
+# Pre-bound children: .labels() does a dict lookup + lock per call.
+INGEST_STAGE = {stage: INGEST_STAGE_SECONDS.labels(stage=stage) for stage in INGEST_STAGES}
+
+STORE_QUERY_SECONDS = Histogram(
+    "audit_store_query_seconds",
+    "Latency of store read queries",
+    ["op"],
+    buckets=_FAST_BUCKETS,
+)
+
+STORE_READS = Counter(
+    "audit_store_reads_total", "Store reads by the node that served them", ["target"]
+)
+STORE_REPLICA_LAG_SECONDS = Gauge(
+    "audit_store_replica_lag_seconds", "Replay lag last observed on each read replica", ["replica"]
+)
+
+ARCHIVED_EVENTS = Counter(
+    "audit_archived_events_total", "Events moved from the store into archive segments"
+)
+ARCHIVE_SEGMENTS = Gauge("audit_archive_segments", "Archive segments (epochs) on disk")
+
+MERKLE_TREE_SIZE = Gauge("audit_merkle_tree_size", "Number of leaves in the Merkle tree")
+MERKLE_TREE_HEIGHT = Gauge("audit_merkle_tree_height", "Number of levels in the Merkle tree")
+STARTUP_RECOVERY_SECONDS = Gauge(
+    "audit_startup_recovery_seconds", "Duration of the last Merkle tree recovery from the store"
+)
+TREE_READY = Gauge("audit_tree_ready", "1 once the Merkle tree has been recovered from the store")
+RECOVERY_QUEUED_INGEST = Gauge(
+    "audit_recovery_queued_ingest", "Ingest requests waiting for Merkle tree recovery"
+)
+
+WAL_FSYNC_SECONDS = Histogram(
+    "audit_wal_fsync_seconds", "Duration of each write-ahead log fsync", buckets=_FAST_BUCKETS
+)
+WAL_FSYNC_RECORDS = Histogram(
+    "audit_wal_fsync_records",
+    "Records made durable by one write-ahead log fsync (group commit size)",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096),
+)
+WAL_UNSHIPPED = Gauge(
+    "audit_wal_unshipped_events", "Acknowledged events in the write-ahead log not yet in the store"
+)
+
+ADMISSION_LIMIT = Gauge("audit_ingest_admission_limit", "Current adaptive in-flight ingest limit")
+ADMISSION_IN_FLIGHT = Gauge("audit_ingest_in_flight", "Ingest requests admitted and not finished")
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "audit_ingest_queue_depth", "Ingest requests waiting for an admission slot"
+)
+ADMISSION_SHED = Counter(
+    "audit_ingest_shed_total",
+    "Ingest requests rejected by admission control (queue_full: 429, timeout: 503)",
+    ["reason"],
+)
+
+QUERY_CACHE_REQUESTS = Counter(
+    "audit_query_cache_requests_total",
+    "List/stats queries by how the cache answered them",
+    ["result"],
+)
+QUERY_CACHE_RESULT = {
+    result: QUERY_CACHE_REQUESTS.labels(result=result) for result in ("hit", "miss", "coalesced")
+}
+QUERY_CACHE_INVALIDATIONS = Counter(
+    "audit_query_cache_invalidations_total", "Cached query results dropped because of new events"
+)
+QUERY_CACHE_ENTRIES = Gauge("audit_query_cache_entries", "Query results held in the cache")
+
+SSE_SUBSCRIBERS = Gauge("audit_sse_subscribers", "Connected SSE subscribers")
+SSE_QUEUE_DEPTH = Gauge(
+    "audit_sse_queue_depth",
+    "Events buffered in SSE subscriber queues",
+    ["aggregate"],
+)
+SSE_DROPPED_EVENTS = Counter(
+    "audit_sse_dropped_events_total", "Events dropped for SSE subscribers whose queue was full"
+)
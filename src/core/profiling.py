@@ -0,0 +1,142 @@
+"""
+In-process profilers for live workers.
+
+- CPU: a wall-clock sampling profiler that walks ``sys._current_frames()``
+  every few milliseconds and emits collapsed stacks ("a;b;c 42"), the input
+  format of flamegraph.pl / speedscope / inferno.
+- Memory: tracemalloc snapshots before and after a window, reporting the top
+  allocation sites by growth.
+
+Both are scoped to the service's own modules (src/domain, src/adapters by
+default) so framework and event-loop frames don't drown out our hot spots.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+_SRC_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_SCOPE = (str(_SRC_DIR / "domain"), str(_SRC_DIR / "adapters"))
+
+# Only one profiling session per worker: overlapping samplers skew each other.
+_session_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profiling session is already running in this worker."""
+
+
+def _in_scope(filename: str, scope: Iterable[str]) -> bool:
+    return any(filename.startswith(prefix + os.sep) for prefix in scope)
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    try:
+        filename = os.path.relpath(filename, _SRC_DIR.parent)
+    except ValueError:  # different drive on Windows
+        pass
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Wall-clock stack sampler over all threads except its own."""
+
+    def __init__(self, interval: float = 0.005, scope: Iterable[str] = DEFAULT_SCOPE):
+        self.interval = interval
+        self.scope = tuple(scope)
+        self.samples = 0
+        self._stacks: Counter = Counter()
+
+    def _sample(self, own_thread: int) -> None:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            labels: list[str] = []
+            outermost_in_scope = -1  # labels are innermost-first
+            while frame is not None:
+                code = frame.f_code
+                if _in_scope(code.co_filename, self.scope):
+                    outermost_in_scope = len(labels)
+                labels.append(_frame_label(code))
+                frame = frame.f_back
+            if outermost_in_scope < 0:
+                continue
+            # Keep one caller frame for context, drop the server/event-loop prefix.
+            keep = labels[: outermost_in_scope + 2]
+            keep.reverse()
+            self._stacks[";".join(keep)] += 1
+        self.samples += 1
+
+    def run(self, seconds: float) -> None:
+        own_thread = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self._sample(own_thread)
+            time.sleep(self.interval)
+
+    def collapsed(self) -> str:
+        """Folded stacks, hottest first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+
+def profile_cpu(
+    seconds: float, interval: float = 0.005, scope: Iterable[str] = DEFAULT_SCOPE
+) -> str:
+    """Sample for ``seconds`` (blocking) and return collapsed stacks."""
+    if not _session_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profiling session is already running")
+    try:
+        profiler = SamplingProfiler(interval=interval, scope=scope)
+        profiler.run(seconds)
+        header = f"# samples={profiler.samples} interval={interval}s duration={seconds}s\n"
+        return header + profiler.collapsed()
+    finally:
+        _session_lock.release()
+
+
+def profile_memory(
+    seconds: float,
+    top: int = 25,
+    scope: Iterable[str] = DEFAULT_SCOPE,
+    frames: int = 16,
+) -> dict[str, object]:
+    """Diff tracemalloc snapshots across ``seconds`` (blocking); top growth sites."""
+    if not _session_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profiling session is already running")
+    started_tracing = not tracemalloc.is_tracing()
+    try:
+        if started_tracing:
+            tracemalloc.start(frames)
+        filters = [tracemalloc.Filter(True, f"{prefix}{os.sep}*") for prefix in scope]
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        time.sleep(seconds)
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        traced_current, traced_peak = tracemalloc.get_traced_memory()
+
+        stats = after.compare_to(before, "traceback")
+        return {
+            "duration_s": seconds,
+            "traced_current_bytes": traced_current,
+            "traced_peak_bytes": traced_peak,
+            "top": [_stat_entry(stat) for stat in stats[:top]],
+        }
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _session_lock.release()
+
+
+def _stat_entry(stat: tracemalloc.StatisticDiff) -> dict[str, object]:
+    return {
+        "size_bytes": stat.size,
+        "size_diff_bytes": stat.size_diff,
+        "count": stat.count,
+        "count_diff": stat.count_diff,
+        "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+    }
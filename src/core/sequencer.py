@@ -0,0 +1,401 @@
+"""
+Single-writer sequencer for multi-worker deployments.
+
+With ``uvicorn --workers N`` every process would otherwise own its own
+MerkleTree and compute a different root. Instead, one sequencer process owns
+leaf ordering: it runs the full AuditService (dedup, store append, Merkle
+update) while the HTTP workers do the CPU-heavy part of ingest (JSON parsing,
+validation, canonicalization, hash verification) and forward verified events
+over a local authenticated IPC channel (``multiprocessing.connection``).
+
+Committed events and their resulting root are pushed back to every worker, so
+each worker can fan them out to its own SSE subscribers and answer /root
+without a round trip.
+
+Wire protocol (pickled tuples):
+    ("commit", event, canonical) -> ("ok", IngestAck) | ("error", kind, message, retry_after)
+    ("commit_proof", event, canonical) -> ("ok", ProofReceipt) once the snapshot seals
+    ("root",)                    -> ("ok", root_hex)
+    ("proof", event_id)          -> ("ok", ProofView) | ("error", "NotFoundError", ...)
+    ("recovery",)                -> ("ok", RecoveryStatus)
+    ("subscribe",)               -> stream of ("event", event, root_hex)
+                                    and ("proofs", [record, ...], None)
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import queue
+import socket
+import threading
+from collections.abc import Callable, Iterator
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any
+
+from src.domain.errors import (
+    ConflictError,
+    DomainError,
+    NotFoundError,
+    OverloadedError,
+    UnavailableError,
+    ValidationError,
+)
+from src.domain.models import (
+    ConsistencyProof,
+    Event,
+    IngestAck,
+    ProofReceipt,
+    ProofView,
+    RecoveryStatus,
+    RootView,
+)
+from src.domain.services import AuditService
+
+logger = logging.getLogger("audit-sequencer")
+
+_ERRORS = {
+    "ValidationError": ValidationError,
+    "ConflictError": ConflictError,
+    "NotFoundError": NotFoundError,
+    "UnavailableError": UnavailableError,
+    "OverloadedError": OverloadedError,
+}
+
+
+def default_address() -> str:
+    """Unix socket path unique to the launching process."""
+    return os.path.join("/tmp", f"talos-audit-sequencer-{os.getpid()}.sock")
+
+
+class SequencerPublisher:
+    """
+    Broadcaster used inside the sequencer: pushes each committed event, with
+    the root it produced, to every subscribed worker.
+
+    Each subscriber has a bounded queue drained by its own sender thread so a
+    slow worker never stalls the writer (events are dropped, like SSE).
+    """
+
+    def __init__(self, root_provider: Callable[[], str], max_queue_size: int = 10000):
+        self._root_provider = root_provider
+        self._max_queue_size = max_queue_size
+        self._subscribers: list[queue.Queue] = []
+        self._lock = threading.Lock()
+
+    def add_subscriber(self, conn: Connection) -> None:
+        outbox: queue.Queue = queue.Queue(maxsize=self._max_queue_size)
+        with self._lock:
+            self._subscribers.append(outbox)
+        try:
+            while True:
+                conn.send(outbox.get())
+        except (EOFError, OSError):
+            pass
+        finally:
+            with self._lock:
+                self._subscribers.remove(outbox)
+
+    async def publish(self, event: Event) -> None:
+        # Called right after the Merkle update, before any await, so the root
+        # read here is the one this event produced.
+        self._send(("event", event, self._root_provider()))
+
+    @property
+    def wants_proofs(self) -> bool:
+        # Workers decide locally whether anyone streams proofs.
+        return bool(self._subscribers)
+
+    async def publish_proofs(self, records: list[dict]) -> None:
+        self._send(("proofs", records, None))
+
+    def stored(self, event: Event) -> None:
+        """WAL ship listener: the store now holds ``event``; workers drop cached reads."""
+        self._send(("stored", event, None))
+
+    def _send(self, message: tuple[Any, ...]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for outbox in subscribers:
+            try:
+                outbox.put_nowait(message)
+            except queue.Full:
+                logger.warning("Worker relay queue full, dropping event")
+
+
+class SequencerServer:
+    """Owns the authoritative AuditService and serves worker requests."""
+
+    def __init__(
+        self, service: AuditService, publisher: SequencerPublisher, address: str, authkey: bytes
+    ):
+        self._service = service
+        self._publisher = publisher
+        self._address = address
+        self._authkey = authkey
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listener: Listener | None = None
+        self._closed = False
+
+    def start(self) -> None:
+        """Bind the socket and start the writer loop."""
+        if os.path.exists(self._address):
+            os.unlink(self._address)
+        self._listener = Listener(self._address, authkey=self._authkey)
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=self._loop.run_forever, name="sequencer-writer", daemon=True
+        ).start()
+        if self._service.snapshots is not None:
+            asyncio.run_coroutine_threadsafe(self._service.snapshots.run_periodic(), self._loop)
+        if self._service.retention is not None:
+            asyncio.run_coroutine_threadsafe(self._service.retention.run_periodic(), self._loop)
+        logger.info(f"🧭 Sequencer listening on {self._address}")
+
+    def serve_forever(self) -> None:
+        """Accept worker connections until shutdown() (blocking)."""
+        if self._listener is None:
+            self.start()
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, AuthenticationError) as e:
+                # Failed handshake (bad authkey), aborted connect, or shutdown.
+                if not self._closed:
+                    logger.warning(f"Rejected sequencer connection: {e}")
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def shutdown(self) -> None:
+        self._closed = True
+        if self._listener is not None:
+            # Wake a blocked accept(); the aborted handshake ends the loop.
+            with contextlib.suppress(OSError), socket.socket(socket.AF_UNIX) as sock:
+                sock.connect(self._address)
+            self._listener.close()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _handle(self, conn: Connection) -> None:
+        try:
+            while True:
+                request = conn.recv()
+                if request[0] == "subscribe":
+                    self._publisher.add_subscriber(conn)
+                    return
+                conn.send(self._dispatch(request))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+    def _dispatch(self, request: tuple[Any, ...]) -> tuple[Any, ...]:
+        op = request[0]
+        if op == "recovery":
+            # Answered off the writer loop, so /ready works while recovery holds it.
+            return ("ok", self._service.recovery_status())
+        try:
+            if op == "commit":
+                _, event, canonical = request
+                result = self._service.commit_verified(event, canonical)
+            elif op == "commit_proof":
+                _, event, canonical = request
+                result = self._service.commit_with_proof(event, canonical)
+            elif op == "root":
+                result = _call(lambda: self._service.get_root().root)
+            elif op == "proof":
+                result = _call(self._service.get_proof, request[1])
+            elif op == "consistency":
+                _, first_size, second_size = request
+                result = _call(self._service.get_consistency_proof, first_size, second_size)
+            else:
+                return ("error", "DomainError", f"Unknown sequencer op {op!r}", None)
+            # Everything, reads included, runs on the writer loop: that loop is
+            # the single point that assigns leaf indices, and proofs never see
+            # a half-applied append.
+            return ("ok", asyncio.run_coroutine_threadsafe(result, self._loop).result())
+        except DomainError as e:
+            # Busy/recovering answers carry their Retry-After to the worker.
+            return ("error", type(e).__name__, str(e), getattr(e, "retry_after", None))
+        except Exception as e:
+            logger.error(f"Sequencer {op} failed: {e}")
+            return ("error", "DomainError", str(e), None)
+
+
+async def _call(fn: Callable[..., Any], *args: Any) -> Any:
+    return fn(*args)
+
+
+class SequencerClient:
+    """Thread-safe worker-side client; keeps a small pool of connections."""
+
+    def __init__(self, address: str, authkey: bytes):
+        self._address = address
+        self._authkey = authkey
+        self._pool: queue.LifoQueue[Connection] = queue.LifoQueue()
+
+    def _call(self, *request: Any) -> Any:
+        try:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = Client(self._address, authkey=self._authkey)
+            conn.send(request)
+            reply = conn.recv()
+        except (EOFError, OSError) as e:
+            raise UnavailableError(f"Sequencer unavailable: {e}") from e
+        self._pool.put(conn)
+        if reply[0] == "error":
+            _, kind, message, retry_after = reply
+            error = _ERRORS.get(kind, DomainError)
+            if issubclass(error, UnavailableError):
+                raise error(message, retry_after=retry_after or 1)
+            raise error(message)
+        return reply[1]
+
+    def commit(self, event: Event, canonical: bytes) -> IngestAck:
+        return self._call("commit", event, canonical)
+
+    def commit_proof(self, event: Event, canonical: bytes) -> ProofReceipt:
+        return self._call("commit_proof", event, canonical)
+
+    def root(self) -> str:
+        return self._call("root")
+
+    def proof(self, event_id: str) -> ProofView:
+        return self._call("proof", event_id)
+
+    def consistency(self, first_size: int, second_size: int) -> ConsistencyProof:
+        return self._call("consistency", first_size, second_size)
+
+    def recovery_status(self) -> RecoveryStatus:
+        return self._call("recovery")
+
+    def subscribe(self) -> Iterator[tuple[str, Any, Any]]:
+        """Blocking iterator over relay messages: ("event", ...), ("stored", ...), ("proofs", ...)."""
+        conn = Client(self._address, authkey=self._authkey)
+        try:
+            conn.send(("subscribe",))
+            while True:
+                yield conn.recv()
+        finally:
+            conn.close()
+
+
+class RemoteMerkleTree:
+    """Read-only view of the sequencer's tree for worker processes."""
+
+    def __init__(self, client: SequencerClient):
+        self._client = client
+        self.cached_root: str | None = None
+
+    def get_root(self) -> RootView:
+        if self.cached_root is None:
+            self.cached_root = self._client.root()
+        return RootView(root=self.cached_root)
+
+    def get_proof(self, event_id: str) -> ProofView:
+        # Same contract as MerkleTree.get_proof: index -1 when not anchored.
+        try:
+            return self._client.proof(event_id)
+        except NotFoundError:
+            return ProofView(event_id=event_id, entry_hash="", root="", height=0, path=[], index=-1)
+
+
+class SequencedAuditService(AuditService):
+    """
+    AuditService for HTTP workers: verifies locally, commits via the sequencer.
+
+    Reads (list/export) go to the worker's own connection to the shared store.
+    """
+
+    def __init__(
+        self,
+        client: SequencerClient,
+        store: Any,
+        clock: Any,
+        id_gen: Any,
+        broadcaster: Any = None,
+        snapshots: Any = None,
+        cold_tier: Any = None,
+        query_cache: Any = None,
+    ):
+        self._client = client
+        super().__init__(
+            store=store,
+            merkle_tree=RemoteMerkleTree(client),  # type: ignore[arg-type]
+            clock=clock,
+            id_gen=id_gen,
+            broadcaster=broadcaster,
+            snapshots=snapshots,  # read-only here: the sequencer seals
+            cold_tier=cold_tier,  # archive reads; the sequencer runs retention
+            query_cache=query_cache,  # invalidated by the relay, for every worker's commits
+        )
+
+    def _initialize_tree(self):
+        """The sequencer owns recovery; workers start empty."""
+
+    def recovery_status(self) -> RecoveryStatus:
+        """The sequencer's recovery: a worker is ready only once the sequencer is."""
+        try:
+            return self._client.recovery_status()
+        except UnavailableError as e:
+            return RecoveryStatus(state="pending", error=str(e))
+
+    def get_proof(self, event_id: str) -> ProofView:
+        return self._client.proof(event_id)
+
+    def get_consistency_proof(self, first_size: int, second_size: int) -> ConsistencyProof:
+        return self._client.consistency(first_size, second_size)
+
+    async def commit_verified(self, event: Event, canonical: bytes) -> IngestAck:
+        ack = await asyncio.to_thread(self._client.commit, event, canonical)
+        self._merkle_tree.cached_root = ack.root  # type: ignore[attr-defined]
+        self.invalidate_queries(event)
+        return ack
+
+    async def commit_with_proof(self, event: Event, canonical: bytes) -> ProofReceipt:
+        return await asyncio.to_thread(self._client.commit_proof, event, canonical)
+
+    def start_event_relay(
+        self, loop: asyncio.AbstractEventLoop, proof_broadcaster: Any = None
+    ) -> threading.Thread:
+        """Fan committed events (from any worker) out to this worker's SSE clients."""
+
+        def relay():
+            while True:
+                try:
+                    for kind, payload, root in self._client.subscribe():
+                        if kind == "proofs":
+                            if proof_broadcaster is not None and proof_broadcaster.wants_proofs:
+                                asyncio.run_coroutine_threadsafe(
+                                    proof_broadcaster.publish_proofs(payload), loop
+                                )
+                            continue
+                        if kind == "stored":
+                            self.invalidate_queries(payload)
+                            continue
+                        self._merkle_tree.cached_root = root  # type: ignore[attr-defined]
+                        self.invalidate_queries(payload)
+                        if self._broadcaster:
+                            asyncio.run_coroutine_threadsafe(
+                                self._broadcaster.publish(payload), loop
+                            )
+                except (EOFError, OSError) as e:
+                    logger.warning(f"Sequencer relay disconnected ({e}); reconnecting")
+                    threading.Event().wait(1.0)
+
+        thread = threading.Thread(target=relay, name="sequencer-relay", daemon=True)
+        thread.start()
+        return thread
+
+
+def run_sequencer(address: str, authkey: bytes) -> None:
+    """Process entry point: bootstrap the authoritative service and serve."""
+    from src.bootstrap import bootstrap
+
+    container = bootstrap(role="sequencer")
+    SequencerServer(
+        container.resolve(AuditService), container.resolve(SequencerPublisher), address, authkey
+    ).serve_forever()
@@ -0,0 +1,115 @@
+import math
+from hashlib import blake2b
+
+
+def _digest(key: str) -> tuple[int, int]:
+    """Two independent 64-bit hashes of key for Kirsch-Mitzenmacher double hashing."""
+    d = blake2b(key.encode("utf-8"), digest_size=16).digest()
+    # h2 is forced odd so successive probes never collapse onto one bit.
+    return int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little") | 1
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter sized for a target false-positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, h1: int, h2: int):
+        m = self.num_bits
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % m
+
+    def add_hashed(self, h1: int, h2: int) -> None:
+        bits = self._bits
+        for pos in self._positions(h1, h2):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def contains_hashed(self, h1: int, h2: int) -> bool:
+        bits = self._bits
+        for pos in self._positions(h1, h2):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add(self, key: str) -> None:
+        self.add_hashed(*_digest(key))
+
+    def might_contain(self, key: str) -> bool:
+        return self.contains_hashed(*_digest(key))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int, error_rate: float, count: int) -> "BloomFilter":
+        """Rebuild a filter saved with to_bytes (same capacity and error_rate)."""
+        bloom = cls(capacity, error_rate)
+        if len(data) != len(bloom._bits):
+            raise ValueError("Bloom filter size does not match its parameters")
+        bloom._bits = bytearray(data)
+        bloom.count = count
+        return bloom
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows without exceeding its overall false-positive rate.
+
+    When the active filter reaches capacity a new one is stacked on top with
+    ``growth`` times the capacity and a ``tightening`` times smaller error rate
+    (Almeida et al., 2007), so the compound rate stays below ``error_rate``
+    however many ids are added. Never returns a false negative.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 100_000,
+        error_rate: float = 0.001,
+        growth: int = 2,
+        tightening: float = 0.8,
+    ):
+        self.error_rate = error_rate
+        self._growth = growth
+        self._tightening = tightening
+        self._filters: list[BloomFilter] = [
+            BloomFilter(initial_capacity, error_rate * (1 - tightening))
+        ]
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self._filters)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.might_contain(key)
+
+    def add(self, key: str) -> None:
+        active = self._filters[-1]
+        if active.count >= active.capacity:
+            active = BloomFilter(
+                active.capacity * self._growth, active.error_rate * self._tightening
+            )
+            self._filters.append(active)
+        active.add_hashed(*_digest(key))
+
+    def might_contain(self, key: str) -> bool:
+        """False means key was definitely never added."""
+        h1, h2 = _digest(key)
+        return any(f.contains_hashed(h1, h2) for f in reversed(self._filters))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(f.nbytes for f in self._filters)
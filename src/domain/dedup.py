@@ -0,0 +1,72 @@
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from src.domain.bloom import ScalableBloomFilter
+from src.domain.merkle import MerkleTree
+from src.ports.common import IEventIndexPort
+
+logger = logging.getLogger("audit-domain")
+
+
+class DuplicateDetector:
+    """
+    Layered duplicate check for ingest idempotency.
+
+    1. Bloom filter over every known event_id: a miss means definitely new (O(1)).
+    2. Merkle tree index: confirms duplicates among in-memory events.
+    3. Store index (IEventIndexPort): settles the remaining possible
+       duplicates for history that is no longer held in memory.
+    4. Archive (ColdTier): events retention moved out of the store.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        merkle_tree: MerkleTree,
+        bloom: ScalableBloomFilter | None = None,
+        cold_tier: Any = None,
+    ):
+        self._store = store
+        self._merkle_tree = merkle_tree
+        self._bloom = bloom if bloom is not None else ScalableBloomFilter()
+        self._cold_tier = cold_tier
+        self.false_positives = 0
+
+    def seed(self, event_ids: Iterable[str]) -> int:
+        """Load historical event ids into the filter; returns how many were added."""
+        count = 0
+        for event_id in event_ids:
+            self._bloom.add(event_id)
+            count += 1
+        return count
+
+    def seed_from_store(self, loaded_events: Iterable[Any]) -> int:
+        """
+        Seed from the store's full id index when it has one, otherwise from the
+        events already loaded into the tree (which is then all there is).
+        """
+        if isinstance(self._store, IEventIndexPort):
+            count = self.seed(self._store.iter_event_ids())
+        else:
+            count = self.seed(e.event_id for e in loaded_events)
+        if self._cold_tier is not None:
+            count += self.seed(self._cold_tier.iter_event_ids())
+        logger.info(f"🧮 Duplicate filter seeded with {count} event ids")
+        return count
+
+    def is_duplicate(self, event_id: str) -> bool:
+        if not self._bloom.might_contain(event_id):
+            return False
+        if self._merkle_tree.has_event(event_id):
+            return True
+        if isinstance(self._store, IEventIndexPort) and self._store.exists(event_id):
+            return True
+        if self._cold_tier is not None and self._cold_tier.contains(event_id):
+            return True
+        self.false_positives += 1
+        return False
+
+    def record(self, event_id: str) -> None:
+        """Remember an event_id once it has been persisted."""
+        self._bloom.add(event_id)
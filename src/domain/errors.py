@@ -20,3 +20,15 @@ class ConflictError(DomainError):
     """Raised when there is a conflict (e.g., duplicate ID)."""
 
     pass
+
+
+class UnavailableError(DomainError):
+    """Raised when the service cannot serve a request yet (e.g. tree recovery in progress)."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OverloadedError(UnavailableError):
+    """Raised when a request is shed because the service is over capacity."""
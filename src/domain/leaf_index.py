@@ -0,0 +1,139 @@
+import sys
+from array import array
+
+_KEY_SIZE = 16
+_MAX_LOAD = 0.7
+_EMPTY_KEY = bytes(_KEY_SIZE)
+_MAX_LEAVES = (1 << 32) - 1
+
+
+def uuid_key(event_id: str) -> bytes | None:
+    """
+    Return the 16-byte binary form of a canonical (lowercase, hyphenated) UUID.
+
+    Any other id shape returns None so it can be stored verbatim; this keeps
+    lookups exact (e.g. an upper-case UUID is a different event id).
+    """
+    if len(event_id) != 36 or event_id[8:24:5] != "----":
+        return None
+    digits = event_id.replace("-", "")
+    try:
+        key = bytes.fromhex(digits)
+    except ValueError:
+        return None
+    # fromhex() tolerates upper case and whitespace; require the canonical form.
+    if key.hex() != digits:
+        return None
+    # The nil UUID doubles as the placeholder for non-UUID leaves.
+    if key == _EMPTY_KEY:
+        return None
+    return key
+
+
+class LeafIndex:
+    """
+    Compact event_id -> leaf index map for the Merkle tree.
+
+    Leaf indices are dense (0..N-1), so the key for leaf ``i`` is stored at
+    offset ``16 * i`` of a single bytearray and the open-addressing table only
+    holds ``leaf + 1`` (0 marks an empty slot) in a 32-bit array. That is
+    ~16 + 4 / load bytes per UUID event versus ~150 bytes for a dict of str.
+    Non-UUID ids fall back to a small dict. An id appended twice maps to its
+    latest leaf, as with a plain dict.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._capacity = capacity
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, event_id: object) -> bool:
+        return isinstance(event_id, str) and self.get(event_id) is not None
+
+    def clear(self) -> None:
+        self._keys = bytearray()
+        self._size = 0
+        self._uuid_count = 0
+        self._other: dict[str, int] = {}
+        self._bits = max(4, (max(self._capacity, 1) - 1).bit_length())
+        self._table = _new_table(self._bits)
+
+    def append(self, event_id: str) -> int:
+        """Record event_id as the next leaf and return its index."""
+        index = self._size
+        if index >= _MAX_LEAVES:
+            raise OverflowError("LeafIndex supports at most 2^32 - 1 leaves")
+        key = uuid_key(event_id)
+        if key is None:
+            self._other[event_id] = index
+            self._keys += _EMPTY_KEY
+        else:
+            if self._uuid_count + 1 > _MAX_LOAD * len(self._table):
+                self._grow()
+            self._keys += key
+            if self._insert(key, index):
+                self._uuid_count += 1
+        self._size += 1
+        return index
+
+    def get(self, event_id: str) -> int | None:
+        """Return the leaf index for event_id, or None if it is not indexed."""
+        key = uuid_key(event_id)
+        if key is None:
+            return self._other.get(event_id)
+
+        table = self._table
+        keys = self._keys
+        mask = len(table) - 1
+        slot = self._slot(key)
+        while True:
+            entry = table[slot]
+            if entry == 0:
+                return None
+            offset = (entry - 1) * _KEY_SIZE
+            if keys[offset : offset + _KEY_SIZE] == key:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def nbytes(self) -> int:
+        """Approximate heap footprint of the index buffers."""
+        other = sys.getsizeof(self._other) + sum(sys.getsizeof(k) for k in self._other)
+        return len(self._keys) + self._table.itemsize * len(self._table) + other
+
+    def _slot(self, key: bytes) -> int:
+        # The table never leaves the process, so the (seeded) builtin hash is
+        # fine and spreads time-ordered v1/v7 UUIDs as well as random v4 ones.
+        return hash(key) & ((1 << self._bits) - 1)
+
+    def _insert(self, key: bytes, index: int) -> bool:
+        """Point key at index; returns False if it only replaced an earlier leaf."""
+        table = self._table
+        keys = self._keys
+        mask = len(table) - 1
+        slot = self._slot(key)
+        while True:
+            entry = table[slot]
+            if entry == 0:
+                table[slot] = index + 1
+                return True
+            offset = (entry - 1) * _KEY_SIZE
+            if keys[offset : offset + _KEY_SIZE] == key:
+                table[slot] = index + 1
+                return False
+            slot = (slot + 1) & mask
+
+    def _grow(self) -> None:
+        self._bits += 1
+        self._table = _new_table(self._bits)
+        keys = self._keys
+        for index in range(self._size):
+            offset = index * _KEY_SIZE
+            key = bytes(keys[offset : offset + _KEY_SIZE])
+            if key != _EMPTY_KEY:
+                self._insert(key, index)
+
+
+def _new_table(bits: int) -> array:
+    return array("I", bytes(4 << bits))
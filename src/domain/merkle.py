@@ -1,6 +1,18 @@
-from typing import List, Dict, Any
+from collections.abc import Iterable
+from typing import Any, List
+
 from talos_sdk.ports.hash import IHashPort
-from src.domain.models import Event, RootView, ProofView, ProofStep
+
+from src.domain.leaf_index import LeafIndex
+from src.domain.models import (
+    ConsistencyProof,
+    Event,
+    ProofNode,
+    ProofStep,
+    ProofView,
+    RootView,
+    as_event,
+)
 
 
 class MerkleTree:
@@ -13,53 +25,47 @@ class MerkleTree:
         self._hash_port = hash_port
         self._leaves: List[bytes] = []
         self._tree: List[List[bytes]] = []
-        self._event_id_to_index: Dict[str, int] = {}
+        self._event_id_to_index = LeafIndex()
+
+    def add_leaf(self, event: Event, canonical: bytes | None = None) -> int:
+        """
+        Add an event to the tree and return its index.
 
-    def add_leaf(self, event: Event) -> int:
-        """Add an event to the tree and return its index."""
-        data_bytes = str(event).encode("utf-8")
+        Callers that already hold the canonical encoding (ingest verifies the
+        hash over it) pass it in to skip re-canonicalizing the event.
+        """
+        data_bytes = canonical if canonical is not None else str(event).encode("utf-8")
         leaf_hash = self._hash_port.sha256(data_bytes)
 
-        index = len(self._leaves)
+        index = self._event_id_to_index.append(event.event_id)
         self._leaves.append(leaf_hash)
-        self._event_id_to_index[event.event_id] = index
-        self._rebuild()
+        self._update_path(index)
         return index
 
     def initialize_from_events(self, events: List[Any]):
         """Efficiently initialize tree from a list of historical events."""
         self._leaves = []
-        self._event_id_to_index = {}
-        
-        for i, event in enumerate(events):
-            # Re-wrap if it's a DB row object
-            if not isinstance(event, Event):
-                # Minimal hydration for hashing
-                from src.domain.models import Event as DomainEvent
-                hydrate = DomainEvent(
-                    schema_id=getattr(event, "schema_id", "talos.audit_event"),
-                    schema_version=getattr(event, "schema_version", "v1"),
-                    event_id=getattr(event, "event_id"),
-                    ts=getattr(event, "ts", "0"),
-                    request_id=getattr(event, "request_id", "0"),
-                    surface_id=getattr(event, "surface_id", "n/a"),
-                    outcome=getattr(event, "outcome", "OK"),
-                    principal=getattr(event, "principal", {}),
-                    http=getattr(event, "http", {}),
-                    meta=getattr(event, "meta", {}),
-                    resource=getattr(event, "resource", None),
-                    event_hash=getattr(event, "event_hash", ""),
-                )
-                data_bytes = str(hydrate).encode("utf-8")
-            else:
-                data_bytes = str(event).encode("utf-8")
-                
-            leaf_hash = self._hash_port.sha256(data_bytes)
-            self._leaves.append(leaf_hash)
-            self._event_id_to_index[getattr(event, "event_id")] = i
+        self._event_id_to_index.clear()
+
+        for event in events:
+            self._leaves.append(self.leaf_hash(event))
+            self._event_id_to_index.append(event.event_id)
             
         self._rebuild()
 
+    def leaf_hash(self, event: Any) -> bytes:
+        """Leaf hash of an event or stored row."""
+        # DB row objects are re-wrapped into the Event they were hashed as.
+        return self._hash_port.sha256(str(as_event(event)).encode("utf-8"))
+
+    def initialize_from_leaves(self, event_ids: Iterable[str], leaves: Iterable[bytes]):
+        """Initialize from precomputed leaf hashes (e.g. an archive segment)."""
+        self._leaves = list(leaves)
+        self._event_id_to_index.clear()
+        for event_id in event_ids:
+            self._event_id_to_index.append(event_id)
+        self._rebuild()
+
     def _rebuild(self):
         """Build the full tree levels from leaves."""
         if not self._leaves:
@@ -79,19 +85,75 @@ class MerkleTree:
             current_level = next_level
             self._tree.append(current_level)
 
+    def _update_path(self, index: int):
+        """
+        Recompute only the ancestors of a newly appended leaf: O(log N) hashes
+        instead of rebuilding every level. Produces the same levels as _rebuild.
+        """
+        if not self._tree:
+            self._tree = [self._leaves]
+
+        level_index = 0
+        current_index = index
+        while len(self._tree[level_index]) > 1:
+            level = self._tree[level_index]
+            parent_index = current_index // 2
+            left = level[2 * parent_index]
+            right = level[2 * parent_index + 1] if 2 * parent_index + 1 < len(level) else left
+            parent_hash = self._hash_port.sha256(left + right)
+
+            if level_index + 1 == len(self._tree):
+                self._tree.append([])
+            parent_level = self._tree[level_index + 1]
+            if parent_index < len(parent_level):
+                parent_level[parent_index] = parent_hash
+            else:
+                parent_level.append(parent_hash)
+
+            current_index = parent_index
+            level_index += 1
+
+    @property
+    def size(self) -> int:
+        return len(self._leaves)
+
+    @property
+    def height(self) -> int:
+        return len(self._tree)
+
     def get_root(self) -> RootView:
         """Return the Merkle Root."""
         if not self._tree:
             return RootView(root="")
         return RootView(root=self._tree[-1][0].hex())
 
+    def root_at(self, size: int) -> str:
+        """Root the tree had when it held its first ``size`` leaves."""
+        if not 0 < size <= self.size:
+            raise ValueError(f"Need 0 < size <= {self.size}, got {size}")
+        # Fold the complete aligned subtrees of the first tree bottom-up; a
+        # partial node with nothing to its left pairs with itself, as in _rebuild.
+        top = size.bit_length() - 1
+        partial = None
+        for level in range(top + 1):
+            full = None
+            if size >> level & 1:
+                full = self._tree[level][(size >> level) - 1]
+            if level == top and partial is None:
+                return full.hex()
+            if full is not None:
+                partial = self._hash_port.sha256(full + (partial if partial is not None else full))
+            elif partial is not None:
+                partial = self._hash_port.sha256(partial + partial)
+        return partial.hex()
+
     def get_proof(self, event_id: str) -> ProofView:
         """Generate Merkle Proof for an event matching Wiki spec."""
-        if event_id not in self._event_id_to_index:
+        index = self._event_id_to_index.get(event_id)
+        if index is None:
             # This should ideally be handled by service
             return ProofView(event_id=event_id, entry_hash="", root="", height=0, path=[], index=-1)
 
-        index = self._event_id_to_index[event_id]
         entry_hash = self._leaves[index].hex()
         path = []
 
@@ -119,5 +181,73 @@ class MerkleTree:
             index=index,
         )
 
+    def get_proofs(self, indices: Iterable[int]) -> list[tuple[str, list[ProofStep]]]:
+        """
+        (entry_hash, path) for many leaves against the current root.
+
+        Leaves sealed together are mostly neighbours, so their upper-level
+        steps coincide: each (level, node) step is built once per batch.
+        """
+        steps: dict[tuple[int, int], ProofStep] = {}
+        proofs = []
+        for index in indices:
+            path = []
+            current_index = index
+            for level_index in range(len(self._tree) - 1):
+                step = steps.get((level_index, current_index))
+                if step is None:
+                    level = self._tree[level_index]
+                    is_right = current_index % 2 == 1
+                    sibling_index = current_index - 1 if is_right else current_index + 1
+                    if sibling_index >= len(level):
+                        sibling_index = current_index
+                    step = ProofStep(
+                        position="left" if is_right else "right", hash=level[sibling_index].hex()
+                    )
+                    steps[(level_index, current_index)] = step
+                path.append(step)
+                current_index //= 2
+            proofs.append((self._leaves[index].hex(), path))
+        return proofs
+
+    def get_consistency_proof(self, first_size: int, second_size: int) -> ConsistencyProof:
+        """
+        Consistency proof between two sizes of this tree (second_size <= size).
+
+        A complete, aligned subtree's root never changes as leaves are
+        appended, so every node needed is still in the current levels.
+        """
+        if not 0 < first_size <= second_size <= self.size:
+            raise ValueError(
+                f"Need 0 < first_size <= second_size <= {self.size}, "
+                f"got {first_size} and {second_size}"
+            )
+
+        def node(level: int, start: int) -> ProofNode:
+            return ProofNode(level=level, hash=self._tree[level][start >> level].hex())
+
+        frontier = []
+        start = 0
+        for level in reversed(range(first_size.bit_length())):
+            if first_size >> level & 1:
+                frontier.append(node(level, start))
+                start += 1 << level
+
+        extension = []
+        while start < second_size:
+            # Largest aligned subtree that starts here and fits.
+            level = (start & -start).bit_length() - 1
+            while start + (1 << level) > second_size:
+                level -= 1
+            extension.append(node(level, start))
+            start += 1 << level
+
+        return ConsistencyProof(
+            first_size=first_size, second_size=second_size, frontier=frontier, extension=extension
+        )
+
     def has_event(self, event_id: str) -> bool:
         return event_id in self._event_id_to_index
+
+    def index_of(self, event_id: str) -> int | None:
+        return self._event_id_to_index.get(event_id)
@@ -1,5 +1,9 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
 from pydantic import BaseModel, ConfigDict
-from typing import Dict, Any, List, Optional
 
 
 class Event(BaseModel):
@@ -21,21 +25,201 @@ class Event(BaseModel):
 
     def __str__(self):
         # Canonical string representation for hashing (RFC 8785)
-        import json
-
         clean = self.model_dump(exclude={"event_hash", "hashes"})
         return json.dumps(clean, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
+def as_event(event: Any) -> Event:
+    """Hydrate a store row (e.g. a Postgres EventRow) into the domain Event it hashes as."""
+    if isinstance(event, Event):
+        return event
+    return Event(
+        schema_id=getattr(event, "schema_id", "talos.audit_event"),
+        schema_version=getattr(event, "schema_version", "v1"),
+        event_id=event.event_id,
+        ts=getattr(event, "ts", "0"),
+        request_id=getattr(event, "request_id", "0"),
+        surface_id=getattr(event, "surface_id", "n/a"),
+        outcome=getattr(event, "outcome", "OK"),
+        principal=getattr(event, "principal", {}),
+        http=getattr(event, "http", {}),
+        meta=getattr(event, "meta", {}),
+        resource=getattr(event, "resource", None),
+        event_hash=getattr(event, "event_hash", ""),
+    )
+
+
+def event_timestamp(event: Any) -> float:
+    """Unix seconds of an event: the store's ``timestamp`` column, else parsed from ``ts``."""
+    timestamp = getattr(event, "timestamp", None)
+    if timestamp is not None:
+        return float(timestamp)
+    try:
+        ts = str(getattr(event, "ts", "")).replace("Z", "+00:00")
+        return datetime.fromisoformat(ts).timestamp()
+    except ValueError:
+        return 0.0
+
+
+# Store order: whole-second timestamp, then event_id. Cursors encode a key.
+Key = tuple[int, str]
+
+
+def event_key(event: Any) -> Key:
+    return int(event_timestamp(event)), event.event_id
+
+
+def encode_cursor(key: Key) -> str:
+    """Cursor for a key: base64url of ``"<ts>:<event_id>"``, as the Postgres store derives it."""
+    return base64.urlsafe_b64encode(f"{key[0]}:{key[1]}".encode()).decode().rstrip("=")
+
+
+def decode_key(cursor: str) -> Key:
+    payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    ts, sep, event_id = payload.partition(":")
+    if not sep:
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    return int(ts), event_id
+
+
+# Equality filters accepted by list pages and exports.
+FILTER_FIELDS = ("principal_id", "outcome", "session_id", "correlation_id")
+
+
+def field_value(event: Any, field: str) -> str | None:
+    """An event's value for a filter field, derived as the Postgres adapter flattens it."""
+    meta = getattr(event, "meta", None) or {}
+    if field == "principal_id":
+        principal = getattr(event, "principal", None) or {}
+        return principal.get("principal_id") or principal.get("id")
+    if field == "outcome":
+        return getattr(event, "outcome", None)
+    value = getattr(event, field, None) or meta.get(field)
+    if field == "correlation_id":
+        value = value or getattr(event, "request_id", None)
+    return value
+
+
+class EventPage:
+    """A page of events, oldest first; ``next_cursor`` continues strictly before it."""
+
+    def __init__(self, events: list[Any], next_cursor: str | None, has_more: bool = False):
+        self.events = events
+        self.next_cursor = next_cursor
+        self.has_more = has_more
+
+
 class RootView(BaseModel):
     root: str
 
 
+class RecoveryStatus(BaseModel):
+    """Progress of the startup rebuild of the Merkle tree from the store."""
+
+    state: Literal["pending", "scheduled", "loading", "building", "ready", "failed"]
+    events_loaded: int = 0
+    seconds: float | None = None
+    queued_ingest: int = 0
+    error: str | None = None
+
+
+class RootSnapshot(BaseModel):
+    """Signed tree head: the root of the first ``tree_size`` leaves at ``timestamp``."""
+
+    model_config = ConfigDict(frozen=True)
+
+    tree_size: int
+    root: str
+    timestamp: float
+    signature: str | None = None
+    key_id: str | None = None
+
+    def signing_payload(self) -> bytes:
+        """Canonical bytes covered by the signature."""
+        head = {"root": self.root, "timestamp": self.timestamp, "tree_size": self.tree_size}
+        return json.dumps(head, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+class ArchiveSegment(BaseModel):
+    """
+    Header of one cold-tier archive segment (an epoch).
+
+    ``root`` is the Merkle root over the segment's events in key order,
+    built exactly like the live tree; archived events are proven against it.
+    ``anchor_*`` record the latest sealed snapshot when the segment was cut.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    epoch: int
+    count: int
+    root: str
+    start_ts: float
+    end_ts: float
+    first_cursor: str
+    last_cursor: str
+    created_at: float
+    anchor_tree_size: int | None = None
+    anchor_root: str | None = None
+    signature: str | None = None
+    key_id: str | None = None
+
+    def signing_payload(self) -> bytes:
+        """Canonical bytes covered by the signature."""
+        head = self.model_dump(exclude={"signature", "key_id"})
+        return json.dumps(head, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+class IngestAck(BaseModel):
+    """Minimal ingest acknowledgement: where the event landed in the tree."""
+
+    event_id: str
+    leaf_index: int
+    root: str
+
+
 class ProofStep(BaseModel):
     position: str  # "left" or "right"
     hash: str
 
 
+class ProofReceipt(BaseModel):
+    """Inclusion proof of one event against the root snapshot that sealed it."""
+
+    event_id: str
+    leaf_index: int
+    entry_hash: str
+    path: list[ProofStep]
+    tree_size: int
+    root: str
+    timestamp: float
+    signature: str | None = None
+    key_id: str | None = None
+
+
+class ProofNode(BaseModel):
+    """Root of the complete subtree of ``2**level`` leaves starting at a multiple of that."""
+
+    level: int
+    hash: str
+
+
+class ConsistencyProof(BaseModel):
+    """
+    Proof that the tree of ``second_size`` leaves extends the tree of ``first_size``.
+
+    ``frontier`` holds the complete subtrees the first tree is made of, largest
+    first; folding them gives the first root. ``extension`` holds the aligned
+    subtrees covering leaves first_size..second_size in order; appending them
+    gives the second root.
+    """
+
+    first_size: int
+    second_size: int
+    frontier: list[ProofNode]
+    extension: list[ProofNode]
+
+
 class ProofView(BaseModel):
     event_id: str
     entry_hash: str
@@ -43,3 +227,5 @@ class ProofView(BaseModel):
     height: int
     path: List[ProofStep]
     index: int
+    # Set for archived events: the proof is against that segment's epoch root.
+    epoch: int | None = None
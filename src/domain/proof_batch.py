@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from typing import Any, Protocol
+
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event, ProofReceipt, RootSnapshot
+
+logger = logging.getLogger("audit-domain")
+
+
+class IProofSink(Protocol):
+    """Receives proof-bearing event records (SSE fan-out) when a snapshot seals."""
+
+    @property
+    def wants_proofs(self) -> bool: ...
+
+    async def publish_proofs(self, records: list[dict[str, Any]]) -> None: ...
+
+
+class ProofBatcher:
+    """
+    Proof-on-write: inclusion proofs computed in one pass when a snapshot seals.
+
+    Events appended since the last seal are buffered (at most one snapshot's
+    worth). When RootSnapshotter seals, the tree is exactly at the snapshot's
+    size, so every buffered event gets its proof against that sealed root:
+    waiting ingest requests are resolved and, if anyone streams proofs, the
+    batch is handed to the sink as SSE-ready records.
+    """
+
+    def __init__(self, merkle_tree: MerkleTree, sink: IProofSink | None = None):
+        self._merkle_tree = merkle_tree
+        self._sink = sink
+        self._batch: list[tuple[int, Event]] = []
+        self._waiters: dict[str, asyncio.Future] = {}
+
+    def expect(self, event_id: str) -> asyncio.Future:
+        """Register interest before committing, so a seal during commit isn't missed."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[event_id] = future
+        return future
+
+    def forget(self, event_id: str) -> None:
+        self._waiters.pop(event_id, None)
+
+    def record(self, event: Event, leaf_index: int) -> None:
+        """Hook for the ingest path, right after the Merkle update."""
+        self._batch.append((leaf_index, event))
+
+    def on_seal(self, snapshot: RootSnapshot) -> None:
+        """RootSnapshotter listener."""
+        batch, self._batch = self._batch, []
+        stream = self._sink is not None and self._sink.wants_proofs
+        if not stream:
+            batch = [entry for entry in batch if entry[1].event_id in self._waiters]
+        if not batch:
+            return
+
+        records = []
+        proofs = self._merkle_tree.get_proofs(leaf_index for leaf_index, _ in batch)
+        for (leaf_index, event), (entry_hash, path) in zip(batch, proofs):
+            receipt = ProofReceipt(
+                event_id=event.event_id,
+                leaf_index=leaf_index,
+                entry_hash=entry_hash,
+                path=path,
+                tree_size=snapshot.tree_size,
+                root=snapshot.root,
+                timestamp=snapshot.timestamp,
+                signature=snapshot.signature,
+                key_id=snapshot.key_id,
+            )
+            waiter = self._waiters.pop(event.event_id, None)
+            if waiter is not None:
+                waiter.get_loop().call_soon_threadsafe(_resolve, waiter, receipt)
+            if stream:
+                record = event.model_dump()
+                record["leaf_index"] = leaf_index
+                record["proof"] = receipt.model_dump(exclude={"event_id", "leaf_index"})
+                records.append(record)
+
+        if records:
+            try:
+                asyncio.get_running_loop().create_task(self._sink.publish_proofs(records))
+            except RuntimeError:  # sealed outside the event loop (tools, tests)
+                logger.debug("No running loop; proof frames not streamed")
+
+
+def _resolve(future: asyncio.Future, receipt: ProofReceipt) -> None:
+    if not future.done():
+        future.set_result(receipt)
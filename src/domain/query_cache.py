@@ -0,0 +1,153 @@
+"""
+Result cache for dashboard reads (list pages and stats windows).
+
+Dashboards poll the same pages and windows every few seconds, so results
+are kept per normalized query. The cache bounds their age with a TTL and
+their number with LRU eviction. Ingest invalidates precisely: each entry
+carries a ``covers(event, result)`` predicate, and a new event drops only
+the entries it could change. Examples are a head page with matching
+filters, or a stats window containing the event's timestamp. Older pages
+and other principals' pages stay cached.
+
+Entries are filed under an anchor, such as one of their filter values.
+An event is then checked only against entries whose anchor it shares, plus
+the unanchored ones. That keeps ingest cost independent of how many
+filtered pages are cached.
+
+Identical queries that miss together are coalesced: the first caller
+loads, and the others wait for its result. If an event arrives while a
+load is running, its result is returned but not cached, because it may
+already be stale.
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future
+from typing import Any
+
+from src.core.metrics import QUERY_CACHE_ENTRIES, QUERY_CACHE_INVALIDATIONS, QUERY_CACHE_RESULT
+
+Covers = Callable[[Any, Any], bool]
+
+
+class _Entry:
+    __slots__ = ("anchor", "covers", "expires", "value")
+
+    def __init__(self, value: Any, expires: float, covers: Covers, anchor: Hashable):
+        self.value = value
+        self.expires = expires
+        self.covers = covers
+        self.anchor = anchor
+
+
+class _Flight:
+    __slots__ = ("anchor", "future", "stale")
+
+    def __init__(self, anchor: Hashable):
+        self.future: Future = Future()
+        self.anchor = anchor
+        self.stale = False
+
+
+class QueryCache:
+    """TTL + LRU query results with per-event invalidation; see the module docstring."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 5.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._anchored: dict[Hashable, set[Hashable]] = defaultdict(set)
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, key: Hashable, load: Callable[[], Any], covers: Covers, anchor: Hashable = None
+    ) -> Any:
+        """The cached result for ``key``, else ``load()`` (once for concurrent callers)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires > self._clock():
+                    self._entries.move_to_end(key)
+                    QUERY_CACHE_RESULT["hit"].inc()
+                    return entry.value
+                self._drop(key)
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight(anchor)
+        if not leader:
+            QUERY_CACHE_RESULT["coalesced"].inc()
+            return flight.future.result()
+
+        QUERY_CACHE_RESULT["miss"].inc()
+        try:
+            value = load()
+        except BaseException as e:
+            with self._lock:
+                del self._flights[key]
+            flight.future.set_exception(e)
+            raise
+        with self._lock:
+            del self._flights[key]
+            if not flight.stale:
+                self._entries[key] = _Entry(value, self._clock() + self.ttl_seconds, covers, anchor)
+                self._anchored[anchor].add(key)
+                while len(self._entries) > self.max_entries:
+                    self._drop(next(iter(self._entries)))
+            QUERY_CACHE_ENTRIES.set(len(self._entries))
+        flight.future.set_result(value)
+        return value
+
+    def invalidate(self, event: Any, anchors: Iterable[Hashable]) -> int:
+        """Drop the results ``event`` could change; ``anchors`` are the ones it shares."""
+        if not self._entries and not self._flights:
+            return 0
+        anchors = set(anchors)
+        anchors.add(None)
+        with self._lock:
+            doomed = [
+                key
+                for anchor in anchors
+                for key in self._anchored.get(anchor, ())
+                if self._entries[key].covers(event, self._entries[key].value)
+            ]
+            for key in doomed:
+                self._drop(key)
+            # A load in progress may have read the store before this event.
+            for flight in self._flights.values():
+                if flight.anchor in anchors:
+                    flight.stale = True
+            QUERY_CACHE_ENTRIES.set(len(self._entries))
+        if doomed:
+            QUERY_CACHE_INVALIDATIONS.inc(len(doomed))
+        return len(doomed)
+
+    def clear(self, *_: Any) -> None:
+        """Drop everything, e.g. after retention deleted events from the store."""
+        with self._lock:
+            self._entries.clear()
+            self._anchored.clear()
+            for flight in self._flights.values():
+                flight.stale = True
+            QUERY_CACHE_ENTRIES.set(0)
+
+    def _drop(self, key: Hashable) -> _Entry | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._anchored[entry.anchor]
+            keys.discard(key)
+            if not keys:
+                del self._anchored[entry.anchor]
+        return entry
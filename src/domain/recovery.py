@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+
+from src.core.metrics import RECOVERY_QUEUED_INGEST, TREE_READY
+from src.domain.errors import UnavailableError
+from src.domain.models import RecoveryStatus
+
+
+class TreeRecovery:
+    """
+    State of the startup rebuild of the Merkle tree, and the gate in front of it.
+
+    Recovery runs on a thread. Ingest arriving meanwhile waits in ``wait()``
+    (at most ``max_queued`` requests; more get UnavailableError) and is
+    released in arrival order once the tree is complete, so its leaves land
+    after the recovered ones. Reads that need the tree call ``check()``.
+    """
+
+    def __init__(self, max_queued: int = 10000):
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._state = "pending"
+        self._events_loaded = 0
+        self._started: float | None = None
+        self._seconds: float | None = None
+        self._error: str | None = None
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        TREE_READY.set(0)
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def ready(self) -> bool:
+        return self._state == "ready"
+
+    def schedule(self) -> None:
+        """Mark recovery as about to start in the background."""
+        with self._lock:
+            if self._state == "pending":
+                self._state = "scheduled"
+
+    def begin(self) -> bool:
+        """Claim the recovery run; False if it is already running or done."""
+        with self._lock:
+            if self._state not in ("pending", "scheduled", "failed"):
+                return False
+            self._state = "loading"
+            self._started = time.perf_counter()
+            self._error = None
+            return True
+
+    def progress(self, state: str, events_loaded: int) -> None:
+        self._state = state
+        self._events_loaded = events_loaded
+
+    def fail(self, error: Exception) -> None:
+        """Record a failed run; queued ingest keeps waiting for the retry."""
+        with self._lock:
+            self._state = "failed"
+            self._error = str(error)
+
+    def finish(self) -> None:
+        with self._lock:
+            self._state = "ready"
+            self._seconds = time.perf_counter() - self._started
+            waiters, self._waiters = self._waiters, []
+        TREE_READY.set(1)
+        RECOVERY_QUEUED_INGEST.set(0)
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_release, future)
+            except RuntimeError:  # the waiter's loop has closed
+                pass
+
+    def status(self) -> RecoveryStatus:
+        with self._lock:
+            seconds = self._seconds
+            if seconds is None and self._started is not None:
+                seconds = time.perf_counter() - self._started
+            return RecoveryStatus(
+                state=self._state,
+                events_loaded=self._events_loaded,
+                seconds=seconds,
+                queued_ingest=len(self._waiters),
+                error=self._error,
+            )
+
+    def check(self) -> None:
+        """Raise UnavailableError unless the tree is complete."""
+        if self._state != "ready":
+            raise UnavailableError(f"Merkle tree recovery in progress ({self._state})")
+
+    async def wait(self) -> None:
+        """Hold an ingest until recovery finishes."""
+        if self._state == "ready":
+            return
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            if self._state == "ready":
+                return
+            if len(self._waiters) >= self.max_queued:
+                raise UnavailableError("Merkle tree recovery in progress; ingest queue is full")
+            self._waiters.append((asyncio.get_running_loop(), future))
+            RECOVERY_QUEUED_INGEST.set(len(self._waiters))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                self._waiters = [w for w in self._waiters if w[1] is not future]
+                RECOVERY_QUEUED_INGEST.set(len(self._waiters))
+            raise
+
+
+def _release(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
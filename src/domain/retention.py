@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from talos_sdk.ports.hash import IHashPort  # type: ignore
+
+from src.core.metrics import ARCHIVE_SEGMENTS, ARCHIVED_EVENTS
+from src.domain.merkle import MerkleTree
+from src.domain.models import (
+    ArchiveSegment,
+    ProofView,
+    as_event,
+    decode_key,
+    encode_cursor,
+    event_key,
+    event_timestamp,
+)
+from src.domain.snapshots import RootSnapshotter
+from src.ports.common import IArchivePort, IClockPort, IEventExportPort, IRetentionPort, ISignerPort
+
+logger = logging.getLogger("audit-domain")
+
+
+class ColdTier:
+    """
+    Read side of the archive: lookups, listings and proofs for archived events.
+
+    Archived events are proven against their segment's epoch root. Segment
+    trees are rebuilt from the stored leaf hashes on demand and the most
+    recently used few are kept.
+    """
+
+    def __init__(self, archive: IArchivePort, hash_port: IHashPort, cached_trees: int = 4):
+        self._archive = archive
+        self._hash_port = hash_port
+        self._cached_trees = cached_trees
+        self._trees: OrderedDict[int, MerkleTree] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def archive(self) -> IArchivePort:
+        return self._archive
+
+    def contains(self, event_id: str) -> bool:
+        return self._archive.locate(event_id) is not None
+
+    def iter_event_ids(self) -> Iterator[str]:
+        return iter(self._archive.iter_event_ids())
+
+    def segments(self) -> list[ArchiveSegment]:
+        return self._archive.segments()
+
+    def list(self, before: str | None, limit: int) -> list[Any]:
+        return self._archive.list(before=before, limit=limit)
+
+    def iter_events(self, start_ts: float | None, end_ts: float | None) -> Iterator[Any]:
+        return self._archive.iter_events(start_ts=start_ts, end_ts=end_ts)
+
+    def iter_tree_leaves(self) -> Iterator[tuple[int | None, str, bytes]]:
+        return iter(self._archive.iter_tree_leaves())
+
+    def _tree(self, epoch: int) -> MerkleTree:
+        with self._lock:
+            tree = self._trees.get(epoch)
+            if tree is not None:
+                self._trees.move_to_end(epoch)
+                return tree
+        event_ids, leaves = self._archive.read_leaves(epoch)
+        tree = MerkleTree(self._hash_port)
+        tree.initialize_from_leaves(event_ids, leaves)
+        with self._lock:
+            self._trees[epoch] = tree
+            while len(self._trees) > self._cached_trees:
+                self._trees.popitem(last=False)
+        return tree
+
+    def get_proof(self, event_id: str) -> ProofView | None:
+        """Inclusion proof against the epoch root of the segment holding event_id."""
+        epoch = self._archive.locate(event_id)
+        if epoch is None:
+            return None
+        proof = self._tree(epoch).get_proof(event_id)
+        return proof.model_copy(update={"epoch": epoch})
+
+
+class RetentionManager:
+    """
+    Moves events older than ``max_age_seconds`` from the store into archive
+    segments, ``segment_max_events`` at a time. With ``max_store_events``
+    (the in-memory store), the oldest events beyond that count are moved
+    too, whatever their age.
+
+    A segment is written (and fsynced) before its events are deleted from the
+    store. If a run dies in between, the next run finds those events already
+    archived and only finishes the delete.
+
+    Given the live ``merkle_tree``, each row also records the event's leaf
+    index there, so recovery can put archived leaves back where they were.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        cold_tier: ColdTier,
+        hash_port: IHashPort,
+        clock: IClockPort,
+        max_age_seconds: float | None,
+        segment_max_events: int = 100_000,
+        interval_seconds: float = 3600.0,
+        signer: ISignerPort | None = None,
+        snapshots: RootSnapshotter | None = None,
+        max_store_events: int | None = None,
+        merkle_tree: MerkleTree | None = None,
+    ):
+        if not isinstance(store, IEventExportPort) or not isinstance(store, IRetentionPort):
+            raise TypeError("Retention needs a store with streaming export and delete support")
+        self._store = store
+        self._archive = cold_tier.archive
+        self._hash_port = hash_port
+        self._clock = clock
+        self.max_age_seconds = max_age_seconds
+        self.max_store_events = max_store_events
+        self.segment_max_events = segment_max_events
+        self.interval_seconds = interval_seconds
+        self._signer = signer
+        self._snapshots = snapshots
+        self._merkle_tree = merkle_tree
+        self._lock = threading.Lock()
+        self._on_delete: list[Callable[[], None]] = []
+        ARCHIVE_SEGMENTS.set(len(self._archive.segments()))
+
+    def add_delete_listener(self, listener: Callable[[], None]) -> None:
+        """Called after a run deleted events from the store (their reads changed)."""
+        self._on_delete.append(listener)
+
+    def archive_once(self) -> ArchiveSegment | None:
+        """Cut at most one segment; returns it, or None when nothing is due."""
+        with self._lock:
+            cutoff = None
+            if self.max_age_seconds is not None:
+                cutoff = self._clock.now() - self.max_age_seconds
+            excess = 0
+            if self.max_store_events is not None:
+                excess = len(self._store) - self.max_store_events
+            if cutoff is None and excess <= 0:
+                return None
+            rows: list[dict[str, Any]] = []
+            already_archived: list[str] = []
+            # Over the count bound the oldest go regardless of age, so scan from the start.
+            for event in self._store.iter_events(end_ts=None if excess > 0 else cutoff):
+                if excess > 0:
+                    excess -= 1
+                elif cutoff is None or event_timestamp(event) >= cutoff:
+                    break
+                event_id = event.event_id
+                if self._archive.locate(event_id) is not None:
+                    already_archived.append(event_id)
+                    continue
+                rows.append(self._row(event))
+                if len(rows) >= self.segment_max_events:
+                    break
+
+            segment = self._write(rows) if rows else None
+            deleted = self._delete([row["event_id"] for row in rows] + already_archived)
+            if deleted:
+                for listener in self._on_delete:
+                    listener()
+            if already_archived:
+                logger.info(f"🧊 Finished deleting {len(already_archived)} already-archived events")
+            if segment is not None:
+                ARCHIVED_EVENTS.inc(len(rows))
+                logger.info(
+                    f"🧊 Archived epoch {segment.epoch}: {segment.count} events, "
+                    f"{deleted} deleted from the store"
+                )
+            return segment
+
+    def archive_due(self) -> int:
+        """Archive until nothing older than the cutoff is left; returns segments written."""
+        written = 0
+        while self.archive_once() is not None:
+            written += 1
+        return written
+
+    async def run_periodic(self) -> None:
+        """Archive on a timer, off the event loop; run as a task like snapshot sealing."""
+        # A count bound is checked often, so memory overshoots by one interval's ingest at most.
+        interval = self.interval_seconds
+        if self.max_store_events is not None:
+            interval = min(interval, 1.0)
+        while True:
+            try:
+                await asyncio.to_thread(self.archive_due)
+            except Exception as e:
+                logger.error(f"Archival run failed: {e}")
+            await asyncio.sleep(interval)
+
+    def _row(self, event: Any) -> dict[str, Any]:
+        hydrated = as_event(event)
+        leaf = self._hash_port.sha256(str(hydrated).encode("utf-8"))
+        row = hydrated.model_dump()
+        timestamp = event_timestamp(event)
+        row["cursor"] = getattr(event, "cursor", None) or encode_cursor(event_key(event))
+        row["timestamp"] = timestamp
+        row["leaf_hash"] = leaf.hex()
+        row["tree_index"] = (
+            self._merkle_tree.index_of(hydrated.event_id) if self._merkle_tree is not None else None
+        )
+        return row
+
+    def _write(self, rows: list[dict[str, Any]]) -> ArchiveSegment:
+        rows.sort(key=lambda row: decode_key(row["cursor"]))
+        tree = MerkleTree(self._hash_port)
+        tree.initialize_from_leaves(
+            [row["event_id"] for row in rows], [bytes.fromhex(row["leaf_hash"]) for row in rows]
+        )
+        segments = self._archive.segments()
+        timestamps = [row["timestamp"] for row in rows]
+        anchor = self._snapshots.published() if self._snapshots is not None else None
+        segment = ArchiveSegment(
+            epoch=segments[-1].epoch + 1 if segments else 0,
+            count=len(rows),
+            root=tree.get_root().root,
+            start_ts=min(timestamps),
+            end_ts=max(timestamps),
+            first_cursor=rows[0]["cursor"],
+            last_cursor=rows[-1]["cursor"],
+            created_at=self._clock.now(),
+            anchor_tree_size=anchor.tree_size if anchor else None,
+            anchor_root=anchor.root if anchor else None,
+        )
+        if self._signer is not None:
+            segment = segment.model_copy(
+                update={
+                    "signature": self._signer.sign(segment.signing_payload()).hex(),
+                    "key_id": self._signer.key_id,
+                }
+            )
+        self._archive.write_segment(segment, rows)
+        ARCHIVE_SEGMENTS.set(len(segments) + 1)
+        return segment
+
+    def _delete(self, event_ids: list[str], chunk: int = 10_000) -> int:
+        deleted = 0
+        for start in range(0, len(event_ids), chunk):
+            deleted += self._store.delete_events(event_ids[start : start + chunk])
+        return deleted
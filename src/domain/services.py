@@ -1,10 +1,65 @@
+import asyncio
+import collections
+import contextlib
+import hashlib
+import itertools
+import logging
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
-from src.domain.models import Event, RootView, ProofView
-from src.domain.merkle import MerkleTree
-from src.domain.errors import ValidationError, NotFoundError, ConflictError
-from src.ports.common import IClockPort, IIdPort
+
+from talos_contracts import CursorBad, decode_cursor
 from talos_sdk.ports.audit_store import IAuditStorePort  # type: ignore
-from talos_contracts import decode_cursor, CursorBad
+
+from src.core.metrics import (
+    INGEST_STAGE,
+    MERKLE_TREE_HEIGHT,
+    MERKLE_TREE_SIZE,
+    STARTUP_RECOVERY_SECONDS,
+)
+from src.domain.dedup import DuplicateDetector
+from src.domain.errors import (
+    ConflictError,
+    DomainError,
+    NotFoundError,
+    UnavailableError,
+    ValidationError,
+)
+from src.domain.merkle import MerkleTree
+from src.domain.models import (
+    FILTER_FIELDS,
+    ArchiveSegment,
+    ConsistencyProof,
+    Event,
+    EventPage,
+    IngestAck,
+    ProofReceipt,
+    ProofView,
+    RecoveryStatus,
+    RootSnapshot,
+    RootView,
+    decode_key,
+    encode_cursor,
+    event_key,
+    event_timestamp,
+    field_value,
+)
+from src.domain.proof_batch import ProofBatcher
+from src.domain.query_cache import QueryCache
+from src.domain.recovery import TreeRecovery
+from src.domain.retention import ColdTier, RetentionManager
+from src.domain.shipping import WalShipper
+from src.domain.snapshots import RootSnapshotter
+from src.ports.common import (
+    IClockPort,
+    IEventExportPort,
+    IIdPort,
+    ILeafStorePort,
+    IReadConsistencyPort,
+)
+
+logger = logging.getLogger("audit-domain")
 
 
 class AuditService:
@@ -30,27 +85,165 @@ class AuditService:
         clock: IClockPort,
         id_gen: IIdPort,
         broadcaster: Any = None,  # Inject broadcaster
+        dedup: DuplicateDetector | None = None,
+        snapshots: RootSnapshotter | None = None,
+        proofs: ProofBatcher | None = None,
+        cold_tier: ColdTier | None = None,
+        retention: RetentionManager | None = None,
+        recover_on_init: bool = True,
+        max_queued_ingest: int = 10000,
+        query_cache: QueryCache | None = None,
+        wal: WalShipper | None = None,
     ):
+        """
+        With recover_on_init=False the tree starts empty and is rebuilt by a
+        later ``recover()`` (the app runs it in the background); until then
+        ingest is queued and proofs are unavailable.
+
+        With a ``wal``, ingest is acknowledged once the event is in the local
+        write-ahead log; the store is written behind it.
+        """
         self._store = store
         self._merkle_tree = merkle_tree
         self._clock = clock
         self._id_gen = id_gen
         self._broadcaster = broadcaster
-        self._initialize_tree()
+        self._dedup = dedup or DuplicateDetector(store, merkle_tree, cold_tier=cold_tier)
+        self._snapshots = snapshots
+        self._proofs = proofs
+        self._cold_tier = cold_tier
+        self._retention = retention
+        self._query_cache = query_cache
+        self._wal = wal
+        # Ids being written (to the WAL or the store) that have no leaf yet.
+        self._logging: set[str] = set()
+        # Store writes leave the event loop; one thread keeps them in leaf order.
+        self._appender = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store-append")
+        if proofs is not None and snapshots is not None:
+            snapshots.add_seal_listener(proofs.on_seal)
+        if query_cache is not None and retention is not None:
+            retention.add_delete_listener(query_cache.clear)
+        if query_cache is not None and wal is not None:
+            # Invalidated at commit too, but the store only has the event once shipped.
+            wal.add_ship_listener(self.invalidate_queries)
+        self._recovery = TreeRecovery(max_queued=max_queued_ingest)
+        if recover_on_init:
+            self.recover()
+
+    @property
+    def recovery(self) -> TreeRecovery:
+        return self._recovery
+
+    def recovery_status(self) -> RecoveryStatus:
+        return self._recovery.status()
+
+    def recover(self) -> None:
+        """Rebuild the tree from the store, unless another call already has (or is)."""
+        if not self._recovery.begin():
+            return
+        try:
+            self._initialize_tree()
+            if self._snapshots is not None:
+                self._snapshots.check_recovered()
+        except Exception as e:
+            self._recovery.fail(e)
+            raise
+        self._recovery.finish()
 
     def _initialize_tree(self):
         """Rebuild tree from store on startup."""
-        import logging
-        logger = logging.getLogger("audit-domain")
         logger.info("🌳 Starting Merkle Tree initialization from store...")
-        page = self._store.list(limit=10000)
-        logger.info(f"📚 Loaded {len(page.events)} events for tree initialization")
-        
-        # Batch add leaves to avoid O(N^2) rebuild disaster
-        self._merkle_tree.initialize_from_events(page.events)
-        
+        started = time.perf_counter()
+        # Recovery may read from a replica, but only one that has caught up
+        # with everything committed on the primary.
+        try:
+            token = self.consistency_token()
+        except Exception as e:
+            logger.warning(f"Could not read primary WAL position, recovering unpinned: {e}")
+            token = None
+        with self._read_scope(token):
+            if isinstance(self._store, ILeafStorePort):
+                event_ids, leaves = self._stored_leaves()
+                loaded = []
+            else:
+                loaded = self._store.list(limit=10000).events
+                event_ids = [event.event_id for event in loaded]
+                leaves = [self._merkle_tree.leaf_hash(event) for event in loaded]
+            logger.info(f"📚 Loaded {len(leaves)} leaves for tree initialization")
+            self._recovery.progress("building", len(leaves))
+            if self._wal is not None:
+                self._add_logged(event_ids, leaves)
+            if self._cold_tier is not None:
+                event_ids, leaves = self._with_archived_leaves(event_ids, leaves)
+            # Batch add leaves to avoid O(N^2) rebuild disaster
+            self._merkle_tree.initialize_from_leaves(event_ids, leaves)
+            self._dedup.seed_from_store(loaded)
+
+        self._update_tree_gauges()
+        STARTUP_RECOVERY_SECONDS.set(time.perf_counter() - started)
         logger.info("✅ Merkle Tree initialization complete")
 
+    def _stored_leaves(self) -> tuple[list[str], list[bytes]]:
+        """Whole-store recovery from stored leaf hashes; no event is read or re-hashed."""
+        event_ids, leaves = [], []
+        for event_id, leaf in self._store.iter_leaves():
+            event_ids.append(event_id)
+            leaves.append(leaf)
+        return event_ids, leaves
+
+    def _with_archived_leaves(
+        self, event_ids: list[str], leaves: list[bytes]
+    ) -> tuple[list[str], list[bytes]]:
+        """
+        Merge archived leaves back in with the store's, so a restart after
+        archival rebuilds the same tree (size, root, leaf indices).
+
+        Archived leaves go back at their recorded tree index; the rest fill
+        the gaps in order, archived (oldest epoch first) before stored.
+        """
+        archived = list(self._cold_tier.iter_tree_leaves())
+        if not archived:
+            return event_ids, leaves
+        logger.info(f"🧊 Merging {len(archived)} archived leaves into the tree")
+        archived_ids = {event_id for _, event_id, _ in archived}
+        placed = sorted((entry for entry in archived if entry[0] is not None), key=lambda e: e[0])
+        rest = collections.deque(
+            [(event_id, leaf) for index, event_id, leaf in archived if index is None]
+        )
+        # Skip rows archived but not yet deleted from the store (a run died in between).
+        rest.extend(pair for pair in zip(event_ids, leaves) if pair[0] not in archived_ids)
+
+        merged_ids: list[str] = []
+        merged_leaves: list[bytes] = []
+        for index, event_id, leaf in placed:
+            while len(merged_ids) < index and rest:
+                other_id, other_leaf = rest.popleft()
+                merged_ids.append(other_id)
+                merged_leaves.append(other_leaf)
+            merged_ids.append(event_id)
+            merged_leaves.append(leaf)
+        for other_id, other_leaf in rest:
+            merged_ids.append(other_id)
+            merged_leaves.append(other_leaf)
+        return merged_ids, merged_leaves
+
+    def _add_logged(self, event_ids: list[str], leaves: list[bytes]) -> None:
+        """
+        Ship what the log holds (its snapshot and everything past its
+        checkpoint), and append the events the store lacked, in log order.
+        """
+        stored = set(event_ids)
+        missing = 0
+        for event in self._wal.replay():
+            self._dedup.record(event.event_id)
+            if event.event_id not in stored:
+                stored.add(event.event_id)
+                event_ids.append(event.event_id)
+                leaves.append(self._merkle_tree.leaf_hash(event))
+                missing += 1
+        if missing:
+            logger.info(f"📜 Adding {missing} events from the write-ahead log to the tree")
+
     async def ingest_event(self, event: Event) -> Event:
         """
         Ingest a new audit event.
@@ -59,42 +252,208 @@ class AuditService:
         - Anchors to Merkle Tree.
         - Broadcasts to SSE subscribers.
         """
+        await self.ingest_event_ack(event)
+        return event
+
+    async def ingest_event_ack(self, event: Event) -> IngestAck:
+        """Ingest an event and return its leaf index and the resulting root."""
+        canonical = self.verify_integrity(event)
+        return await self.commit_verified(event, canonical)
+
+    async def ingest_event_proof(self, event: Event) -> ProofReceipt:
+        """Ingest an event and wait for its inclusion proof in the next sealed snapshot."""
+        canonical = self.verify_integrity(event)
+        return await self.commit_with_proof(event, canonical)
+
+    async def commit_with_proof(self, event: Event, canonical: bytes) -> ProofReceipt:
+        if self._proofs is None or self._snapshots is None:
+            raise DomainError("Proof-on-write is not enabled")
+        pending = self._proofs.expect(event.event_id)
+        try:
+            await self.commit_verified(event, canonical)
+        except Exception:
+            self._proofs.forget(event.event_id)
+            raise
+        try:
+            # The time trigger normally seals well within this window.
+            return await asyncio.wait_for(
+                asyncio.shield(pending), timeout=self._snapshots.every_seconds * 2
+            )
+        except asyncio.TimeoutError:
+            # No seal loop running (or it stalled): seal now rather than fail.
+            self._snapshots.seal()
+        try:
+            # Sealing can be refused (a recovered tree that contradicts the heads).
+            return await asyncio.wait_for(pending, timeout=self._snapshots.every_seconds)
+        except asyncio.TimeoutError:
+            self._proofs.forget(event.event_id)
+            raise UnavailableError(
+                f"Event {event.event_id} is committed but no snapshot was sealed for its proof",
+                retry_after=max(1, int(self._snapshots.every_seconds)),
+            ) from None
+
+    def verify_integrity(self, event: Event) -> bytes:
+        """Check event_hash against the RFC 8785 form; returns the canonical bytes."""
         # 1. Integrity Verification
-        import hashlib
+        t0 = time.perf_counter()
+        try:
+            canonical = str(event).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            # Binary ingest formats can carry values JSON has no form for (bytes, tags).
+            raise ValidationError(f"Event {event.event_id} has no canonical JSON form: {e}")
+        t1 = time.perf_counter()
+        INGEST_STAGE["canonicalize"].observe(t1 - t0)
 
-        canonical_str = str(event)
-        calculated_hash = hashlib.sha256(canonical_str.encode("utf-8")).hexdigest()
+        calculated_hash = hashlib.sha256(canonical).hexdigest()
+        INGEST_STAGE["verify_hash"].observe(time.perf_counter() - t1)
 
         if calculated_hash != event.event_hash:
             raise ValidationError(
                 f"Audit Integrity Failure: event_hash mismatch for event {event.event_id}"
             )
+        return canonical
 
-        # 2. Idempotency check
-        if self._merkle_tree.has_event(event.event_id):
+    async def commit_verified(self, event: Event, canonical: bytes) -> IngestAck:
+        """
+        Persist, anchor and broadcast an event whose integrity was already
+        verified. In multi-worker mode this is the part the sequencer runs.
+        """
+        # Held back while the tree is recovering, so new leaves follow the stored ones.
+        await self._recovery.wait()
+
+        # 2. Idempotency check (Bloom filter -> tree -> store index)
+        t0 = time.perf_counter()
+        duplicate = event.event_id in self._logging or self._dedup.is_duplicate(event.event_id)
+        INGEST_STAGE["dedup"].observe(time.perf_counter() - t0)
+        if duplicate:
             raise ConflictError(f"Event with id {event.event_id} already exists")
 
         # 3. Persistence (Secondary Port)
-        self._store.append(event)
+        t0 = time.perf_counter()
+        self._logging.add(event.event_id)
+        try:
+            if self._wal is not None:
+                # Durable in the local log; the store is written behind. Commits
+                # resume in log order, so leaves follow it too.
+                await self._wal.commit(event)
+                INGEST_STAGE["wal_append"].observe(time.perf_counter() - t0)
+            else:
+                # Off the event loop, so admission can still queue and shed while
+                # the store is slow. Writes complete (and resume) in submit order.
+                loop = asyncio.get_running_loop()
+                inserted = await loop.run_in_executor(self._appender, self._store.append, event)
+                INGEST_STAGE["store_append"].observe(time.perf_counter() - t0)
+                # Stores that report insertion (Postgres ON CONFLICT DO NOTHING) close
+                # the race between the check above and a concurrent writer.
+                if inserted is False:
+                    raise ConflictError(f"Event with id {event.event_id} already exists")
+        finally:
+            self._logging.discard(event.event_id)
+        self._dedup.record(event.event_id)
+        self.invalidate_queries(event)
 
         # 4. Domain Logic (Merkle)
-        self._merkle_tree.add_leaf(event)
+        t0 = time.perf_counter()
+        leaf_index = self._merkle_tree.add_leaf(event, canonical)
+        # Captured before the broadcast await so a concurrent ingest can't move it.
+        ack = IngestAck(
+            event_id=event.event_id, leaf_index=leaf_index, root=self._merkle_tree.get_root().root
+        )
+        INGEST_STAGE["merkle_update"].observe(time.perf_counter() - t0)
+        self._update_tree_gauges()
+        if self._proofs is not None:
+            self._proofs.record(event, leaf_index)
+        if self._snapshots is not None:
+            self._snapshots.on_append()
 
         # 5. Broadcast (SSE)
         if self._broadcaster:
+            t0 = time.perf_counter()
             await self._broadcaster.publish(event)
+            INGEST_STAGE["broadcast"].observe(time.perf_counter() - t0)
 
-        return event
+        return ack
+
+    def invalidate_queries(self, event: Any) -> None:
+        """Drop the cached list pages and stats windows a new event changes."""
+        if self._query_cache is not None:
+            anchors = [(field, field_value(event, field)) for field in FILTER_FIELDS]
+            self._query_cache.invalidate(event, anchors)
+
+    def _update_tree_gauges(self):
+        MERKLE_TREE_SIZE.set(self._merkle_tree.size)
+        MERKLE_TREE_HEIGHT.set(self._merkle_tree.height)
 
     def get_root(self) -> RootView:
         return self._merkle_tree.get_root()
 
+    @property
+    def snapshots(self) -> RootSnapshotter | None:
+        return self._snapshots
+
+    def latest_snapshot(self) -> RootSnapshot:
+        """Most recent sealed tree head."""
+        snapshot = self._snapshots.published() if self._snapshots else None
+        if snapshot is None:
+            raise NotFoundError("No root snapshot has been sealed yet")
+        return snapshot
+
+    def list_snapshots(self, since: int = 0, limit: int = 100) -> list[RootSnapshot]:
+        """Sealed heads with tree_size > since, oldest first (limit clamped to 1-1000)."""
+        if since < 0:
+            raise ValidationError("since must be >= 0")
+        if self._snapshots is None:
+            return []
+        return self._snapshots.history(since, min(max(1, limit), 1000))
+
+    @property
+    def retention(self) -> RetentionManager | None:
+        return self._retention
+
+    def list_archive_segments(self) -> list[ArchiveSegment]:
+        """Archive segment headers (epoch roots), oldest first."""
+        return self._cold_tier.segments() if self._cold_tier is not None else []
+
     def get_proof(self, event_id: str) -> ProofView:
+        self._recovery.check()
         if not self._merkle_tree.has_event(event_id):
-            raise NotFoundError(f"Event {event_id} not found")
+            # Archived events the live tree lacks are proven against their epoch root.
+            proof = self._cold_tier.get_proof(event_id) if self._cold_tier is not None else None
+            if proof is None:
+                raise NotFoundError(f"Event {event_id} not found")
+            return proof
         return self._merkle_tree.get_proof(event_id)
 
-    def list_events(self, limit: int = 50, before: str | None = None):
+    def get_consistency_proof(self, first_size: int, second_size: int) -> ConsistencyProof:
+        """Proof that the tree at second_size extends the tree at first_size."""
+        self._recovery.check()
+        try:
+            return self._merkle_tree.get_consistency_proof(first_size, second_size)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    def consistency_token(self) -> str | None:
+        """Token for read-your-writes reads, if the store serves reads from replicas."""
+        if isinstance(self._store, IReadConsistencyPort):
+            return self._store.consistency_token()
+        return None
+
+    def _read_scope(self, token: str | None):
+        """Pin store reads in the block to nodes that have seen ``token``."""
+        if not isinstance(self._store, IReadConsistencyPort):
+            return contextlib.nullcontext()
+        try:
+            return self._store.read_after(token)
+        except ValueError as e:
+            raise ValidationError(f"Invalid consistency token: {e}")
+
+    def list_events(
+        self,
+        limit: int = 50,
+        before: str | None = None,
+        consistency_token: str | None = None,
+        filters: dict[str, str] | None = None,
+    ):
         """
         List audit events with pagination.
         
@@ -104,12 +463,16 @@ class AuditService:
         Args:
             limit: Maximum events to return (clamped to 1-200)
             before: Optional cursor for pagination (strictly older than)
+            consistency_token: Optional token from ingest; the read sees that write
+                (and bypasses the query cache)
+            filters: Optional principal_id/session_id/correlation_id/outcome
+                equality filters; filtered pages cover the store, not the archive
         
         Returns:
             EventPage with items, next_cursor, has_more
         
         Raises:
-            ValidationError: If cursor format is invalid
+            ValidationError: If cursor or consistency token format is invalid
         """
         # Validate and clamp limit
         limit = min(max(1, limit), 200)
@@ -121,5 +484,171 @@ class AuditService:
             except CursorBad as e:
                 raise ValidationError(f"Invalid cursor: {str(e)}")
         
+        filters = {field: value for field, value in (filters or {}).items() if value}
+        if self._query_cache is None or consistency_token:
+            return self._load_page(limit, before, consistency_token, filters)
+
+        # Dashboards repeat the same query; a new event drops only the pages it changes.
+        before_key = _cursor_key(before)
+
+        def covers(event: Any, page: Any) -> bool:
+            if not _event_matches(event, None, None, filters):
+                return False
+            key = event_key(event)
+            if before_key is not None and key >= before_key:
+                return False
+            # Older than a full page: it would only set has_more, which is already set.
+            return not (page.has_more and page.events and key < event_key(page.events[0]))
+
+        anchor = next(((f, filters[f]) for f in FILTER_FIELDS if f in filters), None)
+        return self._query_cache.get(
+            ("list", limit, before, tuple(sorted(filters.items()))),
+            lambda: self._load_page(limit, before, None, filters),
+            covers,
+            anchor,
+        )
+
+    def _load_page(
+        self,
+        limit: int,
+        before: str | None,
+        consistency_token: str | None,
+        filters: dict[str, str],
+    ) -> EventPage:
         # Fetch from store
-        return self._store.list(limit=limit, before=before)
+        with self._read_scope(consistency_token):
+            try:
+                if filters:
+                    page = self._store.list(limit=limit, before=before, filters=filters)
+                else:
+                    page = self._store.list(limit=limit, before=before)
+            except ValueError as e:  # a cursor the store cannot decode
+                raise ValidationError(f"Invalid cursor: {e}")
+        if self._cold_tier is None or filters or getattr(page, "has_more", False):
+            return page
+
+        # The store ran out: continue into archived history.
+        # Domain events (memory, SQLite) carry no cursor: derive it from the key.
+        events = list(page.events)
+        older_than = encode_cursor(event_key(events[0])) if events else before
+        remaining = limit - len(events)
+        archived = self._cold_tier.list(before=older_than, limit=remaining + 1)
+        has_more = len(archived) > remaining
+        events = (archived[len(archived) - remaining :] if remaining else []) + events
+        next_cursor = encode_cursor(event_key(events[0])) if events else None
+        return EventPage(events=events, next_cursor=next_cursor, has_more=has_more)
+
+    def stats(self, start_ts: float | None = None, end_ts: float | None = None) -> dict:
+        """
+        Dashboard aggregations over [start_ts, end_ts] from the store.
+
+        end_ts None means up to now. start_ts None means the last 24 hours,
+        counted from a whole minute so that repeated polls share a cache entry.
+        """
+        if start_ts is None:
+            start_ts = (self._clock.now() - 86400) // 60 * 60
+
+        def load() -> dict:
+            return self._store.stats(start_ts, self._clock.now() if end_ts is None else end_ts)
+
+        if self._query_cache is None:
+            return load()
+
+        def covers(event: Any, _: Any) -> bool:
+            ts = event_timestamp(event)
+            return ts >= start_ts and (end_ts is None or ts <= end_ts)
+
+        return self._query_cache.get(("stats", start_ts, end_ts), load, covers)
+
+    def export_events(
+        self,
+        start_ts: float | None = None,
+        end_ts: float | None = None,
+        filters: dict[str, str] | None = None,
+        include_proof: bool = False,
+        consistency_token: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream events oldest-first as plain dicts for bulk export.
+
+        Time range is [start_ts, end_ts) in unix seconds. With include_proof,
+        events anchored in the in-memory tree carry leaf_index and proof.
+        """
+        if include_proof:
+            self._recovery.check()
+        with self._read_scope(consistency_token):
+            if isinstance(self._store, IEventExportPort):
+                events = self._store.iter_events(start_ts=start_ts, end_ts=end_ts, filters=filters)
+            else:
+                events = self._scan_pages(start_ts, end_ts, filters)
+        if self._cold_tier is not None:
+            # Archived events are older than anything left in the store.
+            archived = (
+                event
+                for event in self._cold_tier.iter_events(start_ts, end_ts)
+                if _event_matches(event, None, None, filters)
+            )
+            events = itertools.chain(archived, events)
+        return self._export_records(events, include_proof)
+
+    def _export_records(
+        self, events: Iterator[Any], include_proof: bool
+    ) -> Iterator[dict[str, Any]]:
+        for event in events:
+            record = event.model_dump() if hasattr(event, "model_dump") else event.dict()
+            if include_proof:
+                proof = self._merkle_tree.get_proof(event.event_id)
+                if proof.index < 0 and getattr(event, "epoch", None) is not None:
+                    proof = self._cold_tier.get_proof(event.event_id) or proof
+                if proof.index >= 0:
+                    record["leaf_index"] = proof.index
+                    record["proof"] = proof.model_dump(
+                        include={"entry_hash", "root", "height", "path"}
+                    )
+            yield record
+
+    def _scan_pages(
+        self, start_ts: float | None, end_ts: float | None, filters: dict[str, str] | None
+    ) -> Iterator[Any]:
+        """
+        Export fallback for stores without a streaming scan: walk list() pages.
+
+        Pages come newest first, so the matching events are held until the
+        walk ends and then yielded oldest first.
+        """
+        pages: list[list[Any]] = []
+        before = None
+        while True:
+            page = self._store.list(limit=500, before=before)
+            pages.append([e for e in page.events if _event_matches(e, start_ts, end_ts, filters)])
+            before = getattr(page, "next_cursor", None)
+            if not page.events or not before or not getattr(page, "has_more", False):
+                break
+        for events in reversed(pages):
+            yield from events
+
+
+def _cursor_key(cursor: str | None):
+    """The store key a cursor encodes; None (no bound) if it is not a key cursor."""
+    if not cursor:
+        return None
+    try:
+        return decode_key(cursor)
+    except ValueError:
+        return None
+
+
+def _event_matches(
+    event: Any,
+    start_ts: float | None,
+    end_ts: float | None,
+    filters: dict[str, str] | None,
+) -> bool:
+    if start_ts is not None or end_ts is not None:
+        ts = event_timestamp(event)
+        if (start_ts is not None and ts < start_ts) or (end_ts is not None and ts >= end_ts):
+            return False
+    for field, expected in (filters or {}).items():
+        if expected and field_value(event, field) != expected:
+            return False
+    return True
@@ -0,0 +1,179 @@
+"""
+Write-behind ingest: the write-ahead log acknowledges, the store follows.
+
+With a WAL configured, ``commit`` returns once an event is fsynced in the
+local log, where concurrent commits share one fsync. A background thread
+then ships events to the store in log order, in batches. Store outages are
+retried, and the unshipped backlog is bounded by ``max_unshipped``. For a
+durable store (Postgres, SQLite) the log is checkpointed behind the
+shipper, and segments the store already holds are deleted. For the memory
+store the log is the only durable copy. Once ``snapshot_records`` records
+(or as many as the last snapshot kept, if more) have piled up since the
+last snapshot, the events the store still holds are folded into a new one
+and the log is truncated. Events retention has moved to the archive are
+dropped then, so the log stays about twice the size of the store.
+
+On restart ``replay`` re-ships the snapshot and everything after the
+checkpoint. The store ignores duplicates, so shipping twice is harmless.
+The service then adds the replayed events that the tree lacks, in log
+order, which is the order they were acknowledged in.
+"""
+
+import collections
+import itertools
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from src.core.metrics import WAL_UNSHIPPED
+from src.domain.errors import UnavailableError
+from src.domain.models import Event
+from src.ports.common import IWalPort
+
+logger = logging.getLogger("audit-domain")
+
+
+class WalShipper:
+    """Logs events durably and ships them to the store behind the ack."""
+
+    def __init__(
+        self,
+        wal: IWalPort,
+        store: Any,
+        truncate: bool,
+        batch_size: int = 1000,
+        max_unshipped: int = 100_000,
+        checkpoint_interval: float = 1.0,
+        retry_seconds: float = 1.0,
+        snapshot_records: int = 100_000,
+    ):
+        self._wal = wal
+        self._store = store
+        self._truncate = truncate
+        self.batch_size = batch_size
+        self.max_unshipped = max_unshipped
+        self.checkpoint_interval = checkpoint_interval
+        self.retry_seconds = retry_seconds
+        self.snapshot_records = snapshot_records
+        self._snapshot_kept = 0
+        self._on_ship: list[Callable[[Event], None]] = []
+        self._queue: collections.deque[tuple[int, Any]] = collections.deque()
+        self._changed = threading.Condition()
+        self._shipping = False
+        self._shipped = wal.checkpoint
+        self._checkpointed_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="wal-shipper", daemon=True)
+        self._thread.start()
+
+    @property
+    def unshipped(self) -> int:
+        return len(self._queue)
+
+    async def commit(self, event: Any) -> int:
+        """Write ``event`` to the log and return its sequence number once it is durable."""
+        if len(self._queue) >= self.max_unshipped:
+            raise UnavailableError("Store is behind the write-ahead log", retry_after=5)
+        seq = self._wal.append(event.model_dump_json().encode("utf-8"))
+        await self._wal.synced(seq)
+        with self._changed:
+            self._queue.append((seq, event))
+            WAL_UNSHIPPED.set(len(self._queue))
+            self._changed.notify_all()
+        return seq
+
+    def replay(self) -> Iterator[Event]:
+        """
+        Events logged after the checkpoint, in log order, shipped to the store
+        as they are read. Runs during recovery, before new ingest is admitted.
+        """
+        seq = None
+        records = itertools.chain(
+            self._wal.replay_snapshot(), self._wal.replay(after=self._wal.checkpoint)
+        )
+        for seq, record in records:
+            event = Event.model_validate_json(record)
+            self._store.append(event)
+            yield event
+        if seq is not None:
+            logger.info(f"📜 Replayed the write-ahead log up to record {seq}")
+            self._shipped = seq
+            self._checkpoint(force=True)
+
+    def add_ship_listener(self, listener: Callable[[Event], None]) -> None:
+        """Called on the shipper thread with each event once the store holds it."""
+        self._on_ship.append(listener)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until everything committed so far is in the store."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: not self._queue and not self._shipping, timeout=timeout
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._queue)
+                self._shipping = True
+                batch = list(itertools.islice(self._queue, self.batch_size))
+            try:
+                # A retry may append some events twice; the store ignores duplicates.
+                for _, event in batch:
+                    self._store.append(event)
+            except Exception as e:
+                logger.error(f"Shipping to the store failed, retrying: {e}")
+                with self._changed:
+                    self._shipping = False
+                time.sleep(self.retry_seconds)
+                continue
+            with self._changed:
+                for _ in batch:
+                    self._queue.popleft()
+                self._shipped = batch[-1][0]
+                WAL_UNSHIPPED.set(len(self._queue))
+            # Reads cached between the ack and now missed these events.
+            for listener in self._on_ship:
+                for _, event in batch:
+                    try:
+                        listener(event)
+                    except Exception as e:
+                        logger.error(f"Ship listener failed: {e}")
+            try:
+                self._checkpoint()
+            except Exception as e:
+                logger.error(f"Write-ahead log checkpoint failed: {e}")
+            with self._changed:
+                self._shipping = False
+                self._changed.notify_all()
+
+    def _checkpoint(self, force: bool = False) -> None:
+        """Let the log drop what a durable store now holds."""
+        if not self._truncate:
+            self._snapshot()
+            return
+        now = time.monotonic()
+        if not force and now - self._checkpointed_at < self.checkpoint_interval:
+            return
+        # Stores that batch their own commits (SQLite) must commit first.
+        flush = getattr(self._store, "flush", None)
+        if flush is not None:
+            flush()
+        self._wal.truncate(self._shipped)
+        self._checkpointed_at = now
+
+    def _snapshot(self) -> None:
+        """Memory store: fold the events it still holds into the log's snapshot."""
+        if self._shipped - self._wal.checkpoint < max(self.snapshot_records, self._snapshot_kept):
+            return
+        started = time.monotonic()
+        self._snapshot_kept = self._wal.snapshot(self._shipped, self._still_stored)
+        logger.info(
+            f"📜 Snapshotted the write-ahead log up to record {self._shipped}: "
+            f"{self._snapshot_kept} events kept in {time.monotonic() - started:.1f}s"
+        )
+
+    def _still_stored(self, record: bytes) -> bool:
+        return self._store.exists(json.loads(record)["event_id"])
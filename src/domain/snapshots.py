@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from collections.abc import Callable
+
+from src.domain.merkle import MerkleTree
+from src.domain.models import RootSnapshot
+from src.ports.common import IClockPort, ISignerPort, ISnapshotStorePort
+
+logger = logging.getLogger("audit-domain")
+
+
+class RootSnapshotter:
+    """
+    Seals signed tree heads every ``every_events`` appends or ``every_seconds``.
+
+    Clients poll the sealed heads instead of the live root, so responses are
+    immutable per tree_size and cacheable. Heads only ever grow and extend
+    each other: after recovery, ``check_recovered`` compares the tree with the
+    last published head, and a tree that does not reproduce it (fewer leaves,
+    or another root at that size) never seals.
+
+    With merkle_tree=None it is a read-only view of the history (HTTP workers
+    in multi-worker mode, where the sequencer seals).
+    """
+
+    def __init__(
+        self,
+        merkle_tree: MerkleTree | None,
+        store: ISnapshotStorePort,
+        clock: IClockPort,
+        signer: ISignerPort | None = None,
+        every_events: int = 1000,
+        every_seconds: float = 10.0,
+    ):
+        self._merkle_tree = merkle_tree
+        self._store = store
+        self._clock = clock
+        self._signer = signer
+        self.every_events = every_events
+        self.every_seconds = every_seconds
+        self._latest = store.latest_snapshot()
+        # Why the recovered tree contradicts the published history, if it does.
+        self._diverged: str | None = None
+        self._on_seal: list[Callable[[RootSnapshot], None]] = []
+
+    @property
+    def latest(self) -> RootSnapshot | None:
+        """Last head sealed by this process (the writer)."""
+        return self._latest
+
+    def published(self) -> RootSnapshot | None:
+        """Latest head in the history store, whichever process sealed it."""
+        return self._store.latest_snapshot()
+
+    def history(self, since: int = 0, limit: int = 100) -> list[RootSnapshot]:
+        return self._store.snapshots_since(since, limit)
+
+    def add_seal_listener(self, listener: Callable[[RootSnapshot], None]) -> None:
+        """Called synchronously with each new snapshot, while the tree is at its size."""
+        self._on_seal.append(listener)
+
+    def on_append(self) -> RootSnapshot | None:
+        """Hook for the ingest path, right after the Merkle update."""
+        sealed_size = self._latest.tree_size if self._latest else 0
+        if self._merkle_tree.size - sealed_size >= self.every_events:
+            return self.seal()
+        return None
+
+    def check_recovered(self) -> bool:
+        """After recovery: does the tree reproduce the last published head? Sealing stops if not."""
+        latest = self._latest
+        if self._merkle_tree is None or latest is None:
+            return True
+        size = self._merkle_tree.size
+        if size < latest.tree_size:
+            self._diverged = f"recovered {size} leaves, the last head covers {latest.tree_size}"
+        else:
+            root = self._merkle_tree.root_at(latest.tree_size)
+            if root == latest.root:
+                self._diverged = None
+                return True
+            self._diverged = (
+                f"root at tree_size {latest.tree_size} is {root}, published {latest.root}"
+            )
+        logger.error(
+            f"Recovered tree contradicts the published heads, not sealing: {self._diverged}"
+        )
+        return False
+
+    def seal(self) -> RootSnapshot | None:
+        """Snapshot the current tree head if it grew since the last one."""
+        size = self._merkle_tree.size
+        if (
+            self._diverged is not None
+            or size == 0
+            or (self._latest is not None and size <= self._latest.tree_size)
+        ):
+            return None
+        snapshot = RootSnapshot(
+            tree_size=size, root=self._merkle_tree.get_root().root, timestamp=self._clock.now()
+        )
+        if self._signer is not None:
+            snapshot = snapshot.model_copy(
+                update={
+                    "signature": self._signer.sign(snapshot.signing_payload()).hex(),
+                    "key_id": self._signer.key_id,
+                }
+            )
+        self._store.save_snapshot(snapshot)
+        self._latest = snapshot
+        for listener in self._on_seal:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot listener failed: {e}")
+        return snapshot
+
+    async def run_periodic(self) -> None:
+        """Seal on the time trigger; run as a task on the loop that does ingest."""
+        while True:
+            await asyncio.sleep(self.every_seconds)
+            try:
+                self.seal()
+            except Exception as e:
+                logger.error(f"Root snapshot failed: {e}")
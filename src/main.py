@@ -1,10 +1,70 @@
 """
 Talos Audit Service - Entrypoint
+
+    python -m src.main                      # single process
+    python -m src.main --workers 4          # sequencer + 4 HTTP workers
+
+With --workers > 1 a dedicated sequencer process owns the Merkle tree and
+leaf ordering; the uvicorn workers parse, validate and hash-verify events in
+parallel and commit them through the sequencer. Workers share one store, so
+this mode needs storage_type=postgres.
 """
 
+import argparse
+import multiprocessing
+import os
+import secrets
+import time
+
 from src.adapters.http.main import app
 
-if __name__ == "__main__":
+
+def start_sequencer() -> multiprocessing.Process:
+    """Spawn the sequencer and export its address/authkey for the workers."""
+    from src.core.sequencer import default_address, run_sequencer
+
+    address = default_address()
+    authkey = secrets.token_bytes(32)
+    process = multiprocessing.Process(
+        target=run_sequencer, args=(address, authkey), name="audit-sequencer", daemon=True
+    )
+    process.start()
+    # The socket appears once recovery from the store has finished.
+    while not os.path.exists(address):
+        if not process.is_alive():
+            raise SystemExit(f"Sequencer exited during startup (code {process.exitcode})")
+        time.sleep(0.1)
+
+    os.environ["TALOS_SEQUENCER_ADDRESS"] = address
+    os.environ["TALOS_SEQUENCER_AUTHKEY"] = authkey.hex()
+    return process
+
+
+def main(argv=None) -> None:
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    parser = argparse.ArgumentParser(description="Talos Audit Service")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.workers <= 1:
+        uvicorn.run(app, host=args.host, port=args.port)
+        return
+
+    from src.config import settings
+
+    if settings.storage_type != "postgres":
+        raise SystemExit("--workers > 1 needs a shared store (storage_type=postgres)")
+
+    sequencer = start_sequencer()
+    try:
+        uvicorn.run("src.main:app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        sequencer.terminate()
+        sequencer.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
-from abc import ABC, abstractmethod
 import time
 import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager
+from typing import Any
 
 
 class IClockPort(ABC):
@@ -23,3 +26,187 @@ class SystemClockAdapter(IClockPort):
 class UuidIdAdapter(IIdPort):
     def generate_id(self) -> str:
         return str(uuid.uuid4())
+
+
+class IEventIndexPort(ABC):
+    """
+    Optional store capability: authoritative event_id lookups.
+
+    Stores that keep more history than fits in the Merkle tree implement this
+    so duplicate detection stays correct for events outside memory.
+    """
+
+    @abstractmethod
+    def exists(self, event_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    def iter_event_ids(self) -> Iterator[str]:
+        pass
+
+
+class IEventExportPort(ABC):
+    """Optional store capability: oldest-first streaming scan for bulk export."""
+
+    @abstractmethod
+    def iter_events(
+        self,
+        start_ts: float | None = None,
+        end_ts: float | None = None,
+        filters: Any = None,
+        batch_size: int = 5000,
+    ) -> Iterator[Any]:
+        pass
+
+
+class IReadConsistencyPort(ABC):
+    """
+    Optional store capability: reads may be served by lagging replicas.
+
+    consistency_token() returns an opaque token covering every write committed
+    so far; reads inside read_after(token) only use a replica that has caught
+    up to it (otherwise the primary), giving read-your-writes on demand.
+    """
+
+    @abstractmethod
+    def consistency_token(self) -> str | None:
+        pass
+
+    @abstractmethod
+    def read_after(self, token: str | None) -> AbstractContextManager[None]:
+        pass
+
+
+class ISignerPort(ABC):
+    """Signs tree heads; key_id identifies the verification key."""
+
+    @property
+    @abstractmethod
+    def key_id(self) -> str:
+        pass
+
+    @abstractmethod
+    def sign(self, message: bytes) -> bytes:
+        pass
+
+
+class ISnapshotStorePort(ABC):
+    """History of sealed root snapshots, ordered by tree_size."""
+
+    @abstractmethod
+    def save_snapshot(self, snapshot: Any) -> None:
+        pass
+
+    @abstractmethod
+    def latest_snapshot(self) -> Any | None:
+        pass
+
+    @abstractmethod
+    def snapshots_since(self, tree_size: int, limit: int = 100) -> list[Any]:
+        """Snapshots with tree_size strictly greater than ``tree_size``, oldest first."""
+
+
+class IRetentionPort(ABC):
+    """Optional store capability: drop events once the cold tier holds them."""
+
+    @abstractmethod
+    def delete_events(self, event_ids: Sequence[str]) -> int:
+        pass
+
+
+class IArchivePort(ABC):
+    """
+    Cold tier: immutable segments of archived events, one epoch each.
+
+    Rows are plain dicts of the hydrated Event fields plus ``cursor``,
+    ``timestamp``, ``leaf_hash`` (hex) and ``tree_index`` (the event's leaf
+    index in the live tree, or None); reads hand back row objects with
+    attribute access and ``model_dump()``, like the stores do.
+    """
+
+    @abstractmethod
+    def write_segment(self, segment: Any, rows: list[dict[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    def segments(self) -> list[Any]:
+        """Segment headers, oldest epoch first."""
+
+    @abstractmethod
+    def locate(self, event_id: str) -> int | None:
+        """Epoch of the segment holding event_id, if archived."""
+
+    @abstractmethod
+    def read_leaves(self, epoch: int) -> tuple[list[str], list[bytes]]:
+        """Event ids and leaf hashes of a segment, in leaf order."""
+
+    @abstractmethod
+    def iter_tree_leaves(self) -> Iterator[tuple[int | None, str, bytes]]:
+        """(tree index, event id, leaf hash) of every archived event, oldest epoch first."""
+
+    @abstractmethod
+    def iter_events(
+        self, start_ts: float | None = None, end_ts: float | None = None
+    ) -> Iterator[Any]:
+        """Archived events in [start_ts, end_ts), segment by segment in key order."""
+
+    @abstractmethod
+    def list(self, before: str | None = None, limit: int = 100) -> list[Any]:
+        """The newest ``limit`` archived events with cursor < before, oldest first."""
+
+    @abstractmethod
+    def iter_event_ids(self) -> Iterator[str]:
+        pass
+
+
+class ILeafStorePort(ABC):
+    """
+    Optional store capability: every event's Merkle leaf hash, in append order.
+
+    Recovery then rebuilds the whole tree from the stored leaves, without
+    reading or re-hashing the events.
+    """
+
+    @abstractmethod
+    def iter_leaves(self) -> Iterator[tuple[str, bytes]]:
+        """(event_id, leaf hash) for every stored event, oldest append first."""
+
+
+class IWalPort(ABC):
+    """
+    Local append-only log that ingest makes durable before acknowledging.
+
+    Records get increasing sequence numbers. ``synced`` resolves once a
+    record is on disk, and ``truncate`` drops records that a durable store
+    already holds. Where the log is the only durable copy, ``snapshot``
+    keeps the records still wanted and drops the rest.
+    """
+
+    @property
+    @abstractmethod
+    def checkpoint(self) -> int:
+        """Highest sequence number passed to ``truncate`` (0 if none)."""
+
+    @abstractmethod
+    def append(self, record: bytes) -> int:
+        """Write a record (not yet synced); returns its sequence number."""
+
+    @abstractmethod
+    async def synced(self, seq: int) -> None:
+        """Return once record ``seq`` and all before it are fsynced."""
+
+    @abstractmethod
+    def replay(self, after: int = 0) -> Iterator[tuple[int, bytes]]:
+        """(seq, record) for every record after ``after``, in order."""
+
+    @abstractmethod
+    def truncate(self, upto: int) -> None:
+        """Records up to ``upto`` are stored elsewhere; their segments may be deleted."""
+
+    @abstractmethod
+    def snapshot(self, upto: int, keep: Callable[[bytes], bool]) -> int:
+        """Keep only the records up to ``upto`` that ``keep`` accepts, then truncate."""
+
+    @abstractmethod
+    def replay_snapshot(self) -> Iterator[tuple[int, bytes]]:
+        """(seq, record) kept by the last ``snapshot``, in order; all at or below the checkpoint."""
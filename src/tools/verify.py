@@ -0,0 +1,513 @@
+"""
+Offline verification of the audit log against its published roots.
+
+    python -m src.tools.verify --export events.ndjson.gz --snapshots roots.json
+    python -m src.tools.verify --export events.ndjson --archive archive/
+
+Every event is re-canonicalized and its ``event_hash`` recomputed. The leaf
+hashes are folded into a Merkle root the same way the service builds its tree:
+leaves in tree order, with an odd node paired with itself. An export is in
+store order (whole-second timestamp, then event_id), not tree order, so
+exports taken with ``include_proof=true`` are put back in ``leaf_index``
+order first. Each snapshot head is compared with the root of its first
+``tree_size`` leaves, and signed heads have their signatures checked. With
+``--archive``, every segment's leaf hashes and epoch root are checked too.
+The first divergence is reported and the exit status is 1.
+
+Hashing is spread over worker processes. The log is cut into aligned chunks
+of ``2**k`` events. Each worker returns the root of its chunk's complete
+subtree, plus the partial frontier at any snapshot boundary inside the chunk,
+so the parent process only combines O(log n) nodes per chunk.
+"""
+
+import argparse
+import bisect
+import contextlib
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from src.client.verify import Frontier, frontier_root, push_node
+from src.domain.models import ArchiveSegment, RootSnapshot, as_event
+
+try:  # Optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+CHUNK_EVENTS = 1 << 14
+
+
+def _merge(low: Frontier, high: Frontier, level: int) -> Frontier:
+    """Frontier levels below ``level`` from ``low``, the rest from ``high``."""
+    merged = list(low[:level]) + [None] * (level - len(low[:level]))
+    return merged + high[level:]
+
+
+@dataclass
+class EventMismatch:
+    index: int
+    event_id: str
+    reason: str
+
+
+@dataclass
+class SnapshotMismatch:
+    tree_size: int
+    root: str
+    computed: str
+    reason: str
+    # Largest tree_size that matched before this one: the divergence lies after it.
+    last_good: int = 0
+
+
+@dataclass
+class SegmentMismatch:
+    epoch: int
+    reason: str
+
+
+@dataclass
+class VerifyReport:
+    events: int = 0
+    root: str = ""
+    hash_mismatches: int = 0
+    first_mismatch: EventMismatch | None = None
+    snapshots_checked: int = 0
+    first_bad_snapshot: SnapshotMismatch | None = None
+    unchecked_signatures: int = 0
+    segments_checked: int = 0
+    first_bad_segment: SegmentMismatch | None = None
+    seconds: float = 0.0
+    notes: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return (
+            self.first_mismatch is None
+            and self.first_bad_snapshot is None
+            and self.first_bad_segment is None
+        )
+
+    def summary(self) -> list[str]:
+        rate = self.events / self.seconds * 60 if self.seconds else 0.0
+        lines = [
+            f"events:     {self.events} ({rate:,.0f}/min)",
+            f"root:       {self.root or '-'}",
+            f"snapshots:  {self.snapshots_checked} checked",
+        ]
+        if self.segments_checked:
+            lines.append(f"segments:   {self.segments_checked} checked")
+        if self.unchecked_signatures:
+            lines.append(f"signatures: {self.unchecked_signatures} not checked")
+        lines += [f"note:       {note}" for note in self.notes]
+        if self.first_mismatch is not None:
+            m = self.first_mismatch
+            lines.append(
+                f"DIVERGENCE: event {m.index} ({m.event_id}): {m.reason} "
+                f"[{self.hash_mismatches} events in total]"
+            )
+        if self.first_bad_snapshot is not None:
+            s = self.first_bad_snapshot
+            lines.append(
+                f"DIVERGENCE: snapshot at tree_size {s.tree_size}: {s.reason} "
+                f"(last matching tree_size {s.last_good})"
+            )
+        if self.first_bad_segment is not None:
+            lines.append(
+                f"DIVERGENCE: archive epoch {self.first_bad_segment.epoch}: "
+                f"{self.first_bad_segment.reason}"
+            )
+        lines.append("OK" if self.ok else "FAILED")
+        return lines
+
+
+@dataclass
+class _ChunkResult:
+    count: int
+    frontier: Frontier
+    boundaries: dict[int, Frontier]
+    mismatches: int
+    first_mismatch: EventMismatch | None
+
+
+def _leaf(record: Any) -> tuple[bytes, str, str | None]:
+    """(leaf hash, event_id, problem) for one export line or record dict."""
+    try:
+        if isinstance(record, (bytes, str)):
+            record = json.loads(record)
+        event = as_event(SimpleNamespace(**record))
+        digest = hashlib.sha256(str(event).encode("utf-8")).digest()
+    except (TypeError, ValueError, AttributeError) as e:
+        # No leaf can be derived; a zero leaf makes every later head diverge too.
+        event_id = record.get("event_id", "?") if isinstance(record, dict) else "?"
+        return bytes(32), str(event_id), f"unreadable record: {e}"
+    if digest.hex() != event.event_hash:
+        return digest, event.event_id, f"event_hash {event.event_hash or '-'} != {digest.hex()}"
+    return digest, event.event_id, None
+
+
+def _hash_chunk(start: int, records: list[Any], boundaries: list[int]) -> _ChunkResult:
+    """Worker: hash one chunk, recording the frontier after each boundary offset."""
+    frontier: Frontier = []
+    wanted = set(boundaries)
+    at: dict[int, Frontier] = {}
+    mismatches = 0
+    first: EventMismatch | None = None
+    for offset, record in enumerate(records, 1):
+        leaf, event_id, problem = _leaf(record)
+        if problem is not None:
+            mismatches += 1
+            if first is None:
+                first = EventMismatch(start + offset - 1, event_id, problem)
+        push_node(frontier, leaf)
+        if offset in wanted:
+            at[offset] = list(frontier)
+    return _ChunkResult(len(records), frontier, at, mismatches, first)
+
+
+def _signature_ok(head: Any, key: str | None) -> bool | None:
+    """True/False for a signed head; None when unsigned or cryptography is missing."""
+    if not head.signature:
+        return False if key else None
+    if key and head.key_id != key:
+        return False
+    from src.adapters.signing import verify_ed25519
+
+    try:
+        return verify_ed25519(head.signing_payload(), head.signature, head.key_id or "")
+    except RuntimeError:
+        return None
+
+
+def _record(event: Any) -> Any:
+    """Store rows and archive rows become plain dicts before crossing to a worker."""
+    if isinstance(event, (bytes, str, dict)):
+        return event
+    return event.model_dump() if hasattr(event, "model_dump") else event.dict()
+
+
+class _InlineExecutor(Executor):
+    """Runs submissions in the calling process (workers=1, and tests)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def _executor(workers: int) -> Executor:
+    return ProcessPoolExecutor(max_workers=workers) if workers > 1 else _InlineExecutor()
+
+
+def _leaf_index(record: Any) -> int | None:
+    if isinstance(record, (bytes, str)):
+        try:
+            record = json.loads(record)
+        except ValueError:
+            return None
+    index = record.get("leaf_index") if isinstance(record, dict) else None
+    return index if isinstance(index, int) and index >= 0 else None
+
+
+def in_leaf_order(records: Iterable[Any], report: VerifyReport | None = None) -> Iterator[Any]:
+    """
+    ``records`` in tree order, by the ``leaf_index`` of ``include_proof`` exports.
+
+    Events of the same second arrive in any order but are exported by
+    event_id; each is held until the leaves before it have come by. Records
+    with no usable ``leaf_index`` go last. An export without any keeps its
+    order, which matches the tree only if it is the arrival order.
+    """
+    source = iter(records)
+    first = next(source, None)
+    if first is None:
+        return
+    if _leaf_index(first) is None:
+        if report is not None:
+            report.notes.append("records carry no leaf_index; leaves are taken in file order")
+        yield first
+        yield from source
+        return
+    held: dict[int, Any] = {}
+    unplaced: list[Any] = []
+    expected = 0
+    for record in itertools.chain([first], source):
+        index = _leaf_index(record)
+        if index is None or index < expected or index in held:
+            unplaced.append(record)
+            continue
+        held[index] = record
+        while expected in held:
+            yield held.pop(expected)
+            expected += 1
+    if held and report is not None:
+        report.notes.append(f"leaf {expected} is missing from the export")
+    for index in sorted(held):
+        yield held[index]
+    if unplaced and report is not None:
+        report.notes.append(f"{len(unplaced)} records without a usable leaf_index are last")
+    yield from unplaced
+
+
+def verify_log(
+    records: Iterable[Any],
+    snapshots: Iterable[RootSnapshot] = (),
+    workers: int = 1,
+    chunk_size: int = CHUNK_EVENTS,
+    key: str | None = None,
+    report: VerifyReport | None = None,
+) -> VerifyReport:
+    """
+    Recompute event hashes and roots over ``records`` (export lines or rows, in
+    tree order) and compare against ``snapshots``. ``chunk_size`` must be a power
+    of two.
+    """
+    if chunk_size < 1 or chunk_size & (chunk_size - 1):
+        raise ValueError("chunk_size must be a power of two")
+    level = chunk_size.bit_length() - 1
+    report = report or VerifyReport()
+    started = time.perf_counter()
+
+    heads = sorted(snapshots, key=lambda head: head.tree_size)
+    sizes = [head.tree_size for head in heads]
+    by_size = {head.tree_size: head for head in heads}
+    last_good = 0
+
+    def check(tree_size: int, frontier: Frontier) -> None:
+        nonlocal last_good
+        head = by_size[tree_size]
+        computed = frontier_root(frontier)
+        report.snapshots_checked += 1
+        reason = None
+        if computed != head.root:
+            reason = f"published root {head.root} != recomputed {computed}"
+        else:
+            signed = _signature_ok(head, key)
+            if signed is None and head.signature:
+                report.unchecked_signatures += 1
+            elif signed is False:
+                reason = "signature does not verify" if head.signature else "head is not signed"
+        if reason is None:
+            last_good = tree_size
+        elif report.first_bad_snapshot is None:
+            report.first_bad_snapshot = SnapshotMismatch(
+                tree_size, head.root, computed, reason, last_good
+            )
+
+    total: Frontier = []
+    events = 0
+
+    def absorb(result: _ChunkResult) -> None:
+        nonlocal events
+        for offset in sorted(result.boundaries):
+            if offset < chunk_size:
+                check(events + offset, _merge(result.boundaries[offset], total, level))
+        if result.count == chunk_size:
+            push_node(total, result.frontier[level], level)
+            if chunk_size in result.boundaries:
+                check(events + chunk_size, total)
+        else:
+            total[:] = _merge(result.frontier, total, level)
+        events += result.count
+        report.hash_mismatches += result.mismatches
+        if report.first_mismatch is None:
+            report.first_mismatch = result.first_mismatch
+
+    source = iter(records)
+    pending: deque[Future] = deque()
+    with _executor(workers) as pool:
+        start = 0
+        while True:
+            chunk = [_record(record) for record in itertools.islice(source, chunk_size)]
+            if chunk:
+                lo = bisect.bisect_right(sizes, start)
+                hi = bisect.bisect_right(sizes, start + len(chunk))
+                offsets = [size - start for size in sizes[lo:hi]]
+                pending.append(pool.submit(_hash_chunk, start, chunk, offsets))
+                start += len(chunk)
+            # Results are absorbed in log order; keep a bounded number in flight.
+            while len(pending) >= 2 * max(workers, 1):
+                absorb(pending.popleft().result())
+            if len(chunk) < chunk_size:
+                break
+        while pending:
+            absorb(pending.popleft().result())
+
+    report.events = events
+    report.root = frontier_root(total)
+    beyond = [size for size in sizes if size > events]
+    if beyond and report.first_bad_snapshot is None:
+        head = by_size[beyond[0]]
+        report.first_bad_snapshot = SnapshotMismatch(
+            head.tree_size,
+            head.root,
+            "",
+            f"head published for {head.tree_size} events but the log has {events}",
+            last_good,
+        )
+    report.seconds += time.perf_counter() - started
+    return report
+
+
+def _check_segment(directory: str, epoch: int) -> str | None:
+    """Worker: recheck one archive segment; returns what is wrong with it, if anything."""
+    from src.adapters.archive import SegmentArchive
+
+    archive = SegmentArchive(directory)
+    segment = next(s for s in archive.segments() if s.epoch == epoch)
+    _, leaves = archive.read_leaves(epoch)
+    window = archive.iter_events(
+        start_ts=segment.start_ts, end_ts=math.nextafter(segment.end_ts, math.inf)
+    )
+    rows = [row for row in window if row.epoch == epoch]
+    if not len(rows) == len(leaves) == segment.count:
+        return f"{len(rows)} rows and {len(leaves)} leaves, header says {segment.count}"
+    frontier: Frontier = []
+    for index, (row, leaf) in enumerate(zip(rows, leaves)):
+        computed, event_id, problem = _leaf(row.model_dump())
+        if problem is not None:
+            return f"row {index} ({event_id}): {problem}"
+        if computed != leaf:
+            return f"row {index} ({event_id}) does not match its stored leaf hash"
+        push_node(frontier, leaf)
+    root = frontier_root(frontier)
+    if root != segment.root:
+        return f"epoch root {segment.root} != recomputed {root}"
+    return None
+
+
+def verify_archive(
+    directory: str,
+    segments: list[ArchiveSegment],
+    workers: int = 1,
+    key: str | None = None,
+    report: VerifyReport | None = None,
+) -> VerifyReport:
+    """Recheck every archive segment's rows, leaf hashes, epoch root and signature."""
+    report = report or VerifyReport()
+    started = time.perf_counter()
+    with _executor(workers) as pool:
+        futures = [pool.submit(_check_segment, directory, s.epoch) for s in segments]
+        for segment, future in zip(segments, futures):
+            problem = future.result()
+            if problem is None:
+                signed = _signature_ok(segment, key)
+                if signed is None and segment.signature:
+                    report.unchecked_signatures += 1
+                elif signed is False:
+                    problem = "signature does not verify" if segment.signature else "not signed"
+            report.segments_checked += 1
+            if problem is not None and report.first_bad_segment is None:
+                report.first_bad_segment = SegmentMismatch(segment.epoch, problem)
+    report.seconds += time.perf_counter() - started
+    return report
+
+
+def read_export(path: str) -> Iterator[bytes]:
+    """NDJSON lines of an export file; ``.gz`` and ``.zst`` are decompressed, ``-`` is stdin."""
+    with contextlib.ExitStack() as stack:
+        if path == "-":
+            stream: Any = sys.stdin.buffer
+        elif path.endswith(".gz"):
+            stream = stack.enter_context(gzip.open(path, "rb"))
+        elif path.endswith(".zst"):
+            if zstandard is None:
+                raise SystemExit(f"{path} is zstd-compressed; install zstandard")
+            raw = stack.enter_context(open(path, "rb"))
+            reader = zstandard.ZstdDecompressor().stream_reader(raw)
+            stream = stack.enter_context(io.BufferedReader(reader))
+        else:
+            stream = stack.enter_context(open(path, "rb"))
+        for line in stream:
+            if line.strip():
+                yield line
+
+
+def read_snapshots(path: str) -> list[RootSnapshot]:
+    """Heads from a JSON list, saved ``GET /roots`` pages, or NDJSON of either."""
+    text = Path(path).read_text()
+    try:
+        documents = [json.loads(text)]
+    except json.JSONDecodeError:
+        documents = [json.loads(line) for line in text.splitlines() if line.strip()]
+    heads: list[RootSnapshot] = []
+    for document in documents:
+        if isinstance(document, dict) and "items" in document:
+            document = document["items"]
+        items = document if isinstance(document, list) else [document]
+        heads += [RootSnapshot(**item) for item in items]
+    return heads
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Verify the audit log's event hashes and Merkle roots against its snapshots"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--export", help="NDJSON export (.gz/.zst accepted, '-' for stdin)")
+    source.add_argument(
+        "--dsn", help="Not supported: Postgres rows do not keep the canonical event body"
+    )
+    parser.add_argument("--snapshots", help="Heads to check: JSON list, GET /roots pages or NDJSON")
+    parser.add_argument("--archive", help="Archive directory: check its segments")
+    parser.add_argument("--key", help="Require snapshots to be signed by this key_id")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_EVENTS)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.dsn:
+        # EventRow rebuilds principal/http/surface_id and truncates ts, so every
+        # event would fail its hash, and its key order is not the tree order.
+        parser.error(
+            "--dsn is not supported: Postgres does not store the canonical event; "
+            "verify an export taken with include_proof=true instead"
+        )
+
+    report = VerifyReport()
+    archive = None
+    if args.archive:
+        from src.adapters.archive import SegmentArchive
+
+        if not os.path.isdir(args.archive):
+            parser.error(f"{args.archive} is not a directory")
+        archive = SegmentArchive(args.archive)
+
+    records = in_leaf_order(read_export(args.export), report)
+    heads = read_snapshots(args.snapshots) if args.snapshots else []
+    if not heads:
+        report.notes.append("no snapshots to compare; only event hashes were checked")
+
+    try:
+        verify_log(records, heads, args.workers, args.chunk_size, args.key, report)
+        if archive is not None:
+            verify_archive(args.archive, archive.segments(), args.workers, args.key, report)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.json:
+        print(json.dumps(dict(asdict(report), ok=report.ok), indent=2))
+    else:
+        print("\n".join(report.summary()))
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
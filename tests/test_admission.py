@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import httpx
+from fastapi.testclient import TestClient
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.http.main import app
+from src.adapters.memory_store import IndexedMemoryStore
+from src.bootstrap import get_admission, get_audit_service
+from src.core.admission import AdmissionController
+from src.domain.errors import OverloadedError, UnavailableError
+from src.domain.merkle import MerkleTree
+from src.domain.services import AuditService
+
+
+def build_valid_event(event_id):
+    event = {
+        "schema_id": "talos.audit_event",
+        "schema_version": "v1",
+        "event_id": event_id,
+        "ts": "2026-01-11T18:23:45.123Z",
+        "request_id": "req-1",
+        "surface_id": "test.op",
+        "outcome": "success",
+        "principal": {"auth_mode": "bearer", "principal_id": "p-1", "team_id": "t-1"},
+        "http": {"method": "GET", "path": "/v1/test", "status_code": 200},
+        "meta": {},
+        "resource": None,
+    }
+    canonical = json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    event["event_hash"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return event
+
+
+class TestAimdLimit(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.controller = AdmissionController(
+            min_limit=2, max_limit=20, target_latency=0.1, initial_limit=10,
+            clock=lambda: self.now,
+        )  # fmt: skip
+
+    def complete(self, latency, in_flight=10):
+        self.controller._in_flight = in_flight
+        self.controller.release(latency)
+
+    def test_slow_commits_cut_the_limit_once_per_latency(self):
+        for _ in range(5):  # one slow burst
+            self.complete(0.5)
+        self.assertEqual(self.controller.limit, 9)
+        self.now = 1.0
+        for _ in range(20):
+            self.complete(0.5)
+            self.now += 0.5
+        self.assertEqual(self.controller.limit, 2)
+
+    def test_fast_commits_grow_the_limit_only_while_it_is_used(self):
+        for _ in range(30):
+            self.complete(0.01, in_flight=1)
+        self.assertEqual(self.controller.limit, 10)
+        for _ in range(30):
+            self.complete(0.01)
+        self.assertEqual(self.controller.limit, 12)
+
+
+class TestQueueAndShedding(unittest.TestCase):
+    def test_over_the_limit_requests_queue_then_are_shed(self):
+        async def scenario():
+            controller = AdmissionController(
+                min_limit=1, max_limit=1, max_queue=1, queue_timeout=0.05
+            )
+            await controller.acquire()
+            waiting = asyncio.create_task(controller.acquire())
+            await asyncio.sleep(0)
+            self.assertEqual((controller.in_flight, controller.queued), (1, 1))
+            with self.assertRaises(OverloadedError) as shed:
+                await controller.acquire()
+            self.assertGreaterEqual(shed.exception.retry_after, 1)
+
+            controller.release()  # hands the slot to the waiter
+            await waiting
+            self.assertEqual((controller.in_flight, controller.queued), (1, 0))
+            with self.assertRaises(UnavailableError):  # nothing frees up in time
+                await controller.acquire()
+            self.assertEqual(controller.queued, 0)
+
+        asyncio.run(scenario())
+
+    def test_ingest_answers_429_with_retry_after(self):
+        full = AdmissionController(min_limit=1, max_limit=1, max_queue=0)
+        full._in_flight = 1
+        app.dependency_overrides[get_admission] = lambda: full
+        try:
+            client = TestClient(app)
+            resp = client.post("/events", json=build_valid_event("shed-1"))
+            self.assertEqual(resp.status_code, 429)
+            self.assertIn("retry-after", resp.headers)
+
+            full._in_flight = 0
+            resp = client.post("/events?ack=minimal", json=build_valid_event("admitted-1"))
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(full.in_flight, 0)
+        finally:
+            app.dependency_overrides.pop(get_admission, None)
+
+
+class SlowStore(IndexedMemoryStore):
+    """Memory store whose writes take a while, like a struggling database."""
+
+    def __init__(self):
+        super().__init__()
+        self.writing = threading.Event()
+
+    def append(self, event):
+        self.writing.set()
+        time.sleep(0.3)
+        return super().append(event)
+
+
+class TestSlowStore(unittest.TestCase):
+    def test_requests_are_shed_while_a_write_is_in_progress(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        store = SlowStore()
+        service = AuditService(
+            store=store, merkle_tree=MerkleTree(hash_port), clock=MagicMock(), id_gen=MagicMock()
+        )
+        admission = AdmissionController(min_limit=1, max_limit=1, max_queue=1, queue_timeout=5)
+        app.dependency_overrides[get_audit_service] = lambda: service
+        app.dependency_overrides[get_admission] = lambda: admission
+        self.addCleanup(app.dependency_overrides.pop, get_audit_service, None)
+        self.addCleanup(app.dependency_overrides.pop, get_admission, None)
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+                def post(event_id):
+                    return client.post("/events?ack=minimal", json=build_valid_event(event_id))
+
+                first = asyncio.create_task(post("slow-0"))
+                # The loop keeps running while the store writes, so these are
+                # admission's to queue (one) and shed (the other).
+                await asyncio.wait_for(asyncio.to_thread(store.writing.wait, 5), 1)
+                self.assertEqual(admission.in_flight, 1)
+                later = await asyncio.gather(post("slow-1"), post("slow-2"))
+                return [await first, *later]
+
+        responses = asyncio.run(scenario())
+        self.assertEqual(sorted(r.status_code for r in responses), [200, 200, 429])
+        self.assertEqual(service._merkle_tree.size, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
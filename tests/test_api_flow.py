@@ -67,3 +67,29 @@ class TestApiFlow(unittest.TestCase):
         resp = self.client.post("/events", json=payload3)
         self.assertEqual(resp.status_code, 400)
         self.assertIn("hash mismatch", resp.json()["detail"].lower())
+
+    def test_minimal_ack(self):
+        payload = build_valid_event("ack-1")
+        resp = self.client.post("/events?ack=minimal", json=payload)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers["content-type"], "application/json")
+        data = resp.json()
+        self.assertEqual(set(data), {"event_id", "leaf_index", "root"})
+        self.assertEqual(data["event_id"], "ack-1")
+
+        proof = self.client.get("/proof/ack-1").json()
+        self.assertEqual(proof["index"], data["leaf_index"])
+
+    def test_list_events_shape(self):
+        self.client.post("/events", json=build_valid_event("list-1"))
+        resp = self.client.get("/api/events?limit=5")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(set(resp.json()), {"items", "next_cursor", "has_more"})
+
+    def test_metrics_expose_stage_histograms(self):
+        self.client.post("/events", json=build_valid_event("metrics-1"))
+        body = self.client.get("/metrics").text
+        for stage in ("canonicalize", "verify_hash", "store_append", "merkle_update"):
+            self.assertIn(f'audit_ingest_stage_seconds_count{{stage="{stage}"}}', body)
+        self.assertIn("audit_merkle_tree_size", body)
+        self.assertIn("audit_sse_subscribers", body)
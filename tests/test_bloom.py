@@ -0,0 +1,42 @@
+import unittest
+
+from src.domain.bloom import BloomFilter, ScalableBloomFilter, _digest
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add_hashed(*_digest(f"evt-{i}"))
+        for i in range(1000):
+            self.assertTrue(bloom.contains_hashed(*_digest(f"evt-{i}")))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=0, error_rate=0.01)
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=10, error_rate=1.5)
+
+
+class TestScalableBloomFilter(unittest.TestCase):
+    def test_grows_past_initial_capacity(self):
+        bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+        ids = [f"evt-{i}" for i in range(5000)]
+        for event_id in ids:
+            bloom.add(event_id)
+
+        self.assertEqual(len(bloom), len(ids))
+        self.assertGreater(len(bloom._filters), 1)
+        self.assertTrue(all(event_id in bloom for event_id in ids))
+
+    def test_false_positive_rate_is_bounded(self):
+        bloom = ScalableBloomFilter(initial_capacity=500, error_rate=0.01)
+        for i in range(10000):
+            bloom.add(f"known-{i}")
+
+        false_positives = sum(bloom.might_contain(f"unknown-{i}") for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
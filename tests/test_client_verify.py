@@ -0,0 +1,96 @@
+import hashlib
+import unittest
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.http.main import app
+from src.client.verify import BatchVerifier, verify_consistency, verify_proof, verify_proofs
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event
+
+
+def build_valid_event(event_id):
+    event = Event(
+        event_id=event_id,
+        ts="2026-01-11T18:23:45.123Z",
+        request_id="req-1",
+        surface_id="test.op",
+        outcome="success",
+        principal={"principal_id": "p-1"},
+        http={"method": "GET", "path": "/v1/test"},
+        meta={},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+class TestClientVerify(unittest.TestCase):
+    def setUp(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        self.events = [build_valid_event(f"e-{i}") for i in range(37)]
+        self.tree = MerkleTree(hash_port)
+        self.roots = {}
+        for event in self.events:
+            self.tree.add_leaf(event)
+            self.roots[self.tree.size] = self.tree.get_root().root
+        self.root = self.tree.get_root().root
+        self.proofs = [self.tree.get_proof(event.event_id) for event in self.events]
+
+    def test_single_proofs(self):
+        for event, proof in zip(self.events, self.proofs):
+            self.assertTrue(verify_proof(proof, self.root, event=event))
+            self.assertTrue(verify_proof(proof.model_dump(mode="json"), self.root))
+        self.assertFalse(verify_proof(self.proofs[3], self.root, event=self.events[4]))
+        self.assertFalse(verify_proof(self.proofs[3], self.roots[36]))
+
+    def test_batch_shares_verified_nodes(self):
+        verifier = BatchVerifier(self.root)
+        self.assertTrue(verifier.verify(self.proofs[4]))
+        # A forgery is caught at the first cached node it meets (4 and 5 share a parent).
+        forged = self.proofs[5].model_copy(deep=True)
+        forged.path[0].hash = "00" * 32
+        self.assertFalse(verifier.verify(forged))
+        self.assertEqual(verifier.verify_all(self.proofs), [True] * 37)
+
+    def test_batch_rejects_paths_that_contradict_the_index(self):
+        wrong_index = self.proofs[6].model_copy(update={"index": 7})
+        self.assertFalse(BatchVerifier(self.root).verify(wrong_index))
+        too_large = self.proofs[6].model_copy(update={"index": 6 + 2 ** len(self.proofs[6].path)})
+        self.assertFalse(BatchVerifier(self.root).verify(too_large))
+
+    def test_batch_against_a_wrong_root(self):
+        self.assertEqual(verify_proofs(self.proofs, self.roots[36]), [False] * 37)
+
+    def test_consistency_between_every_pair_of_sizes(self):
+        for first in range(1, 38):
+            for second in range(first, 38):
+                proof = self.tree.get_consistency_proof(first, second)
+                self.assertTrue(
+                    verify_consistency(proof, self.roots[first], self.roots[second]),
+                    (first, second),
+                )
+
+    def test_inconsistent_roots_fail(self):
+        proof = self.tree.get_consistency_proof(10, 30)
+        self.assertFalse(verify_consistency(proof, self.roots[11], self.roots[30]))
+        self.assertFalse(verify_consistency(proof, self.roots[10], self.roots[31]))
+        tampered = proof.model_dump()
+        tampered["extension"][0]["hash"] = "00" * 32
+        self.assertFalse(verify_consistency(tampered, self.roots[10], self.roots[30]))
+        misaligned = proof.model_dump()
+        misaligned["extension"][0]["level"] += 1
+        self.assertFalse(verify_consistency(misaligned, self.roots[10], self.roots[30]))
+
+    def test_consistency_rejects_sizes_beyond_the_tree(self):
+        with self.assertRaises(ValueError):
+            self.tree.get_consistency_proof(5, 38)
+        response = TestClient(app).get("/consistency", params={"first": 5, "second": 2})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
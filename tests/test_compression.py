@@ -0,0 +1,133 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import unittest
+import zlib
+
+from fastapi.testclient import TestClient
+
+from src.adapters.http.compression import (
+    CompressionMiddleware,
+    DecompressedTooLarge,
+    decompress,
+    negotiate,
+)
+from src.adapters.http.main import app
+
+
+def build_valid_event(event_id):
+    event = {
+        "schema_id": "talos.audit_event",
+        "schema_version": "v1",
+        "event_id": event_id,
+        "ts": "2026-01-11T18:23:45.123Z",
+        "request_id": "req-1",
+        "surface_id": "test.op",
+        "outcome": "success",
+        "principal": {"auth_mode": "bearer", "principal_id": "p-1", "team_id": "t-1"},
+        "http": {"method": "GET", "path": "/v1/test", "status_code": 200},
+        "meta": {},
+        "resource": None,
+    }
+    canonical = json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    event["event_hash"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return event
+
+
+class TestCodecs(unittest.TestCase):
+    def test_negotiate(self):
+        self.assertEqual(negotiate("gzip, deflate"), "gzip")
+        self.assertEqual(negotiate("zstd;q=0, gzip;q=0.5"), "gzip")
+        self.assertIsNone(negotiate("gzip;q=0"))
+        self.assertIsNone(negotiate("identity"))
+        self.assertIsNone(negotiate(None))
+        self.assertIsNotNone(negotiate("*"))
+
+    def test_decompress_gzip(self):
+        body = b"x" * 10_000
+        self.assertEqual(decompress(gzip.compress(body), "gzip", 10_000), body)
+        # Concatenated members are one body.
+        self.assertEqual(decompress(gzip.compress(b"a") + gzip.compress(b"b"), "gzip", 10), b"ab")
+
+    def test_decompress_limits_and_errors(self):
+        with self.assertRaises(DecompressedTooLarge):
+            decompress(gzip.compress(b"x" * 10_001), "gzip", 10_000)
+        with self.assertRaises(ValueError):
+            decompress(gzip.compress(b"x" * 100)[:-10], "gzip", 10_000)
+        with self.assertRaises(LookupError):
+            decompress(b"", "br", 10)
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+    def run_sender(self, messages, minimum_size=10):
+        async def inner_app(scope, receive, send):
+            for message in messages:
+                await send(message)
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = CompressionMiddleware(inner_app, paths=["/s"], minimum_size=minimum_size)
+        scope = {"type": "http", "path": "/s", "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(middleware(scope, None, send))
+        return sent
+
+    def test_streamed_chunks_decode_as_they_arrive(self):
+        start = {"type": "http.response.start", "status": 200, "headers": []}
+        chunks = [b"data: one\n\n", b"data: two\n\n"]
+        sent = self.run_sender(
+            [start]
+            + [{"type": "http.response.body", "body": c, "more_body": True} for c in chunks]
+            + [{"type": "http.response.body", "body": b"", "more_body": False}]
+        )
+        self.assertIn((b"content-encoding", b"gzip"), sent[0]["headers"])
+        decoder = zlib.decompressobj(31)
+        # Each frame is readable on its own, before the stream ends.
+        self.assertEqual(decoder.decompress(sent[1]["body"]), chunks[0])
+        self.assertEqual(decoder.decompress(sent[2]["body"]), chunks[1])
+
+    def test_small_bodies_pass_through(self):
+        start = {"type": "http.response.start", "status": 200, "headers": []}
+        sent = self.run_sender([start, {"type": "http.response.body", "body": b"tiny"}])
+        self.assertNotIn(b"content-encoding", dict(sent[0]["headers"]))
+        self.assertEqual(sent[1]["body"], b"tiny")
+
+
+class TestCompressedEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_gzip_batch_ingest(self):
+        events = [build_valid_event(f"gz-{i}") for i in range(20)]
+        resp = self.client.post(
+            "/events?ack=minimal",
+            content=gzip.compress(json.dumps(events).encode()),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.json()["items"]), 20)
+
+    def test_ingest_rejects_bombs_and_unknown_encodings(self):
+        bomb = gzip.compress(b" " * (65 * 1024 * 1024))
+        resp = self.client.post("/events", content=bomb, headers={"Content-Encoding": "gzip"})
+        self.assertEqual(resp.status_code, 413)
+        resp = self.client.post("/events", content=b"{}", headers={"Content-Encoding": "br"})
+        self.assertEqual(resp.status_code, 415)
+
+    def test_list_is_compressed_when_accepted(self):
+        for i in range(5):
+            self.client.post("/events", json=build_valid_event(f"gz-list-{i}"))
+        resp = self.client.get("/api/events?limit=5", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(resp.headers["content-encoding"], "gzip")
+        self.assertIn("Accept-Encoding", resp.headers["vary"])
+        self.assertEqual(len(resp.json()["items"]), 5)
+
+        plain = self.client.get("/api/events?limit=5", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("content-encoding", plain.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import MagicMock
+
+from talos_sdk.ports.audit_store import IAuditStorePort
+
+from src.domain.dedup import DuplicateDetector
+from src.domain.merkle import MerkleTree
+from src.ports.common import IEventIndexPort
+
+
+class IndexedStore(IEventIndexPort):
+    def __init__(self, ids):
+        self.ids = set(ids)
+        self.lookups = 0
+
+    def exists(self, event_id):
+        self.lookups += 1
+        return event_id in self.ids
+
+    def iter_event_ids(self):
+        return iter(self.ids)
+
+
+class TestDuplicateDetector(unittest.TestCase):
+    def setUp(self):
+        self.tree = MagicMock(spec=MerkleTree)
+        self.tree.has_event.return_value = False
+
+    def test_new_ids_skip_store_lookup(self):
+        store = IndexedStore([f"old-{i}" for i in range(1000)])
+        detector = DuplicateDetector(store, self.tree)
+        detector.seed_from_store([])
+
+        self.assertFalse(detector.is_duplicate("brand-new"))
+        # A Bloom miss answers without touching the store (barring a false positive).
+        self.assertLessEqual(store.lookups, detector.false_positives)
+
+    def test_history_outside_memory_is_detected(self):
+        store = IndexedStore([f"old-{i}" for i in range(1000)])
+        detector = DuplicateDetector(store, self.tree)
+        detector.seed_from_store([])
+
+        self.assertTrue(detector.is_duplicate("old-42"))
+        self.assertEqual(store.lookups, 1)
+
+    def test_tree_confirms_without_store_index(self):
+        store = MagicMock(spec=IAuditStorePort)
+        detector = DuplicateDetector(store, self.tree)
+        detector.seed_from_store([MagicMock(event_id="e-1")])
+
+        self.tree.has_event.return_value = True
+        self.assertTrue(detector.is_duplicate("e-1"))
+
+    def test_record(self):
+        store = MagicMock(spec=IAuditStorePort)
+        detector = DuplicateDetector(store, self.tree)
+
+        self.assertFalse(detector.is_duplicate("e-2"))
+        detector.record("e-2")
+        self.tree.has_event.return_value = True
+        self.assertTrue(detector.is_duplicate("e-2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
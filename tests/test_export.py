@@ -0,0 +1,77 @@
+import gzip
+import hashlib
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.adapters.http.compression import compress_stream
+from src.adapters.http.main import app
+from src.adapters.http.responses import ndjson_chunks
+
+
+def build_valid_event(event_id):
+    event = {
+        "schema_id": "talos.audit_event",
+        "schema_version": "v1",
+        "event_id": event_id,
+        "ts": "2026-01-11T18:23:45.123Z",
+        "request_id": "req-1",
+        "surface_id": "test.op",
+        "outcome": "success",
+        "principal": {"auth_mode": "bearer", "principal_id": "p-1", "team_id": "t-1"},
+        "http": {"method": "GET", "path": "/v1/test", "status_code": 200},
+        "meta": {},
+        "resource": None,
+    }
+    canonical = json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    event["event_hash"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return event
+
+
+class TestNdjsonEncoding(unittest.TestCase):
+    def test_chunks_roundtrip(self):
+        records = [{"event_id": f"e-{i}", "n": i} for i in range(1000)]
+        chunks = list(ndjson_chunks(records, chunk_size=1024))
+        self.assertGreater(len(chunks), 1)
+
+        lines = b"".join(chunks).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], records)
+
+    def test_gzip_stream(self):
+        chunks = list(ndjson_chunks({"i": i} for i in range(100)))
+        compressed = b"".join(compress_stream(chunks, "gzip"))
+        self.assertEqual(gzip.decompress(compressed), b"".join(chunks))
+
+
+class TestExportEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+        for event_id in ("exp-1", "exp-2"):
+            self.client.post("/events", json=build_valid_event(event_id))
+
+    def test_export_with_proofs(self):
+        resp = self.client.get("/api/events/export?include_proof=true")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers["content-type"], "application/x-ndjson")
+
+        records = {r["event_id"]: r for r in map(json.loads, resp.text.splitlines())}
+        self.assertIn("exp-1", records)
+        self.assertIn("leaf_index", records["exp-1"])
+        self.assertTrue(records["exp-1"]["proof"]["root"])
+
+    def test_export_gzip(self):
+        resp = self.client.get("/api/events/export?compression=gzip")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers["content-encoding"], "gzip")
+        # httpx transparently decodes Content-Encoding.
+        self.assertIn("exp-2", resp.text)
+
+    def test_export_time_range_excludes(self):
+        resp = self.client.get("/api/events/export?end_ts=0")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.text, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.adapters.http import codecs
+from src.adapters.http.main import app
+
+
+def build_valid_event(event_id):
+    event = {
+        "schema_id": "talos.audit_event",
+        "schema_version": "v1",
+        "event_id": event_id,
+        "ts": "2026-01-11T18:23:45.123Z",
+        "request_id": "req-1",
+        "surface_id": "test.op",
+        "outcome": "success",
+        "principal": {"auth_mode": "bearer", "principal_id": "p-1", "team_id": "t-1"},
+        "http": {"method": "GET", "path": "/v1/test", "status_code": 200},
+        "meta": {},
+        "resource": None,
+    }
+    canonical = json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    event["event_hash"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return event
+
+
+class TestIngestFormats(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def post(self, body, content_type, **params):
+        return self.client.post(
+            "/events", content=body, headers={"Content-Type": content_type}, params=params
+        )
+
+    def test_json_batch_reports_per_event_errors(self):
+        good = build_valid_event("fmt-json-1")
+        bad = {**build_valid_event("fmt-json-2"), "outcome": "tampered"}
+        resp = self.post(json.dumps([good, bad]), "application/json", ack="minimal")
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        self.assertEqual([item["event_id"] for item in body["items"]], ["fmt-json-1"])
+        self.assertEqual(body["errors"][0]["index"], 1)
+        self.assertEqual(body["errors"][0]["status_code"], 400)
+
+    def test_batch_that_is_not_events_is_rejected_whole(self):
+        body = json.dumps([build_valid_event("fmt-json-3"), {"event_id": "x"}])
+        resp = self.post(body, "application/json")
+        self.assertEqual(resp.status_code, 422)
+        self.assertEqual(self.client.get("/proof/fmt-json-3").status_code, 404)
+
+    def test_unknown_media_type(self):
+        resp = self.post(b"<event/>", "application/xml")
+        self.assertEqual(resp.status_code, 415)
+        self.assertEqual(resp.json()["detail"]["code"], "TALOS_UNSUPPORTED_MEDIA_TYPE")
+
+    def test_missing_codec_is_415(self):
+        with patch.object(codecs, "msgpack", None):
+            resp = self.post(b"\x80", "application/msgpack")
+        self.assertEqual(resp.status_code, 415)
+        self.assertIn("not installed", resp.json()["detail"]["message"])
+
+    @unittest.skipUnless(codecs.msgpack, "msgpack not installed")
+    def test_msgpack_single(self):
+        event = build_valid_event("fmt-mp-1")
+        resp = self.post(codecs.msgpack.packb(event), "application/x-msgpack")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["event_hash"], event["event_hash"])
+
+        tampered = {**build_valid_event("fmt-mp-2"), "surface_id": "other"}
+        resp = self.post(codecs.msgpack.packb(tampered), "application/msgpack")
+        self.assertEqual(resp.status_code, 400)
+
+    @unittest.skipUnless(codecs.msgpack, "msgpack not installed")
+    def test_msgpack_value_without_json_form(self):
+        event = build_valid_event("fmt-mp-3")
+        event["meta"] = {"blob": b"\x00\x01"}
+        resp = self.post(codecs.msgpack.packb(event, use_bin_type=True), "application/msgpack")
+        self.assertEqual(resp.status_code, 400)
+
+    @unittest.skipUnless(codecs.cbor2, "cbor2 not installed")
+    def test_cbor_batch(self):
+        events = [build_valid_event(f"fmt-cbor-{i}") for i in range(3)]
+        resp = self.post(codecs.cbor2.dumps(events), "application/cbor", ack="minimal")
+        self.assertEqual(resp.status_code, 200)
+        items = resp.json()["items"]
+        self.assertEqual([item["event_id"] for item in items], [e["event_id"] for e in events])
+        leaf_indices = [item["leaf_index"] for item in items]
+        self.assertEqual(leaf_indices, sorted(leaf_indices))
+
+    @unittest.skipUnless(codecs.cbor2, "cbor2 not installed")
+    def test_malformed_cbor(self):
+        self.assertEqual(self.post(b"\xff\xff", "application/cbor").status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import uuid
+
+from src.domain.leaf_index import LeafIndex, uuid_key
+
+
+class TestLeafIndex(unittest.TestCase):
+    def test_uuid_and_plain_ids(self):
+        index = LeafIndex(capacity=4)
+        ids = [str(uuid.uuid4()) for _ in range(500)] + ["evt1", "e-1", ""]
+        for i, event_id in enumerate(ids):
+            self.assertEqual(index.append(event_id), i)
+
+        self.assertEqual(len(index), len(ids))
+        for i, event_id in enumerate(ids):
+            self.assertEqual(index.get(event_id), i)
+            self.assertIn(event_id, index)
+
+        self.assertIsNone(index.get(str(uuid.uuid4())))
+        self.assertNotIn("missing", index)
+
+    def test_lookup_is_exact(self):
+        index = LeafIndex()
+        event_id = str(uuid.uuid4())
+        index.append(event_id)
+
+        # Upper-case or un-hyphenated spellings are different event ids.
+        self.assertNotIn(event_id.upper(), index)
+        self.assertNotIn(event_id.replace("-", ""), index)
+        self.assertIsNone(uuid_key(event_id.upper()))
+
+    def test_nil_uuid_is_not_a_placeholder(self):
+        index = LeafIndex()
+        index.append("evt1")
+        nil = "00000000-0000-0000-0000-000000000000"
+        self.assertNotIn(nil, index)
+        index.append(nil)
+        self.assertEqual(index.get(nil), 1)
+
+    def test_duplicate_id_maps_to_latest_leaf(self):
+        index = LeafIndex(capacity=4)
+        event_id = str(uuid.uuid4())
+        others = [str(uuid.uuid4()) for _ in range(20)]
+        index.append(event_id)
+        index.append("evt1")
+        for other in others:  # grows the table past the first duplicate
+            index.append(other)
+        self.assertEqual(index.append(event_id), 22)
+        self.assertEqual(index.append("evt1"), 23)
+        self.assertEqual((index.get(event_id), index.get("evt1")), (22, 23))
+        for i, other in enumerate(others):
+            self.assertEqual(index.get(other), i + 2)
+
+        index._grow()
+        self.assertEqual(index.get(event_id), 22)
+
+    def test_clear(self):
+        index = LeafIndex()
+        event_id = str(uuid.uuid4())
+        index.append(event_id)
+        index.clear()
+        self.assertEqual(len(index), 0)
+        self.assertNotIn(event_id, index)
+        self.assertEqual(index.append(event_id), 0)
+
+    def test_smaller_than_dict(self):
+        import sys
+
+        ids = [str(uuid.uuid4()) for _ in range(10000)]
+        index = LeafIndex()
+        mapping = {}
+        for i, event_id in enumerate(ids):
+            index.append(event_id)
+            mapping[event_id] = i
+
+        dict_bytes = sys.getsizeof(mapping) + sum(sys.getsizeof(k) for k in mapping)
+        self.assertLess(index.nbytes() * 3, dict_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
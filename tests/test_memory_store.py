@@ -0,0 +1,160 @@
+import hashlib
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.archive import SegmentArchive
+from src.adapters.memory_store import IndexedMemoryStore
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event
+from src.domain.retention import ColdTier, RetentionManager
+from src.domain.services import AuditService
+from src.ports.common import IClockPort
+
+START = 1_800_000_000
+
+
+def build_valid_event(event_id, timestamp, principal="p-1", outcome="OK", session="s-1"):
+    event = Event(
+        event_id=event_id,
+        ts=datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(),
+        request_id="req-1",
+        surface_id="test.op",
+        outcome=outcome,
+        principal={"principal_id": principal},
+        http={"method": "GET", "path": "/v1/test"},
+        meta={"session_id": session},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+class TestIndexedMemoryStore(unittest.TestCase):
+    def setUp(self):
+        self.store = IndexedMemoryStore()
+        # 60 events, one a minute, appended slightly out of order.
+        self.events = [
+            build_valid_event(
+                f"e-{i:02d}", START + 60 * i, principal=f"p-{i % 3}",
+                outcome="DENY" if i % 5 == 0 else "OK", session=f"s-{i % 2}",
+            )
+            for i in range(60)
+        ]  # fmt: skip
+        for i in range(0, 60, 2):
+            self.store.append(self.events[i + 1])
+            self.store.append(self.events[i])
+
+    def ids(self, events):
+        return [event.event_id for event in events]
+
+    def test_duplicates_are_rejected(self):
+        self.assertFalse(self.store.append(self.events[7]))
+        self.assertEqual(len(self.store), 60)
+        self.assertTrue(self.store.exists("e-07"))
+
+    def test_pages_walk_newest_to_oldest(self):
+        seen, before = [], None
+        while True:
+            page = self.store.list(before=before, limit=25)
+            self.assertEqual(self.ids(page.events), sorted(self.ids(page.events)))
+            seen = self.ids(page.events) + seen
+            if not page.has_more:
+                break
+            before = page.next_cursor
+        self.assertEqual(seen, self.ids(self.events))
+
+    def test_filtered_pages_use_the_posting_lists(self):
+        page = self.store.list(limit=5, filters={"principal_id": "p-1"})
+        self.assertEqual(self.ids(page.events), ["e-46", "e-49", "e-52", "e-55", "e-58"])
+        self.assertTrue(page.has_more)
+        older = self.store.list(limit=100, before=page.next_cursor, filters={"principal_id": "p-1"})
+        self.assertEqual(len(older.events), 15)
+        self.assertFalse(older.has_more)
+
+        both = self.store.list(limit=100, filters={"outcome": "DENY", "session_id": "s-1"})
+        self.assertEqual(self.ids(both.events), ["e-05", "e-15", "e-25", "e-35", "e-45", "e-55"])
+        self.assertEqual(self.store.list(filters={"principal_id": "nobody"}).events, [])
+
+    def test_time_range_export(self):
+        events = list(self.store.iter_events(START + 600, START + 1200, batch_size=4))
+        self.assertEqual(self.ids(events), [f"e-{i:02d}" for i in range(10, 20)])
+        denied = self.store.iter_events(start_ts=START + 0.5, filters={"outcome": "DENY"})
+        self.assertEqual(self.ids(denied), [f"e-{i:02d}" for i in range(5, 60, 5)])
+
+    def test_stats(self):
+        stats = self.store.stats(START, START + 60 * 19)
+        self.assertEqual(stats["requests_24h"], 20)
+        self.assertEqual(stats["auth_success_rate"], 16 / 20)
+        self.assertEqual(sum(b["ok"] + b["deny"] for b in stats["request_volume_series"]), 20)
+
+    def test_delete_keeps_the_indexes_consistent(self):
+        self.assertEqual(self.store.delete_events(["e-00", "e-01", "e-03", "missing"]), 3)
+        self.assertEqual(len(self.store), 57)
+        self.assertEqual(self.ids(self.store.iter_events())[:2], ["e-02", "e-04"])
+        page = self.store.list(limit=100, filters={"principal_id": "p-0"})
+        self.assertEqual(self.ids(page.events)[0], "e-06")
+
+
+class ListOnlyStore:
+    """A store without a streaming scan: export has to walk list() pages."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def list(self, before=None, limit=100, filters=None):
+        return self._store.list(before=before, limit=limit, filters=filters)
+
+
+class TestPagedExport(unittest.TestCase):
+    def test_pages_are_exported_oldest_first(self):
+        store = IndexedMemoryStore()
+        events = [build_valid_event(f"e-{i:04d}", START + i) for i in range(1200)]
+        for event in events:
+            store.append(event)
+        service = AuditService(
+            store=ListOnlyStore(store), merkle_tree=MagicMock(), clock=MagicMock(),
+            id_gen=MagicMock(), recover_on_init=False,
+        )  # fmt: skip
+
+        exported = [record["event_id"] for record in service.export_events()]
+        self.assertEqual(exported, [event.event_id for event in events])
+        window = service.export_events(start_ts=START + 100, end_ts=START + 700)
+        self.assertEqual([r["event_id"] for r in window], exported[100:700])
+
+
+class TestMemoryBound(unittest.TestCase):
+    def test_oldest_events_are_archived_beyond_the_bound(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        clock = MagicMock(spec=IClockPort)
+        clock.now.return_value = START + 3600
+        store = IndexedMemoryStore()
+        cold_tier = ColdTier(SegmentArchive(directory.name), hash_port)
+        retention = RetentionManager(
+            store, cold_tier, hash_port, clock,
+            max_age_seconds=None, segment_max_events=8, max_store_events=10,
+        )  # fmt: skip
+        service = AuditService(
+            store=store, merkle_tree=MerkleTree(hash_port), clock=clock,
+            id_gen=MagicMock(), cold_tier=cold_tier, retention=retention,
+        )  # fmt: skip
+        for i in range(25):
+            store.append(build_valid_event(f"e-{i:02d}", START + i))
+
+        self.assertEqual(retention.archive_due(), 2)
+        self.assertEqual(len(store), 10)
+        self.assertEqual([s.count for s in service.list_archive_segments()], [8, 7])
+        self.assertEqual(next(store.iter_event_ids()), "e-15")
+        # Pages continue from memory into the archive.
+        page = service.list_events(limit=12)
+        self.assertEqual(page.events[0].event_id, "e-13")
+
+
+if __name__ == "__main__":
+    unittest.main()
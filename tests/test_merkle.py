@@ -1,3 +1,4 @@
+import hashlib
 import unittest
 from unittest.mock import MagicMock
 from src.domain.merkle import MerkleTree
@@ -6,6 +7,23 @@ from talos_sdk.ports.hash import IHashPort
 from talos_sdk.ports.audit_store import IAuditStorePort
 
 
+def build_events(count):
+    return [
+        Event(
+            event_id=f"evt{i}",
+            ts="2026-01-11T18:23:45.123Z",
+            request_id="req-1",
+            surface_id="test.op",
+            outcome="success",
+            principal={},
+            http={},
+            meta={},
+            event_hash="",
+        )
+        for i in range(count)
+    ]
+
+
 class TestMerkleTree(unittest.TestCase):
     def setUp(self):
         self.mock_hash = MagicMock(spec=IHashPort)
@@ -74,6 +92,41 @@ class TestMerkleTree(unittest.TestCase):
         expected_root = self.mock_hash.sha256(h1 + h2).hex()
         self.assertEqual(tree.get_root().root, expected_root)
 
+    def test_incremental_levels_match_full_rebuild(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        events = build_events(65)
+        # Every size up to 65 covers odd nodes duplicated at each level and
+        # the tree growing a new top level at each power of two.
+        tree = MerkleTree(hash_port)
+        for size, event in enumerate(events, start=1):
+            tree.add_leaf(event)
+            rebuilt = MerkleTree(hash_port)
+            rebuilt.initialize_from_events(events[:size])
+            self.assertEqual(tree._tree, rebuilt._tree, f"size {size}")
+            self.assertEqual(tree.get_root(), rebuilt.get_root())
+
+        # Appending after a bulk load continues from the rebuilt levels.
+        tree = MerkleTree(hash_port)
+        tree.initialize_from_events(events[:37])
+        for event in events[37:]:
+            tree.add_leaf(event)
+        self.assertEqual(tree.get_root(), rebuilt.get_root())
+
+    def test_root_at_every_earlier_size(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        events = build_events(65)
+        tree = MerkleTree(hash_port)
+        roots = []
+        for event in events:
+            tree.add_leaf(event)
+            roots.append(tree.get_root().root)
+        # Sizes up to 65 cover odd nodes duplicated at each level.
+        self.assertEqual([tree.root_at(size) for size in range(1, 66)], roots)
+        with self.assertRaises(ValueError):
+            tree.root_at(66)
+
     def test_proof_verification(self):
         tree = MerkleTree(self.mock_hash)
 
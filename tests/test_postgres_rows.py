@@ -0,0 +1,66 @@
+import unittest
+
+from src.adapters.postgres_store import EVENT_COLUMNS, EventRow
+
+
+def build_row(**overrides):
+    values = {
+        "event_id": "e-1",
+        "schema_version": "v1",
+        "timestamp": 1768155825,
+        "cursor": "abc",
+        "event_type": "MESSAGE",
+        "outcome": "OK",
+        "session_id": "s-1",
+        "correlation_id": "req-1",
+        "agent_id": "agent-1",
+        "peer_id": None,
+        "tool": None,
+        "method": "/v1/test",
+        "resource": "doc-7",
+        "metadata": {"k": "v"},
+        "metrics": {},
+        "hashes": {"event_hash": "h"},
+        "integrity": {},
+        "integrity_hash": "h",
+        "denial_reason": None,
+    }
+    values.update(overrides)
+    return tuple(values[c] for c in EVENT_COLUMNS)
+
+
+class TestEventRow(unittest.TestCase):
+    def test_derived_fields(self):
+        row = EventRow(build_row())
+        self.assertEqual(row.ts, "2026-01-11T18:23:45+00:00")
+        self.assertEqual(row.request_id, "req-1")
+        self.assertEqual(row.principal, {"id": "agent-1", "type": "service"})
+        self.assertEqual(row.resource, {"id": "doc-7"})
+        self.assertEqual(row.http, {"method": "/v1/test", "path": {"id": "doc-7"}})
+        self.assertEqual(row.meta, {"k": "v"})
+        self.assertEqual(row.event_hash, "h")
+        self.assertEqual(row.surface_id, "gateway")
+        self.assertEqual(row.schema_id, "talos.audit_event")
+
+    def test_defaults_for_nulls(self):
+        row = EventRow(build_row(correlation_id=None, resource=None, integrity_hash=None))
+        self.assertEqual(row.request_id, "unknown")
+        self.assertIsNone(row.resource)
+        self.assertEqual(row.event_hash, "")
+
+    def test_model_dump(self):
+        dumped = EventRow(build_row()).model_dump()
+        for column in EVENT_COLUMNS:
+            self.assertIn(column, dumped)
+        self.assertEqual(dumped["resource"], {"id": "doc-7"})
+        self.assertEqual(dumped["ts"], "2026-01-11T18:23:45+00:00")
+        self.assertEqual(dumped["schema_id"], "talos.audit_event")
+
+    def test_rows_share_no_class_per_row(self):
+        a, b = EventRow(build_row()), EventRow(build_row(event_id="e-2"))
+        self.assertIs(type(a), type(b))
+        self.assertFalse(hasattr(a, "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
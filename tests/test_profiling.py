@@ -0,0 +1,77 @@
+import os
+import threading
+import unittest
+import uuid
+from unittest.mock import patch
+
+from src.core import profiling
+from src.domain.leaf_index import LeafIndex
+
+
+class TestProfilers(unittest.TestCase):
+    def setUp(self):
+        self.stop = threading.Event()
+        self.worker = threading.Thread(target=self._busy)
+        self.worker.start()
+
+    def tearDown(self):
+        self.stop.set()
+        self.worker.join()
+
+    def _busy(self):
+        index = LeafIndex()
+        while not self.stop.is_set():
+            index.append(str(uuid.uuid4()))
+
+    def test_cpu_profile_collapsed_stacks(self):
+        output = profiling.profile_cpu(0.3, interval=0.002)
+        lines = output.splitlines()
+        self.assertTrue(lines[0].startswith("# samples="))
+        self.assertTrue(any("src/domain/leaf_index.py" in line for line in lines[1:]))
+        for line in lines[1:]:
+            stack, count = line.rsplit(" ", 1)
+            self.assertGreater(int(count), 0)
+            self.assertIn(";", stack)
+
+    def test_memory_profile_report(self):
+        report = profiling.profile_memory(0.2, top=5)
+        self.assertLessEqual(len(report["top"]), 5)
+        self.assertIn("traced_peak_bytes", report)
+
+    def test_one_session_at_a_time(self):
+        profiling._session_lock.acquire()
+        try:
+            with self.assertRaises(profiling.ProfilerBusyError):
+                profiling.profile_cpu(0.01)
+        finally:
+            profiling._session_lock.release()
+
+
+class TestProfileEndpoint(unittest.TestCase):
+    def setUp(self):
+        from fastapi.testclient import TestClient
+
+        from src.adapters.http.main import app
+
+        self.client = TestClient(app)
+
+    def test_disabled_without_token(self):
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("TALOS_ADMIN_TOKEN", None)
+            resp = self.client.post("/admin/profile?seconds=0.1")
+        self.assertEqual(resp.status_code, 404)
+
+    def test_requires_matching_token(self):
+        with patch.dict(os.environ, {"TALOS_ADMIN_TOKEN": "s3cret"}):
+            resp = self.client.post("/admin/profile?seconds=0.1", headers={"X-Admin-Token": "x"})
+            self.assertEqual(resp.status_code, 403)
+
+            resp = self.client.post(
+                "/admin/profile?seconds=0.1", headers={"Authorization": "Bearer s3cret"}
+            )
+            self.assertEqual(resp.status_code, 200)
+            self.assertTrue(resp.text.startswith("# samples="))
+
+
+if __name__ == "__main__":
+    unittest.main()
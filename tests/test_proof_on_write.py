@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+from talos_sdk.ports.audit_store import IAuditStorePort
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.http.main import app
+from src.adapters.snapshot_store import InMemorySnapshotStore
+from src.bootstrap import get_audit_service
+from src.core.broadcaster import ProofBroadcaster
+from src.domain.errors import ConflictError, UnavailableError
+from src.domain.merkle import MerkleTree
+from src.domain.proof_batch import ProofBatcher
+from src.domain.services import AuditService
+from src.domain.snapshots import RootSnapshotter
+from src.ports.common import IClockPort
+
+
+def build_valid_event(event_id):
+    event = {
+        "schema_id": "talos.audit_event",
+        "schema_version": "v1",
+        "event_id": event_id,
+        "ts": "2026-01-11T18:23:45.123Z",
+        "request_id": "req-1",
+        "surface_id": "test.op",
+        "outcome": "success",
+        "principal": {"auth_mode": "bearer", "principal_id": "p-1", "team_id": "t-1"},
+        "http": {"method": "GET", "path": "/v1/test", "status_code": 200},
+        "meta": {},
+        "resource": None,
+    }
+    canonical = json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    event["event_hash"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return event
+
+
+class TestProofBatcher(unittest.TestCase):
+    def setUp(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        self.tree = MerkleTree(hash_port)
+        store = MagicMock(spec=IAuditStorePort)
+        store.list.return_value = MagicMock(events=[])
+        clock = MagicMock(spec=IClockPort)
+        clock.now.return_value = 1700000000.0
+        self.snapshots = RootSnapshotter(self.tree, InMemorySnapshotStore(), clock, every_events=4)
+        self.sink = ProofBroadcaster(max_queue_size=100)
+        self.service = AuditService(
+            store=store, merkle_tree=self.tree, clock=clock, id_gen=MagicMock(),
+            snapshots=self.snapshots, proofs=ProofBatcher(self.tree, self.sink),
+        )  # fmt: skip
+
+    def ingest(self, event_id, with_proof=False):
+        from src.domain.models import Event
+
+        event = Event(**build_valid_event(event_id))
+        if with_proof:
+            return self.service.ingest_event_proof(event)
+        return self.service.ingest_event_ack(event)
+
+    def test_receipts_prove_against_the_sealed_root(self):
+        async def scenario():
+            pending = [
+                asyncio.ensure_future(self.ingest(f"pw-{i}", with_proof=True)) for i in range(3)
+            ]
+            await asyncio.sleep(0)
+            # Nothing sealed yet: the receipts wait for the 4th event.
+            self.assertFalse(any(task.done() for task in pending))
+            # Paths must be those of the tree at the sealed size, not a later one.
+            await self.ingest("pw-3")
+            expected = {f"pw-{i}": self.tree.get_proof(f"pw-{i}") for i in range(4)}
+            await self.ingest("pw-4")
+            return await asyncio.gather(*pending), expected
+
+        receipts, expected = asyncio.run(scenario())
+        sealed = self.snapshots.latest
+        for receipt in receipts:
+            self.assertEqual(receipt.tree_size, 4)
+            self.assertEqual(receipt.root, sealed.root)
+            self.assertEqual(receipt.path, expected[receipt.event_id].path)
+            self.assertEqual(receipt.entry_hash, expected[receipt.event_id].entry_hash)
+
+    def test_batch_streamed_only_to_proof_subscribers(self):
+        async def scenario():
+            stream = self.sink.subscribe()
+            first = asyncio.ensure_future(stream.__anext__())
+            while not self.sink.subscriber_count:
+                await asyncio.sleep(0)
+            for i in range(4):
+                await self.ingest(f"sse-{i}")
+            record = await asyncio.wait_for(first, timeout=5)
+            await stream.aclose()
+            return record
+
+        record = asyncio.run(scenario())
+        self.assertEqual(record["event_id"], "sse-0")
+        self.assertEqual(record["leaf_index"], 0)
+        self.assertEqual(record["proof"]["tree_size"], 4)
+
+    def test_failed_commit_leaves_no_waiter(self):
+        async def scenario():
+            await self.ingest("dup")
+            with self.assertRaises(ConflictError):
+                await self.ingest("dup", with_proof=True)
+
+        asyncio.run(scenario())
+        self.assertEqual(self.service._proofs._waiters, {})
+
+
+    def test_refused_seal_answers_unavailable(self):
+        self.snapshots.every_seconds = 0.01
+        self.snapshots._diverged = "recovered tree contradicts the published heads"
+
+        async def scenario():
+            with self.assertRaises(UnavailableError):
+                await asyncio.wait_for(self.ingest("stuck", with_proof=True), timeout=5)
+
+        asyncio.run(scenario())
+        self.assertEqual(self.service._proofs._waiters, {})
+
+
+class TestProofAck(unittest.TestCase):
+    def test_ack_proof_returns_receipt(self):
+        client = TestClient(app)
+        snapshots = get_audit_service().snapshots
+        every_events, snapshots.every_events = snapshots.every_events, 1
+        self.addCleanup(setattr, snapshots, "every_events", every_events)
+
+        resp = client.post("/events?ack=proof", json=build_valid_event("ack-proof-1"))
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        self.assertEqual(body["event_id"], "ack-proof-1")
+        self.assertEqual(body["root"], client.get("/roots/latest").json()["root"])
+        self.assertEqual(body["tree_size"], body["leaf_index"] + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
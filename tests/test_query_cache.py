@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import threading
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.memory_store import IndexedMemoryStore
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event
+from src.domain.query_cache import QueryCache
+from src.domain.services import AuditService
+from src.ports.common import IClockPort
+
+START = 1_800_000_000
+
+
+def build_valid_event(event_id, timestamp, principal="p-1"):
+    event = Event(
+        event_id=event_id,
+        ts=datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(),
+        request_id="req-1",
+        surface_id="test.op",
+        outcome="OK",
+        principal={"principal_id": principal},
+        http={"method": "GET", "path": "/v1/test"},
+        meta={},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = QueryCache(ttl_seconds=5, max_entries=2, clock=lambda: self.now)
+        self.loads = 0
+
+    def load(self, value):
+        def load():
+            self.loads += 1
+            return value
+
+        return load
+
+    def never(self, event, value):
+        return False
+
+    def test_ttl_and_lru(self):
+        self.assertEqual(self.cache.get("a", self.load(1), self.never), 1)
+        self.assertEqual(self.cache.get("a", self.load(2), self.never), 1)
+        self.now = 6
+        self.assertEqual(self.cache.get("a", self.load(3), self.never), 3)
+
+        self.cache.get("b", self.load(4), self.never)
+        self.cache.get("a", self.load(5), self.never)  # a is now the most recent
+        self.cache.get("c", self.load(6), self.never)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get("a", self.load(7), self.never), 3)
+        self.assertEqual(self.cache.get("b", self.load(8), self.never), 8)
+
+    def test_concurrent_misses_share_one_load(self):
+        release = threading.Event()
+
+        def slow():
+            self.loads += 1
+            release.wait(5)
+            return "page"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get("q", slow, self.never)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        while not self.cache._flights:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((self.loads, results), (1, ["page"] * 8))
+
+    def test_an_event_during_a_load_keeps_its_result_out(self):
+        def load():
+            self.cache.invalidate("event", [])
+            return "stale"
+
+        self.assertEqual(self.cache.get("q", load, self.never), "stale")
+        self.assertEqual(len(self.cache), 0)
+
+    def test_failed_load_is_not_cached(self):
+        def failing():
+            raise ConnectionError("store down")
+
+        with self.assertRaises(ConnectionError):
+            self.cache.get("q", failing, self.never)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.get("q", self.load("page"), self.never), "page")
+
+
+class TestServiceInvalidation(unittest.TestCase):
+    def setUp(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        clock = MagicMock(spec=IClockPort)
+        clock.now.return_value = START + 3600
+        self.store = IndexedMemoryStore()
+        for i in range(20):
+            self.store.append(build_valid_event(f"e-{i:02d}", START + i, principal=f"p-{i % 2}"))
+        self.store.list = MagicMock(wraps=self.store.list)
+        self.store.stats = MagicMock(wraps=self.store.stats)
+        self.service = AuditService(
+            store=self.store, merkle_tree=MerkleTree(hash_port), clock=clock,
+            id_gen=MagicMock(), query_cache=QueryCache(),
+        )  # fmt: skip
+        self.cursor = self.store.list(limit=5).next_cursor
+        self.store.list.reset_mock()
+
+    def reads(self):
+        head = self.service.list_events(limit=5)
+        older = self.service.list_events(limit=5, before=self.cursor)
+        other = self.service.list_events(limit=5, filters={"principal_id": "p-0"})
+        early = self.service.stats(START, START + 9)
+        recent = self.service.stats(START + 10)
+        return head, older, other, early, recent
+
+    def test_ingest_drops_only_the_results_it_changes(self):
+        first = self.reads()
+        self.reads()
+        self.assertEqual((self.store.list.call_count, self.store.stats.call_count), (3, 2))
+
+        event = build_valid_event("new", START + 30, principal="p-1")
+        asyncio.run(self.service.ingest_event_ack(event))
+        head, older, other, early, recent = self.reads()
+        # The head page and the open-ended window were reloaded; the rest were not.
+        self.assertEqual((self.store.list.call_count, self.store.stats.call_count), (4, 3))
+        self.assertEqual(head.events[-1].event_id, "new")
+        self.assertEqual((older, other, early), first[1:4])
+        self.assertEqual(recent["requests_24h"], 11)
+
+    def test_consistency_token_reads_bypass_the_cache(self):
+        self.service.list_events(limit=5)
+        self.service.list_events(limit=5, consistency_token="t")
+        self.assertEqual(self.store.list.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+from unittest.mock import patch
+
+from src.adapters.postgres_store import PostgresAuditStore, ReadReplica, parse_lsn
+from src.domain.models import encode_cursor
+
+PRIMARY = "postgresql://primary/audit"
+REPLICA = "postgresql://replica/audit"
+
+
+class FakeNode:
+    """Stand-in for one Postgres server: WAL positions plus a query log."""
+
+    def __init__(self, wal_lsn="0/0", replay_lsn=None, lag=0.0, up=True):
+        self.wal_lsn = wal_lsn
+        self.replay_lsn = replay_lsn
+        self.lag = lag
+        self.up = up
+        self.failing = False
+        self.queries = []
+        self.params = []
+
+
+class FakeCursor:
+    def __init__(self, node):
+        self.node = node
+        self.itersize = None
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        return iter(self._result)
+
+    def execute(self, sql, params=None):
+        self.node.queries.append(sql)
+        self.node.params.append(params)
+        if self.node.failing and "FROM events" in sql:
+            raise ConnectionError("server closed the connection unexpectedly")
+        if sql is ReadReplica.STATUS_SQL:
+            self._result = [(self.node.replay_lsn, self.node.lag)]
+        elif "pg_current_wal_lsn" in sql:
+            self._result = [(self.node.wal_lsn,)]
+        elif "COUNT(*) as total" in sql:
+            self._result = [(0, 0, 0, 0.0, 0.0)]
+        else:
+            self._result = []
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+
+class FakeConnection:
+    closed = False
+    autocommit = False
+
+    def __init__(self, node):
+        self.node = node
+
+    def cursor(self, name=None):
+        return FakeCursor(self.node)
+
+    def close(self):
+        pass
+
+
+class TestReadReplicaRouting(unittest.TestCase):
+    def setUp(self):
+        self.nodes = {
+            PRIMARY: FakeNode(wal_lsn="0/3000"),
+            REPLICA: FakeNode(replay_lsn="0/2000"),
+        }
+
+        def connect(dsn):
+            node = self.nodes[dsn]
+            if not node.up:
+                raise ConnectionError(f"{dsn} is down")
+            return FakeConnection(node)
+
+        patcher = patch("src.adapters.postgres_store.psycopg2.connect", side_effect=connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = PostgresAuditStore(
+            PRIMARY, replica_dsns=[REPLICA], max_replica_lag=5.0, replica_check_interval=60
+        )
+
+    def served_by(self, dsn):
+        return sum(1 for q in self.nodes[dsn].queries if "FROM events" in q)
+
+    def test_reads_go_to_fresh_replica(self):
+        self.store.list(limit=10)
+        self.store.stats(0, 1)
+        self.assertEqual(self.served_by(PRIMARY), 0)
+        self.assertGreater(self.served_by(REPLICA), 0)
+
+    def test_token_ahead_of_replica_pins_primary(self):
+        token = self.store.consistency_token()
+        self.assertEqual(token, "0/3000")
+
+        with self.store.read_after(token):
+            self.store.list(limit=10)
+        self.assertEqual(self.served_by(PRIMARY), 1)
+        self.assertEqual(self.served_by(REPLICA), 0)
+
+        # Once the replica has replayed past the token it can serve the read.
+        self.nodes[REPLICA].replay_lsn = "0/3100"
+        with self.store.read_after(token):
+            self.store.list(limit=10)
+        self.assertEqual(self.served_by(REPLICA), 1)
+
+    def test_lagging_replica_is_skipped(self):
+        self.nodes[REPLICA].lag = 30.0
+        self.store.list(limit=10)
+        self.assertEqual(self.served_by(PRIMARY), 1)
+        self.assertEqual(self.served_by(REPLICA), 0)
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        self.nodes[REPLICA].up = False
+        self.store.list(limit=10)
+        self.assertEqual(self.served_by(PRIMARY), 1)
+
+    def test_export_node_is_chosen_inside_scope(self):
+        with self.store.read_after(self.store.consistency_token()):
+            rows = self.store.iter_events()
+        list(rows)  # consumed after the scope has closed
+        self.assertEqual(self.served_by(PRIMARY), 1)
+        self.assertEqual(self.served_by(REPLICA), 0)
+
+    def test_invalid_token_rejected_eagerly(self):
+        with self.assertRaises(ValueError):
+            self.store.read_after("not-an-lsn")
+
+    def test_no_token_without_replicas(self):
+        store = PostgresAuditStore(PRIMARY)
+        self.assertIsNone(store.consistency_token())
+
+    def test_read_errors_are_raised(self):
+        # An empty page or zeroed stats would be cached as if they were real.
+        self.nodes[REPLICA].failing = True
+        with self.assertRaises(ConnectionError):
+            self.store.list(limit=10)
+        with self.assertRaises(ConnectionError):
+            self.store.stats(0, 1)
+
+    def test_pages_are_keyset_on_timestamp_and_event_id(self):
+        self.store.list(limit=10, before=encode_cursor((1_800_000_000, "e-7")))
+        query = self.nodes[REPLICA].queries[-1]
+        self.assertIn("(timestamp, event_id) < (%s, %s)", query)
+        self.assertIn("ORDER BY timestamp DESC, event_id DESC", query)
+        self.assertEqual(self.nodes[REPLICA].params[-1], [1_800_000_000, "e-7", 10])
+
+
+class TestParseLsn(unittest.TestCase):
+    def test_orders_across_segments(self):
+        self.assertLess(parse_lsn("0/FFFFFFFF"), parse_lsn("1/0"))
+        self.assertEqual(parse_lsn("16/B374D848"), (0x16 << 32) | 0xB374D848)
+
+
+if __name__ == "__main__":
+    unittest.main()
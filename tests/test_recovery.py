@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+from talos_sdk.ports.audit_store import IAuditStorePort
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.http.main import app
+from src.bootstrap import get_audit_service
+from src.domain.errors import UnavailableError
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event
+from src.domain.services import AuditService
+from src.ports.common import IClockPort
+
+
+def build_valid_event(event_id):
+    event = Event(
+        event_id=event_id,
+        ts="2026-01-11T18:23:45.123Z",
+        request_id="req-1",
+        surface_id="test.op",
+        outcome="success",
+        principal={"principal_id": "p-1"},
+        http={"method": "GET", "path": "/v1/test"},
+        meta={},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+class TestBackgroundRecovery(unittest.TestCase):
+    def setUp(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        self.tree = MerkleTree(hash_port)
+        self.stored = [build_valid_event(f"stored-{i}") for i in range(5)]
+        self.release = threading.Event()
+        self.store = MagicMock(spec=IAuditStorePort)
+
+        def slow_list(*args, **kwargs):
+            self.release.wait(5)
+            return MagicMock(events=self.stored)
+
+        self.store.list.side_effect = slow_list
+        self.service = AuditService(
+            store=self.store, merkle_tree=self.tree, clock=MagicMock(spec=IClockPort),
+            id_gen=MagicMock(), recover_on_init=False, max_queued_ingest=2,
+        )  # fmt: skip
+
+    def test_starts_empty_and_unavailable(self):
+        self.assertEqual(self.service.recovery_status().state, "pending")
+        self.store.list.assert_not_called()
+        with self.assertRaises(UnavailableError):
+            self.service.get_proof("stored-0")
+        with self.assertRaises(UnavailableError):
+            self.service.get_consistency_proof(1, 1)
+
+    def test_ingest_is_queued_until_the_tree_is_recovered(self):
+        async def scenario():
+            recovery = asyncio.create_task(asyncio.to_thread(self.service.recover))
+            ingest = [
+                asyncio.create_task(self.service.ingest_event_ack(build_valid_event(f"new-{i}")))
+                for i in range(2)
+            ]
+            await asyncio.sleep(0.05)
+            status = self.service.recovery_status()
+            self.assertEqual((status.state, status.queued_ingest), ("loading", 2))
+            with self.assertRaises(UnavailableError):  # the queue holds two
+                await self.service.ingest_event_ack(build_valid_event("new-2"))
+            self.assertFalse(any(task.done() for task in ingest))
+
+            self.release.set()
+            await recovery
+            return [await task for task in ingest]
+
+        acks = asyncio.run(scenario())
+        self.assertEqual([ack.leaf_index for ack in acks], [5, 6])
+        status = self.service.recovery_status()
+        self.assertEqual((status.state, status.events_loaded), ("ready", 5))
+        self.assertEqual(self.service.get_proof("stored-3").index, 3)
+
+    def test_failed_recovery_can_be_retried(self):
+        self.store.list.side_effect = [ConnectionError("store down"), MagicMock(events=self.stored)]
+        with self.assertRaises(ConnectionError):
+            self.service.recover()
+        status = self.service.recovery_status()
+        self.assertEqual((status.state, status.error), ("failed", "store down"))
+        self.service.recover()
+        self.assertTrue(self.service.recovery.ready)
+        self.assertEqual(self.tree.size, 5)
+
+    def test_ready_endpoint_and_proofs_wait_for_recovery(self):
+        self.service.recovery.schedule()
+        app.dependency_overrides[get_audit_service] = lambda: self.service
+        try:
+            client = TestClient(app)
+            resp = client.get("/ready")
+            self.assertEqual(resp.status_code, 503)
+            self.assertEqual(resp.headers["retry-after"], "1")
+            self.assertEqual(resp.json()["state"], "scheduled")
+            self.assertEqual(client.get("/proof/stored-0").status_code, 503)
+            self.assertEqual(client.get("/health").status_code, 200)
+
+            self.release.set()
+            self.service.recover()
+            self.assertEqual(client.get("/ready").status_code, 200)
+            self.assertEqual(client.get("/proof/stored-0").status_code, 200)
+        finally:
+            app.dependency_overrides.pop(get_audit_service, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
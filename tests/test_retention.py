@@ -0,0 +1,314 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+from unittest.mock import MagicMock
+
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.archive import SegmentArchive
+from src.adapters.memory_store import IndexedMemoryStore
+from src.adapters.sqlite_store import SqliteAuditStore
+from src.config import AuditConfig
+from src.domain.errors import ConflictError
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event, EventPage, decode_key, encode_cursor, event_key
+from src.domain.retention import ColdTier, RetentionManager
+from src.domain.services import AuditService
+from src.ports.common import IClockPort, IEventExportPort, IRetentionPort
+
+DAY = 86400.0
+NOW = 1_800_000_000.0
+
+
+def build_event(event_id, timestamp):
+    event = Event(
+        event_id=event_id,
+        ts=datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(),
+        request_id="req-1",
+        surface_id="test.op",
+        outcome="success",
+        principal={"principal_id": "p-1"},
+        http={"method": "GET", "path": "/v1/test"},
+        meta={"session_id": "s-1"},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+class StoredEvent(SimpleNamespace):
+    def model_dump(self):
+        return dict(vars(self))
+
+
+class FakeStore(IEventExportPort, IRetentionPort):
+    """Key-ordered store with the export and delete capabilities retention needs."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def append(self, event):
+        ts = datetime.fromisoformat(event.ts).timestamp()
+        self.rows[event.event_id] = StoredEvent(
+            **event.model_dump(), timestamp=ts, cursor=encode_cursor(event_key(event))
+        )
+        return True
+
+    def _sorted(self):
+        return sorted(self.rows.values(), key=event_key)
+
+    def list(self, limit=50, before=None, filters=None):
+        key = decode_key(before) if before else None
+        rows = [row for row in self._sorted() if key is None or event_key(row) < key][-limit:]
+        return EventPage(rows, rows[0].cursor if rows else None, has_more=len(rows) >= limit)
+
+    def iter_events(self, start_ts=None, end_ts=None, filters=None, batch_size=5000):
+        for row in self._sorted():
+            if (start_ts is None or row.timestamp >= start_ts) and (
+                end_ts is None or row.timestamp < end_ts
+            ):
+                yield row
+
+    def delete_events(self, event_ids):
+        return sum(self.rows.pop(event_id, None) is not None for event_id in event_ids)
+
+
+def verify(proof, hash_fn):
+    node = bytes.fromhex(proof.entry_hash)
+    for step in proof.path:
+        sibling = bytes.fromhex(step.hash)
+        node = hash_fn(node + sibling) if step.position == "right" else hash_fn(sibling + node)
+    return node.hex() == proof.root
+
+
+def sha256(data):
+    return hashlib.sha256(data).digest()
+
+
+class TestRetention(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.hash_port = MagicMock(spec=IHashPort)
+        self.hash_port.sha256.side_effect = sha256
+        self.clock = MagicMock(spec=IClockPort)
+        self.clock.now.return_value = NOW
+        self.store = FakeStore()
+        # Ten old events (8..3 days ago) and three recent ones.
+        for i in range(10):
+            self.store.append(build_event(f"old-{i}", NOW - 8 * DAY + i * 3600))
+        for i in range(3):
+            self.store.append(build_event(f"new-{i}", NOW - 3600 + i))
+        self.cold_tier = ColdTier(SegmentArchive(self.dir.name, block_rows=3), self.hash_port)
+        self.retention = RetentionManager(
+            self.store, self.cold_tier, self.hash_port, self.clock,
+            max_age_seconds=7 * DAY, segment_max_events=6,
+        )  # fmt: skip
+        self.service = AuditService(
+            store=self.store, merkle_tree=MerkleTree(self.hash_port), clock=self.clock,
+            id_gen=MagicMock(), cold_tier=self.cold_tier, retention=self.retention,
+        )  # fmt: skip
+
+    def test_old_events_move_to_segments(self):
+        self.assertEqual(self.retention.archive_due(), 2)
+        self.assertEqual(sorted(self.store.rows), ["new-0", "new-1", "new-2"])
+        segments = self.service.list_archive_segments()
+        self.assertEqual([(s.epoch, s.count) for s in segments], [(0, 6), (1, 4)])
+
+        # The epoch root is the root of a tree over the segment's events.
+        expected = MerkleTree(self.hash_port)
+        for i in range(6):
+            expected.add_leaf(build_event(f"old-{i}", NOW - 8 * DAY + i * 3600))
+        self.assertEqual(segments[0].root, expected.get_root().root)
+
+    def restarted(self):
+        """A service recovered from the store after archival: only recent events in memory."""
+        return AuditService(
+            store=self.store, merkle_tree=MerkleTree(self.hash_port), clock=self.clock,
+            id_gen=MagicMock(), cold_tier=self.cold_tier,
+        )  # fmt: skip
+
+    def test_archived_events_are_provable(self):
+        self.retention.archive_due()
+        # Still in the live tree: proven against the live root as before.
+        before = self.service.get_proof("old-7")
+        self.assertIsNone(before.epoch)
+
+        # A restart puts the archived leaves back, so the live proof is unchanged.
+        service = self.restarted()
+        self.assertEqual(service.get_proof("old-7"), before)
+        self.assertEqual(service._merkle_tree.size, 13)
+
+        proof = self.cold_tier.get_proof("old-7")
+        self.assertEqual(proof.epoch, 1)
+        self.assertEqual(proof.root, self.service.list_archive_segments()[1].root)
+        self.assertTrue(verify(proof, sha256))
+        canonical = str(build_event("old-7", NOW - 8 * DAY + 7 * 3600)).encode("utf-8")
+        self.assertEqual(proof.entry_hash, sha256(canonical).hex())
+
+    def test_list_continues_into_the_archive(self):
+        self.retention.archive_due()
+        seen, before = [], None
+        while True:
+            page = self.service.list_events(limit=4, before=before)
+            seen = [e.event_id for e in page.events] + seen
+            if not page.has_more:
+                break
+            before = page.next_cursor
+        self.assertEqual(seen, [f"old-{i}" for i in range(10)] + ["new-0", "new-1", "new-2"])
+
+    def test_memory_store_pages_continue_into_the_archive(self):
+        store = IndexedMemoryStore()
+        for event_id in self.store.rows:
+            store.append(build_event(event_id, self.store.rows[event_id].timestamp))
+        cold_tier = ColdTier(SegmentArchive(os.path.join(self.dir.name, "mem")), self.hash_port)
+        retention = RetentionManager(
+            store, cold_tier, self.hash_port, self.clock, max_age_seconds=7 * DAY
+        )
+        service = AuditService(
+            store=store, merkle_tree=MerkleTree(self.hash_port), clock=self.clock,
+            id_gen=MagicMock(), cold_tier=cold_tier, retention=retention,
+        )  # fmt: skip
+        retention.archive_due()
+        # The store holds exactly one full page (its events carry no cursor).
+        seen, before = [], None
+        for _ in range(10):
+            page = service.list_events(limit=3, before=before)
+            seen = [e.event_id for e in page.events] + seen
+            if not page.has_more:
+                break
+            before = page.next_cursor
+        self.assertEqual(seen, [f"old-{i}" for i in range(10)] + ["new-0", "new-1", "new-2"])
+
+    def test_export_includes_archived_events_with_proofs(self):
+        self.retention.archive_due()
+        records = list(self.restarted().export_events(include_proof=True))
+        self.assertEqual(len(records), 13)
+        self.assertEqual(records[0]["event_id"], "old-0")
+        self.assertEqual(records[0]["epoch"], 0)
+        self.assertEqual(records[0]["leaf_index"], 0)
+        self.assertEqual(records[0]["proof"]["root"], self.service.get_root().root)
+        start_ts = NOW - 8 * DAY + 8 * 3600
+        window = list(self.service.export_events(start_ts=start_ts, end_ts=NOW - DAY))
+        self.assertEqual([r["event_id"] for r in window], ["old-8", "old-9"])
+
+    def test_archived_ids_stay_duplicates(self):
+        self.retention.archive_due()
+        with self.assertRaises(ConflictError):
+            asyncio.run(self.service.ingest_event(build_event("old-3", NOW - 8 * DAY + 3 * 3600)))
+
+    def test_interrupted_run_only_finishes_the_delete(self):
+        delete = self.store.delete_events
+        self.store.delete_events = MagicMock(side_effect=OSError("connection lost"))
+        with self.assertRaises(OSError):
+            self.retention.archive_once()
+        self.store.delete_events = delete
+
+        # The next run finishes the delete and archives the rest, without re-archiving.
+        self.assertEqual(self.retention.archive_once().count, 4)
+        self.assertIsNone(self.retention.archive_once())
+        self.assertEqual([s.count for s in self.service.list_archive_segments()], [6, 4])
+        self.assertEqual(sorted(self.store.rows), ["new-0", "new-1", "new-2"])
+
+    def test_segments_reopen_from_disk(self):
+        self.retention.archive_due()
+        reopened = SegmentArchive(self.dir.name)
+        self.assertEqual(reopened.segments(), self.service.list_archive_segments())
+        self.assertEqual(reopened.locate("old-8"), 1)
+        self.assertIsNone(reopened.locate("new-0"))
+        rows = reopened.list(before=self.store.rows["new-0"].cursor, limit=2)
+        self.assertEqual([row.event_id for row in rows], ["old-8", "old-9"])
+        self.assertEqual(json.loads(json.dumps(rows[0].model_dump()))["epoch"], 1)
+
+    def test_archive_is_in_key_order(self):
+        # Every 5 s across a whole minute: the base64 cursors do not sort like the keys.
+        store = FakeStore()
+        events = [build_event(f"e-{i:03d}", 1_700_000_000 + 5 * i) for i in range(15)]
+        for event in events:
+            store.append(event)
+        archive = SegmentArchive(os.path.join(self.dir.name, "keys"), block_rows=4)
+        retention = RetentionManager(
+            store, ColdTier(archive, self.hash_port), self.hash_port, self.clock,
+            max_age_seconds=DAY, segment_max_events=100,
+        )  # fmt: skip
+        self.assertEqual(retention.archive_due(), 1)
+
+        ids = [event.event_id for event in events]
+        self.assertEqual([row.event_id for row in archive.iter_events()], ids)
+        before = encode_cursor(event_key(events[10]))
+        self.assertEqual([row.event_id for row in archive.list(before=before, limit=3)], ids[7:10])
+
+
+class TestRestartAfterArchive(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+        self.hash_port = MagicMock(spec=IHashPort)
+        self.hash_port.sha256.side_effect = sha256
+        self.clock = MagicMock(spec=IClockPort)
+        self.clock.now.return_value = NOW
+        self.store = SqliteAuditStore(os.path.join(self.dir, "audit.db"))
+        self.addCleanup(self.store.close)
+        self.cold_tier = ColdTier(SegmentArchive(os.path.join(self.dir, "archive")), self.hash_port)
+
+    def start(self):
+        tree = MerkleTree(self.hash_port)
+        retention = RetentionManager(
+            self.store, self.cold_tier, self.hash_port, self.clock,
+            max_age_seconds=7 * DAY, merkle_tree=tree,
+        )  # fmt: skip
+        service = AuditService(
+            store=self.store, merkle_tree=tree, clock=self.clock, id_gen=MagicMock(),
+            cold_tier=self.cold_tier, retention=retention,
+        )  # fmt: skip
+        return service, retention
+
+    def test_restart_rebuilds_the_same_tree(self):
+        service, retention = self.start()
+        # Old and recent events interleaved: archived leaves are not a prefix of the tree.
+        events = [
+            build_event(f"e-{i:02d}", NOW - (8 * DAY if i % 2 == 0 else 3600) + i)
+            for i in range(20)
+        ]
+        for event in events:
+            asyncio.run(service.ingest_event(event))
+        root = service.get_root().root
+        proofs = {event.event_id: service.get_proof(event.event_id) for event in events}
+
+        retention.archive_due()
+        self.assertEqual(len(list(self.store.iter_leaves())), 10)
+
+        service, _ = self.start()
+        self.assertEqual(service._merkle_tree.size, 20)
+        self.assertEqual(service.get_root().root, root)
+        for event in events:
+            self.assertEqual(service.get_proof(event.event_id), proofs[event.event_id])
+        proof = service.get_consistency_proof(20, 20)
+        self.assertEqual(proof.second_size, 20)
+        with self.assertRaises(ConflictError):
+            asyncio.run(service.ingest_event(events[0]))
+
+
+class TestArchiveSetting(unittest.TestCase):
+    def settings(self, data):
+        config = AuditConfig.__new__(AuditConfig)
+        config._data = data
+        return config
+
+    def test_archive_is_opt_in(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(self.settings({}).archive_dir)
+            self.assertEqual(self.settings({"archive_dir": "/srv/a"}).archive_dir, "/srv/a")
+        with mock.patch.dict(os.environ, {"TALOS_ARCHIVE_DIR": "/srv/b"}, clear=True):
+            self.assertEqual(self.settings({}).archive_dir, "/srv/b")
+
+
+if __name__ == "__main__":
+    unittest.main()
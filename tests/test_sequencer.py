@@ -0,0 +1,212 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import unittest
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi.testclient import TestClient
+from talos_sdk.ports.audit_store import IAuditStorePort
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.http.main import app
+from src.bootstrap import get_audit_service
+from src.core.broadcaster import EventBroadcaster
+from src.core.sequencer import (
+    SequencedAuditService,
+    SequencerClient,
+    SequencerPublisher,
+    SequencerServer,
+)
+from src.domain.errors import (
+    ConflictError,
+    NotFoundError,
+    OverloadedError,
+    UnavailableError,
+    ValidationError,
+)
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event
+from src.domain.query_cache import QueryCache
+from src.domain.services import AuditService
+
+
+def build_event(event_id):
+    event = Event(
+        event_id=event_id,
+        ts="2026-01-11T18:23:45.123Z",
+        request_id="req-1",
+        surface_id="test.op",
+        outcome="success",
+        principal={"auth_mode": "bearer", "principal_id": "p-1", "team_id": "t-1"},
+        http={"method": "GET", "path": "/v1/test", "status_code": 200},
+        meta={},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+def build_valid_event(event_id):
+    event = {
+        "schema_id": "talos.audit_event",
+        "schema_version": "v1",
+        "event_id": event_id,
+        "ts": "2026-01-11T18:23:45.123Z",
+        "request_id": "req-1",
+        "surface_id": "test.op",
+        "outcome": "success",
+        "principal": {"auth_mode": "bearer", "principal_id": "p-1", "team_id": "t-1"},
+        "http": {"method": "GET", "path": "/v1/test", "status_code": 200},
+        "meta": {},
+        "resource": None,
+    }
+    canonical = json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    event["event_hash"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return event
+
+
+class TestSequencer(unittest.TestCase):
+    def setUp(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        self.tree = MerkleTree(hash_port)
+
+        store = MagicMock(spec=IAuditStorePort)
+        store.list.return_value = MagicMock(events=[])
+        store.append.return_value = None
+        publisher = SequencerPublisher(lambda: self.tree.get_root().root)
+        self.service = AuditService(
+            store=store, merkle_tree=self.tree, clock=MagicMock(), id_gen=MagicMock(),
+            broadcaster=publisher,
+        )  # fmt: skip
+
+        self.address = os.path.join(tempfile.mkdtemp(), "sequencer.sock")
+        self.authkey = os.urandom(32)
+        self.server = SequencerServer(self.service, publisher, self.address, self.authkey)
+        self.server.start()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.shutdown)
+
+    def new_worker(self, broadcaster=None):
+        store = MagicMock(spec=IAuditStorePort)
+        return SequencedAuditService(
+            client=SequencerClient(self.address, self.authkey),
+            store=store, clock=MagicMock(), id_gen=MagicMock(), broadcaster=broadcaster,
+        )  # fmt: skip
+
+    def test_workers_share_one_leaf_sequence(self):
+        workers = [self.new_worker() for _ in range(3)]
+
+        async def ingest_all():
+            return await asyncio.gather(
+                *(workers[i % 3].ingest_event_ack(build_event(f"seq-{i}")) for i in range(30))
+            )
+
+        acks = asyncio.run(ingest_all())
+        self.assertEqual(sorted(ack.leaf_index for ack in acks), list(range(30)))
+        self.assertEqual(self.new_worker().get_root().root, self.tree.get_root().root)
+        proof = workers[0].get_proof("seq-7")
+        self.assertEqual(proof.root, self.tree.get_root().root)
+
+    def test_errors_cross_the_process_boundary(self):
+        worker = self.new_worker()
+        asyncio.run(worker.ingest_event_ack(build_event("dup-1")))
+
+        with self.assertRaises(ConflictError):
+            asyncio.run(worker.ingest_event_ack(build_event("dup-1")))
+        with self.assertRaises(NotFoundError):
+            worker.get_proof("missing")
+
+        tampered = build_event("bad-1").model_copy(update={"event_hash": "0" * 64})
+        with self.assertRaises(ValidationError):
+            asyncio.run(worker.ingest_event_ack(tampered))
+        self.assertFalse(self.tree.has_event("bad-1"))
+
+    def test_busy_sequencer_answers_503_or_429_through_the_worker(self):
+        worker = self.new_worker()
+        app.dependency_overrides[get_audit_service] = lambda: worker
+        self.addCleanup(app.dependency_overrides.pop, get_audit_service, None)
+        client = TestClient(app)
+
+        self.service.commit_verified = AsyncMock(
+            side_effect=UnavailableError("Merkle tree recovery in progress", retry_after=7)
+        )
+        resp = client.post("/events", json=build_valid_event("busy-1"))
+        self.assertEqual((resp.status_code, resp.headers.get("retry-after")), (503, "7"))
+
+        self.service.commit_verified = AsyncMock(side_effect=OverloadedError("Full"))
+        resp = client.post("/events", json=build_valid_event("busy-2"))
+        self.assertEqual((resp.status_code, resp.headers.get("retry-after")), (429, "1"))
+
+    def test_worker_ready_follows_the_sequencer_recovery(self):
+        worker = self.new_worker()
+        app.dependency_overrides[get_audit_service] = lambda: worker
+        self.addCleanup(app.dependency_overrides.pop, get_audit_service, None)
+        client = TestClient(app)
+        self.assertEqual(client.get("/ready").status_code, 200)
+
+        self.service.recovery.progress("building", 40)
+        resp = client.get("/ready")
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual((resp.json()["state"], resp.json()["events_loaded"]), ("building", 40))
+
+        unreachable = SequencedAuditService(
+            client=SequencerClient(self.address + ".gone", self.authkey),
+            store=MagicMock(spec=IAuditStorePort), clock=MagicMock(), id_gen=MagicMock(),
+        )  # fmt: skip
+        app.dependency_overrides[get_audit_service] = lambda: unreachable
+        resp = client.get("/ready")
+        self.assertEqual((resp.status_code, resp.json()["state"]), (503, "pending"))
+        self.assertIn("Sequencer unavailable", resp.json()["error"])
+
+    def test_rejects_wrong_authkey(self):
+        with self.assertRaises(AuthenticationError):
+            Client(self.address, authkey=b"wrong")
+
+    def test_relay_fans_out_to_local_broadcaster(self):
+        async def scenario():
+            broadcaster = EventBroadcaster()
+            worker = self.new_worker(broadcaster)
+            stream = broadcaster.subscribe()
+            first = asyncio.ensure_future(stream.__anext__())
+            worker.start_event_relay(asyncio.get_running_loop())
+            while not (broadcaster.subscriber_count and self.server._publisher._subscribers):
+                await asyncio.sleep(0.01)
+
+            await self.new_worker().ingest_event_ack(build_event("relay-1"))
+            event = await asyncio.wait_for(first, timeout=5)
+            await stream.aclose()
+            return worker, event
+
+        worker, event = asyncio.run(scenario())
+        self.assertEqual(event.event_id, "relay-1")
+        self.assertEqual(worker.get_root().root, self.tree.get_root().root)
+
+    def test_relay_drops_worker_caches_once_events_are_stored(self):
+        cache = MagicMock(spec=QueryCache)
+        invalidated = threading.Event()
+        cache.invalidate.side_effect = lambda *_: invalidated.set()
+        worker = SequencedAuditService(
+            client=SequencerClient(self.address, self.authkey),
+            store=MagicMock(spec=IAuditStorePort), clock=MagicMock(), id_gen=MagicMock(),
+            query_cache=cache,
+        )  # fmt: skip
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        worker.start_event_relay(loop)
+        while not self.server._publisher._subscribers:
+            threading.Event().wait(0.01)
+
+        # Sent by the sequencer's WAL shipper once the store holds the event.
+        self.server._publisher.stored(build_event("stored-1"))
+        self.assertTrue(invalidated.wait(5))
+        self.assertEqual(cache.invalidate.call_args.args[0].event_id, "stored-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
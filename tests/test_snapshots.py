@@ -0,0 +1,149 @@
+import hashlib
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.http.main import app
+from src.adapters.snapshot_store import InMemorySnapshotStore
+from src.bootstrap import get_audit_service
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event
+from src.domain.snapshots import RootSnapshotter
+from src.ports.common import IClockPort, ISignerPort
+
+
+class FakeSigner(ISignerPort):
+    key_id = "test-key"
+
+    def sign(self, message: bytes) -> bytes:
+        return hashlib.sha256(b"secret" + message).digest()
+
+
+def build_valid_event(event_id):
+    event = {
+        "schema_id": "talos.audit_event",
+        "schema_version": "v1",
+        "event_id": event_id,
+        "ts": "2026-01-11T18:23:45.123Z",
+        "request_id": "req-1",
+        "surface_id": "test.op",
+        "outcome": "success",
+        "principal": {"auth_mode": "bearer", "principal_id": "p-1", "team_id": "t-1"},
+        "http": {"method": "GET", "path": "/v1/test", "status_code": 200},
+        "meta": {},
+        "resource": None,
+    }
+    canonical = json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    event["event_hash"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return event
+
+
+def build_event(event_id):
+    return Event(
+        event_id=event_id,
+        ts="2026-01-11T18:23:45.123Z",
+        request_id="req-1",
+        surface_id="test.op",
+        outcome="success",
+        principal={},
+        http={},
+        meta={},
+        event_hash="",
+    )
+
+
+class TestRootSnapshotter(unittest.TestCase):
+    def setUp(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        self.tree = MerkleTree(hash_port)
+        self.clock = MagicMock(spec=IClockPort)
+        self.clock.now.return_value = 1700000000.0
+        self.store = InMemorySnapshotStore()
+        self.snapshots = RootSnapshotter(
+            self.tree, self.store, self.clock, signer=FakeSigner(), every_events=3
+        )
+
+    def append(self, count):
+        for _ in range(count):
+            self.tree.add_leaf(build_event(f"e-{self.tree.size}"))
+            self.snapshots.on_append()
+
+    def test_seals_every_n_events(self):
+        self.append(7)
+        self.assertEqual([s.tree_size for s in self.store.snapshots_since(0)], [3, 6])
+        self.assertEqual(self.snapshots.latest.tree_size, 6)
+
+    def test_snapshot_is_signed_over_its_payload(self):
+        self.append(3)
+        snapshot = self.store.latest_snapshot()
+        self.assertEqual(snapshot.key_id, "test-key")
+        self.assertEqual(snapshot.signature, FakeSigner().sign(snapshot.signing_payload()).hex())
+
+    def test_time_trigger_only_seals_growth(self):
+        self.append(1)
+        self.assertEqual(self.snapshots.seal().tree_size, 1)
+        self.assertIsNone(self.snapshots.seal())  # unchanged tree: nothing new to publish
+
+    def test_never_publishes_a_smaller_head(self):
+        self.append(3)
+        recovered = RootSnapshotter(MerkleTree(self.tree._hash_port), self.store, self.clock)
+        self.assertIsNone(recovered.seal())
+
+    def test_recovered_tree_must_reproduce_the_last_head(self):
+        self.append(3)
+        # Same leaves in another order (e.g. recovered in key order): the root differs.
+        reordered = MerkleTree(self.tree._hash_port)
+        for event_id in ("e-1", "e-0", "e-2", "e-3"):
+            reordered.add_leaf(build_event(event_id))
+        recovered = RootSnapshotter(reordered, self.store, self.clock)
+        self.assertFalse(recovered.check_recovered())
+        self.assertIsNone(recovered.seal())
+
+        intact = MerkleTree(self.tree._hash_port)
+        for event_id in ("e-0", "e-1", "e-2", "e-3"):
+            intact.add_leaf(build_event(event_id))
+        recovered = RootSnapshotter(intact, self.store, self.clock)
+        self.assertTrue(recovered.check_recovered())
+        self.assertEqual(recovered.seal().tree_size, 4)
+
+    def test_history_since(self):
+        self.append(9)
+        self.assertEqual([s.tree_size for s in self.store.snapshots_since(3)], [6, 9])
+        self.assertEqual([s.tree_size for s in self.store.snapshots_since(3, limit=1)], [6])
+
+
+class TestRootSnapshotEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_latest_supports_conditional_get(self):
+        self.client.post("/events", json=build_valid_event("snap-1"))
+        get_audit_service().snapshots.seal()
+
+        resp = self.client.get("/roots/latest")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("max-age", resp.headers["cache-control"])
+        self.assertEqual(resp.json()["root"], self.client.get("/root").json()["root"])
+
+        etag = resp.headers["etag"]
+        again = self.client.get("/roots/latest", headers={"If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+
+    def test_history_pages(self):
+        self.client.post("/events", json=build_valid_event("snap-2"))
+        get_audit_service().snapshots.seal()
+
+        body = self.client.get("/roots", params={"since": 0}).json()
+        sizes = [item["tree_size"] for item in body["items"]]
+        self.assertEqual(sizes, sorted(sizes))
+        self.assertEqual(body["next_since"], sizes[-1])
+        self.assertEqual(self.client.get("/roots", params={"since": -1}).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
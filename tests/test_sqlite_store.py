@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.sqlite_store import SqliteAuditStore
+from src.domain.errors import ConflictError
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event, RootSnapshot
+from src.domain.services import AuditService
+from src.ports.common import IClockPort
+
+START = 1_800_000_000
+
+
+def build_valid_event(event_id, timestamp, principal="p-1", outcome="OK"):
+    event = Event(
+        event_id=event_id,
+        ts=datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(),
+        request_id="req-1",
+        surface_id="test.op",
+        outcome=outcome,
+        principal={"principal_id": principal},
+        http={"method": "GET", "path": "/v1/test"},
+        meta={"session_id": "s-1"},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+class TestSqliteStore(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "audit.db")
+        self.store = SqliteAuditStore(self.path)
+        self.addCleanup(self.store.close)
+        self.events = [
+            build_valid_event(f"e-{i:02d}", START + 60 * i, principal=f"p-{i % 3}",
+                              outcome="DENY" if i % 5 == 0 else "OK")
+            for i in range(30)
+        ]  # fmt: skip
+        for event in self.events:
+            self.store.append(event)
+
+    def ids(self, events):
+        return [event.event_id for event in events]
+
+    def test_events_round_trip(self):
+        self.assertFalse(self.store.append(self.events[3]))
+        self.assertTrue(self.store.exists("e-03"))
+        page = self.store.list(limit=1)
+        self.assertEqual(page.events, [self.events[-1]])
+
+    def test_keyset_pages_and_filters(self):
+        seen, before = [], None
+        while True:
+            page = self.store.list(before=before, limit=7, filters={"principal_id": "p-1"})
+            seen = self.ids(page.events) + seen
+            if not page.has_more:
+                break
+            before = page.next_cursor
+        self.assertEqual(seen, [f"e-{i:02d}" for i in range(1, 30, 3)])
+
+        denied = self.store.iter_events(START + 60, START + 60 * 20, filters={"outcome": "DENY"})
+        self.assertEqual(self.ids(denied), ["e-05", "e-10", "e-15"])
+        stats = self.store.stats(START, START + 60 * 9)
+        self.assertEqual((stats["requests_24h"], stats["auth_success_rate"]), (10, 0.8))
+
+    def test_snapshots(self):
+        for size in (4, 8, 12):
+            self.store.save_snapshot(RootSnapshot(tree_size=size, root=f"r{size}", timestamp=1.0))
+        self.assertEqual(self.store.latest_snapshot().tree_size, 12)
+        self.assertEqual([s.tree_size for s in self.store.snapshots_since(4)], [8, 12])
+
+    def test_restart_rebuilds_the_tree_from_stored_leaves(self):
+        hash_port = MagicMock(spec=IHashPort)
+        hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        clock = MagicMock(spec=IClockPort)
+
+        def service(store):
+            return AuditService(
+                store=store, merkle_tree=MerkleTree(hash_port), clock=clock, id_gen=MagicMock()
+            )
+
+        first = service(self.store)
+        # Ingest order, not timestamp order, decides leaf indices.
+        late = build_valid_event("late", START - 3600)
+        ack = asyncio.run(first.ingest_event_ack(late))
+        self.assertEqual(ack.leaf_index, 30)
+
+        reopened = SqliteAuditStore(self.path)
+        self.addCleanup(reopened.close)
+        second = service(reopened)
+        self.assertEqual(second.get_root().root, ack.root)
+        self.assertEqual(second.get_proof("late").index, 30)
+        with self.assertRaises(ConflictError):
+            asyncio.run(second.ingest_event_ack(self.events[0]))
+
+    def test_batched_commits(self):
+        path = self.path + ".batched"
+        store = SqliteAuditStore(path, commit_interval=60, commit_batch=4)
+        for event in self.events[:6]:
+            store.append(event)
+        # The first four committed as a batch; the rest wait for the interval or flush.
+        self.assertEqual(len(store.list(limit=100).events), 4)
+        self.assertFalse(store.append(self.events[5]))
+        store.close()
+        reopened = SqliteAuditStore(path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(self.ids(reopened.iter_events()), self.ids(self.events[:6]))
+
+    def test_delete_events(self):
+        self.assertEqual(self.store.delete_events(["e-00", "e-01", "missing"]), 2)
+        self.assertEqual(next(iter(self.store.iter_leaves()))[0], "e-02")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import importlib.util
+import unittest
+
+from benchmarks import startup
+
+# Generous: FastAPI itself is most of it. The point is to catch a new eager
+# import of something heavy, not to time the machine.
+IMPORT_BUDGET_MS = 1500
+
+
+@unittest.skipUnless(importlib.util.find_spec("talos_sdk"), "talos_sdk not installed")
+class TestStartup(unittest.TestCase):
+    def test_optional_modules_load_lazily(self):
+        self.assertEqual(startup.loaded_lazy_modules("src.main"), [])
+
+    def test_import_budget(self):
+        profile = startup.import_profile("src.main")
+        self.assertLess(startup.import_ms(profile, "src.main"), IMPORT_BUDGET_MS)
+
+    def test_importing_config_reads_nothing(self):
+        self.assertNotIn("talos_config", startup.loaded_lazy_modules("src.config"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.archive import SegmentArchive
+from src.adapters.memory_store import IndexedMemoryStore
+from src.adapters.snapshot_store import InMemorySnapshotStore
+from src.client.verify import frontier_root, push_node
+from src.domain.merkle import MerkleTree
+from src.domain.models import ArchiveSegment, Event, RootSnapshot, encode_cursor
+from src.domain.services import AuditService
+from src.domain.snapshots import RootSnapshotter
+from src.ports.common import IClockPort
+from src.tools.verify import VerifyReport, in_leaf_order, main, verify_archive, verify_log
+
+
+def build_valid_event(event_id):
+    event = Event(
+        event_id=event_id,
+        ts="2026-01-01T00:00:00+00:00",
+        request_id="req-1",
+        surface_id="test.op",
+        outcome="success",
+        principal={"principal_id": "p-1"},
+        http={"method": "GET", "path": "/v1/test"},
+        meta={"session_id": "s-1"},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+def sha256(data):
+    return hashlib.sha256(data).digest()
+
+
+class TestVerify(unittest.TestCase):
+    def setUp(self):
+        self.hash_port = MagicMock(spec=IHashPort)
+        self.hash_port.sha256.side_effect = sha256
+        self.events = [build_valid_event(f"evt-{i:03d}") for i in range(37)]
+        self.tree = MerkleTree(self.hash_port)
+        self.heads = []
+        for event in self.events:
+            self.tree.add_leaf(event)
+            if self.tree.size % 5 == 0 or self.tree.size in (1, 8, 16, 32):
+                root = self.tree.get_root().root
+                self.heads.append(RootSnapshot(tree_size=self.tree.size, root=root, timestamp=1.0))
+        self.lines = [json.dumps(event.model_dump()).encode() for event in self.events]
+
+    def test_frontier_root_matches_the_service_tree(self):
+        tree = MerkleTree(self.hash_port)
+        frontier = []
+        for event in self.events:
+            tree.add_leaf(event)
+            push_node(frontier, sha256(str(event).encode("utf-8")))
+            self.assertEqual(frontier_root(frontier), tree.get_root().root, tree.size)
+
+    def test_clean_log_verifies(self):
+        for chunk_size in (1, 4, 16, 64):
+            report = verify_log(self.lines, self.heads, chunk_size=chunk_size)
+            self.assertTrue(report.ok, report.summary())
+            self.assertEqual(report.events, 37)
+            self.assertEqual(report.root, self.tree.get_root().root)
+            self.assertEqual(report.snapshots_checked, len(self.heads))
+
+    def test_parallel_workers(self):
+        report = verify_log(self.lines, self.heads, workers=2, chunk_size=8)
+        self.assertTrue(report.ok, report.summary())
+        self.assertEqual(report.root, self.tree.get_root().root)
+
+    def test_tampered_event_is_the_first_divergence(self):
+        tampered = json.loads(self.lines[12])
+        tampered["outcome"] = "denied"
+        self.lines[12] = json.dumps(tampered).encode()
+        report = verify_log(self.lines, self.heads, chunk_size=8)
+        self.assertFalse(report.ok)
+        self.assertEqual(report.first_mismatch.index, 12)
+        self.assertEqual(report.first_mismatch.event_id, "evt-012")
+        self.assertEqual(report.hash_mismatches, 1)
+        # The leaf changed too, so the first head covering it diverges.
+        self.assertEqual(report.first_bad_snapshot.tree_size, 15)
+        self.assertEqual(report.first_bad_snapshot.last_good, 10)
+
+    def test_missing_events_fail_published_heads(self):
+        report = verify_log(self.lines[:30], self.heads, chunk_size=8)
+        self.assertEqual(report.first_bad_snapshot.tree_size, 32)
+        self.assertEqual(report.first_bad_snapshot.last_good, 30)
+
+    def test_rejects_chunk_sizes_that_are_not_powers_of_two(self):
+        with self.assertRaises(ValueError):
+            verify_log(self.lines, chunk_size=12)
+
+    def test_cli_on_an_export_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            export = os.path.join(directory, "events.ndjson")
+            with open(export, "wb") as f:
+                f.write(b"\n".join(self.lines) + b"\n")
+            roots = os.path.join(directory, "roots.json")
+            with open(roots, "w") as f:
+                json.dump({"items": [head.model_dump() for head in self.heads]}, f)
+
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = main(["--export", export, "--snapshots", roots, "--workers", "1", "--json"])
+            self.assertEqual(code, 0)
+            self.assertEqual(json.loads(out.getvalue())["root"], self.tree.get_root().root)
+
+    def test_export_out_of_key_order_verifies_by_leaf_index(self):
+        clock = MagicMock(spec=IClockPort)
+        clock.now.return_value = 1767225600.0
+        tree = MerkleTree(self.hash_port)
+        snapshots = RootSnapshotter(tree, InMemorySnapshotStore(), clock, every_events=4)
+        service = AuditService(
+            store=IndexedMemoryStore(), merkle_tree=tree, clock=clock, id_gen=MagicMock(),
+            snapshots=snapshots,
+        )  # fmt: skip
+
+        async def ingest():
+            # One second, arriving in the reverse of the store's event_id order.
+            for event_id in ("d", "c", "b", "a"):
+                await service.ingest_event_ack(build_valid_event(event_id))
+
+        asyncio.run(ingest())
+        exported = list(service.export_events(include_proof=True))
+        self.assertEqual([record["event_id"] for record in exported], ["a", "b", "c", "d"])
+
+        report = verify_log(in_leaf_order(exported), snapshots.history())
+        self.assertTrue(report.ok, report.summary())
+        self.assertEqual(report.snapshots_checked, 1)
+        self.assertFalse(verify_log(exported, snapshots.history()).ok)
+
+    def test_missing_leaf_index_is_reported(self):
+        lines = [
+            json.dumps(dict(event.model_dump(), leaf_index=i)).encode()
+            for i, event in enumerate(self.events)
+        ]
+        del lines[3]
+        report = VerifyReport()
+        verify_log(in_leaf_order(lines, report), self.heads, report=report)
+        self.assertFalse(report.ok)
+        self.assertIn("leaf 3 is missing from the export", report.notes)
+        self.assertEqual(report.first_bad_snapshot.tree_size, 5)
+
+    def test_cli_rejects_a_database(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["--dsn", "postgresql://auditor@replica/audit"])
+
+    def test_archive_segments(self):
+        with tempfile.TemporaryDirectory() as directory:
+            archive = SegmentArchive(directory, block_rows=4)
+            self._write_segment(archive, 0, self.events[:10])
+            self._write_segment(archive, 1, self.events[10:], root="0" * 64)
+            report = verify_archive(directory, archive.segments())
+            self.assertEqual(report.segments_checked, 2)
+            self.assertEqual(report.first_bad_segment.epoch, 1)
+
+    def _write_segment(self, archive, epoch, events, root=None):
+        tree = MerkleTree(self.hash_port)
+        rows = []
+        for i, event in enumerate(events):
+            tree.add_leaf(event)
+            row = event.model_dump()
+            leaf = sha256(str(event).encode("utf-8")).hex()
+            cursor = encode_cursor((epoch, event.event_id))
+            row.update(cursor=cursor, timestamp=float(epoch), leaf_hash=leaf)
+            rows.append(row)
+        segment = ArchiveSegment(
+            epoch=epoch, count=len(rows), root=root or tree.get_root().root,
+            start_ts=float(epoch), end_ts=float(epoch), first_cursor=rows[0]["cursor"],
+            last_cursor=rows[-1]["cursor"], created_at=1.0,
+        )  # fmt: skip
+        archive.write_segment(segment, rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from talos_sdk.ports.hash import IHashPort
+
+from src.adapters.memory_store import IndexedMemoryStore
+from src.adapters.wal import SegmentedWal, WalCorruptError
+from src.domain.errors import ConflictError
+from src.domain.merkle import MerkleTree
+from src.domain.models import Event
+from src.domain.query_cache import QueryCache
+from src.domain.services import AuditService
+from src.domain.shipping import WalShipper
+from src.ports.common import IClockPort
+
+START = 1_800_000_000
+
+
+def build_valid_event(event_id, timestamp=START):
+    event = Event(
+        event_id=event_id,
+        ts=datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(),
+        request_id="req-1",
+        surface_id="test.op",
+        outcome="OK",
+        principal={"principal_id": "p-1"},
+        http={"method": "GET", "path": "/v1/test"},
+        meta={},
+        event_hash="",
+    )
+    digest = hashlib.sha256(str(event).encode("utf-8")).hexdigest()
+    return event.model_copy(update={"event_hash": digest})
+
+
+async def append_all(wal, records):
+    seqs = [wal.append(record) for record in records]
+    await asyncio.gather(*(wal.synced(seq) for seq in seqs))
+    return seqs
+
+
+class TestSegmentedWal(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dir = self._tmp.name
+
+    def segments(self):
+        return sorted(name for name in os.listdir(self.dir) if name.endswith(".wal"))
+
+    def test_torn_tail_is_cut_on_open(self):
+        wal = SegmentedWal(self.dir)
+        asyncio.run(append_all(wal, [b"one", b"two", b"three"]))
+        wal.close()
+        path = os.path.join(self.dir, self.segments()[-1])
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 2)
+
+        wal = SegmentedWal(self.dir)
+        self.assertEqual(list(wal.replay()), [(1, b"one"), (2, b"two")])
+        self.assertEqual(asyncio.run(append_all(wal, [b"four"])), [3])
+        wal.close()
+
+    def test_checkpoint_drops_whole_segments_and_replays_the_rest(self):
+        wal = SegmentedWal(self.dir, segment_bytes=64)
+        for i in range(10):
+            asyncio.run(append_all(wal, [b"record-%d" % i]))
+        self.assertGreater(len(self.segments()), 2)
+        wal.truncate(6)
+        wal.close()
+        self.assertNotIn(f"{1:020d}.wal", self.segments())
+
+        wal = SegmentedWal(self.dir, segment_bytes=64)
+        self.assertEqual(wal.checkpoint, 6)
+        self.assertEqual([seq for seq, _ in wal.replay(after=wal.checkpoint)], [7, 8, 9, 10])
+        wal.close()
+
+    def test_corruption_before_the_end_stops_replay(self):
+        wal = SegmentedWal(self.dir, segment_bytes=64)
+        for i in range(4):
+            asyncio.run(append_all(wal, [b"record-%d" % i]))
+        wal.close()
+        with open(os.path.join(self.dir, self.segments()[0]), "r+b") as f:
+            f.seek(20)
+            f.write(b"X")
+
+        wal = SegmentedWal(self.dir, segment_bytes=64)
+        with self.assertRaises(WalCorruptError):
+            list(wal.replay())
+        wal.close()
+
+    def test_short_writes_are_completed(self):
+        write = os.write
+        wal = SegmentedWal(self.dir)
+        with patch("src.adapters.wal.os.write", lambda fd, data: write(fd, data[:3])):
+            asyncio.run(append_all(wal, [b"one", b"two", b"three"]))
+        wal.close()
+
+        wal = SegmentedWal(self.dir)
+        self.assertEqual(list(wal.replay()), [(1, b"one"), (2, b"two"), (3, b"three")])
+        wal.close()
+
+    def test_failed_write_leaves_no_partial_frame(self):
+        write = os.write
+        calls = []
+
+        def fail_after_a_few_bytes(fd, data):
+            calls.append(fd)
+            if len(calls) == 1:
+                return write(fd, data[:5])
+            raise OSError("disk full")
+
+        wal = SegmentedWal(self.dir)
+        with (
+            patch("src.adapters.wal.os.write", fail_after_a_few_bytes),
+            self.assertRaises(OSError),
+        ):
+            wal.append(b"lost")
+        asyncio.run(append_all(wal, [b"kept"]))
+        wal.close()
+
+        wal = SegmentedWal(self.dir)
+        self.assertEqual(list(wal.replay()), [(1, b"kept")])
+        wal.close()
+
+    def test_snapshot_keeps_wanted_records_and_drops_segments(self):
+        wal = SegmentedWal(self.dir, segment_bytes=64)
+        for i in range(10):
+            asyncio.run(append_all(wal, [b"record-%d" % i]))
+        self.assertEqual(wal.snapshot(6, lambda record: record != b"record-2"), 5)
+        self.assertEqual(wal.snapshot(8, lambda record: record != b"record-4"), 6)
+        wal.close()
+        self.assertNotIn(f"{1:020d}.wal", self.segments())
+
+        wal = SegmentedWal(self.dir, segment_bytes=64)
+        self.assertEqual(wal.checkpoint, 8)
+        replayed = list(wal.replay_snapshot()) + list(wal.replay(after=wal.checkpoint))
+        self.assertEqual([seq for seq, _ in replayed], [1, 2, 4, 6, 7, 8, 9, 10])
+        wal.close()
+
+
+class TestWriteBehindIngest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.hash_port = MagicMock(spec=IHashPort)
+        self.hash_port.sha256.side_effect = lambda data: hashlib.sha256(data).digest()
+        self.clock = MagicMock(spec=IClockPort)
+        self.clock.now.return_value = START
+        self.wals = []
+
+    def tearDown(self):
+        for wal in self.wals:
+            wal.close()
+
+    def start(self, segment_bytes=64 * 1024 * 1024, snapshot_records=100_000):
+        """A fresh process: empty memory store and tree, the same log directory."""
+        wal = SegmentedWal(self._tmp.name, segment_bytes=segment_bytes)
+        self.wals.append(wal)
+        store = IndexedMemoryStore()
+        shipper = WalShipper(wal, store, truncate=False, snapshot_records=snapshot_records)
+        service = AuditService(
+            store=store, merkle_tree=MerkleTree(self.hash_port), clock=self.clock,
+            id_gen=MagicMock(), wal=shipper,
+        )  # fmt: skip
+        return service, store, shipper
+
+    def test_restart_rebuilds_the_memory_store_and_tree(self):
+        service, store, shipper = self.start()
+        events = [build_valid_event(f"e-{i}", START + i) for i in range(5)]
+
+        async def ingest():
+            await asyncio.gather(*(service.ingest_event_ack(e) for e in events))
+
+        asyncio.run(ingest())
+        self.assertTrue(shipper.flush(timeout=5))
+        self.assertEqual(len(store.list(limit=10).events), 5)
+        root = service._merkle_tree.get_root().root
+        order = [service._merkle_tree.get_proof(e.event_id).index for e in events]
+        self.wals.pop().close()
+
+        service, store, _ = self.start()
+        self.assertEqual(len(store.list(limit=10).events), 5)
+        self.assertEqual(service._merkle_tree.get_root().root, root)
+        self.assertEqual([service._merkle_tree.get_proof(e.event_id).index for e in events], order)
+        with self.assertRaises(ConflictError):
+            asyncio.run(service.ingest_event_ack(events[0]))
+
+    def test_snapshots_bound_the_memory_store_log(self):
+        service, store, shipper = self.start(segment_bytes=1024, snapshot_records=10)
+        events = [build_valid_event(f"e-{i}", START + i) for i in range(40)]
+
+        async def ingest():
+            for event in events:
+                await service.ingest_event_ack(event)
+
+        asyncio.run(ingest())
+        self.assertTrue(shipper.flush(timeout=5))
+        wal = self.wals[-1]
+        self.assertGreater(wal.checkpoint, 0)
+        self.assertNotIn(f"{1:020d}.wal", os.listdir(self._tmp.name))
+        root = service._merkle_tree.get_root().root
+        order = [service._merkle_tree.get_proof(e.event_id).index for e in events]
+        self.wals.pop().close()
+
+        service, store, _ = self.start(segment_bytes=1024, snapshot_records=10)
+        self.assertEqual(len(store.list(limit=100).events), 40)
+        self.assertEqual(service._merkle_tree.get_root().root, root)
+        self.assertEqual([service._merkle_tree.get_proof(e.event_id).index for e in events], order)
+
+    def test_snapshot_drops_events_deleted_from_the_store(self):
+        service, store, shipper = self.start(snapshot_records=10)
+        events = [build_valid_event(f"e-{i}", START + i) for i in range(30)]
+
+        async def ingest(batch):
+            for event in batch:
+                await service.ingest_event_ack(event)
+
+        asyncio.run(ingest(events[:5]))
+        self.assertTrue(shipper.flush(timeout=5))
+        store.delete_events([e.event_id for e in events[:5]])  # as retention would
+        asyncio.run(ingest(events[5:]))
+        self.assertTrue(shipper.flush(timeout=5))
+        self.wals.pop().close()
+
+        _, store, _ = self.start(snapshot_records=10)
+        self.assertFalse(store.exists(events[0].event_id))
+        self.assertEqual(len(store.list(limit=100).events), 25)
+
+    def test_cached_reads_are_dropped_once_the_event_is_shipped(self):
+        gate = threading.Event()
+
+        class GatedStore(IndexedMemoryStore):
+            def append(self, event):
+                gate.wait(5)
+                return super().append(event)
+
+        wal = SegmentedWal(self._tmp.name)
+        self.wals.append(wal)
+        store = GatedStore()
+        shipper = WalShipper(wal, store, truncate=False)
+        service = AuditService(
+            store=store, merkle_tree=MerkleTree(self.hash_port), clock=self.clock,
+            id_gen=MagicMock(), wal=shipper, query_cache=QueryCache(60, 100),
+        )  # fmt: skip
+        asyncio.run(service.ingest_event_ack(build_valid_event("e-0")))
+        # Acknowledged but not shipped yet: this read is cached without the event.
+        self.assertEqual(service.list_events(limit=10).events, [])
+        gate.set()
+        self.assertTrue(shipper.flush(timeout=5))
+        self.assertEqual([e.event_id for e in service.list_events(limit=10).events], ["e-0"])
+
+    def test_duplicate_is_rejected_while_the_first_is_being_logged(self):
+        service, _, _ = self.start()
+        event = build_valid_event("dup")
+
+        async def ingest_twice():
+            return await asyncio.gather(
+                service.ingest_event_ack(event),
+                service.ingest_event_ack(event),
+                return_exceptions=True,
+            )
+
+        first, second = asyncio.run(ingest_twice())
+        self.assertNotIsInstance(first, Exception)
+        self.assertIsInstance(second, ConflictError)
+        self.assertEqual(service._merkle_tree.size, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()